@@ -0,0 +1,126 @@
+# analytics.py - Rolling pace, streaks and per-82 projections in one vectorized pass
+#
+# Same idea as cumulative.py: rows are contiguous (playerId, season) segments,
+# found once, and every metric is computed for the whole league at once
+# instead of a groupby().rolling() per player-season:
+#   - rolling N-game sums are one cumsum, differenced between each row and the
+#     start of its window (clipped to the start of the segment);
+#   - a streak at each row is its distance to the last "reset" (a game that
+#     breaks the streak, or the segment start), carried forward with
+#     np.maximum.accumulate; longest streaks come from a run-length encoding.
+
+from cli import lazy_import
+from cumulative import METRICS, SEGMENT_KEYS, segment_starts
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Rolling windows, in games
+WINDOWS = [5, 10, 20]
+
+GAMES_PER_SEASON = 82
+
+# (per-game column, name) with streaks (games with at least one) and droughts
+STREAK_STATS = [
+    ("I_F_points", "points"),
+    ("I_F_goals", "goals"),
+]
+
+
+def _stat_name(target):
+    return target.removeprefix("cum_")
+
+
+def analytics_columns(metrics=METRICS, windows=WINDOWS, streak_stats=STREAK_STATS):
+    """Names of the columns add_analytics() adds, in order."""
+    columns = []
+    for _, target in metrics:
+        stat = _stat_name(target)
+        columns += [f"pace{w}_{stat}" for w in windows] + [f"proj82_{stat}"]
+    for _, stat in streak_stats:
+        columns += [f"streak_{stat}", f"drought_{stat}"]
+    return columns
+
+
+def _rolling_means(values, first_row, windows):
+    # One running total; each window is a difference of two of its entries
+    rows = np.arange(len(values))
+    totals = np.concatenate([[0.0], np.cumsum(values, dtype="float64")])
+    for window in windows:
+        window_start = np.maximum(first_row, rows - window + 1)
+        yield window, (totals[rows + 1] - totals[window_start]) / (rows + 1 - window_start)
+
+
+def rolling_mean(values, starts, window):
+    """
+    Mean of `values` over the last `window` rows of each segment (fewer at the
+    start of a segment, like rolling(window, min_periods=1).mean()).
+    """
+    first_row = np.flatnonzero(starts)[np.cumsum(starts) - 1]
+    return next(_rolling_means(values, first_row, [window]))[1]
+
+
+def streak_lengths(flags, starts):
+    """Number of consecutive True `flags` ending at each row, within its segment."""
+    rows = np.arange(len(flags))
+    # Last row that breaks the streak: a False flag, or just before a segment
+    reset = np.where(~flags, rows, np.where(starts, rows - 1, -1))
+    return rows - np.maximum.accumulate(reset)
+
+
+def add_analytics(df, metrics=METRICS, windows=WINDOWS, streak_stats=STREAK_STATS,
+                  keys=SEGMENT_KEYS):
+    """
+    Return `df` with, for every metric, pace<N>_<stat> (per-game average over
+    the last N games of the season) and proj82_<stat> (cumulative total
+    projected over 82 games), and for every streak stat, streak_<stat> and
+    drought_<stat> (consecutive games with / without one, up to this game).
+    Needs gameNumber and the cum_* columns of cumulative.add_cumulative, with
+    the same layout: rows of each (playerId, season) contiguous, in game order.
+    """
+    starts = segment_starts(df, keys)
+    first_row = np.flatnonzero(starts)[np.cumsum(starts) - 1]
+    game_number = df["gameNumber"].to_numpy(dtype="float64")
+
+    columns = {}
+    for source, target in metrics:
+        stat = _stat_name(target)
+        values = df[source].to_numpy(dtype="float64")
+        for window, means in _rolling_means(values, first_row, windows):
+            columns[f"pace{window}_{stat}"] = means.astype("float32")
+        columns[f"proj82_{stat}"] = (
+            df[target].to_numpy(dtype="float64") / game_number * GAMES_PER_SEASON).astype("float32")
+
+    for source, stat in streak_stats:
+        scored = df[source].to_numpy() > 0
+        columns[f"streak_{stat}"] = streak_lengths(scored, starts).astype("int16")
+        columns[f"drought_{stat}"] = streak_lengths(~scored, starts).astype("int16")
+
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def longest_streaks(df, source="I_F_points", keys=SEGMENT_KEYS):
+    """
+    One row per (playerId, season) segment: games, longest_streak (most
+    consecutive games with `source` > 0) and longest_drought, from a
+    run-length encoding of the whole column.
+    """
+    starts = segment_starts(df, keys)
+    flags = df[source].to_numpy() > 0
+
+    # A run begins at a segment start or wherever the flag changes
+    run_starts = starts.copy()
+    run_starts[1:] |= flags[1:] != flags[:-1]
+    begin = np.flatnonzero(run_starts)
+    length = np.diff(np.append(begin, len(flags)))
+    segment = (np.cumsum(starts) - 1)[begin]
+
+    first_row = np.flatnonzero(starts)
+    result = df[keys].iloc[first_row].reset_index(drop=True)
+    result["games"] = np.diff(np.append(first_row, len(df)))
+    for column, kind in (("longest_streak", True), ("longest_drought", False)):
+        longest = np.zeros(len(first_row), dtype="int64")
+        runs = flags[begin] == kind
+        np.maximum.at(longest, segment[runs], length[runs])
+        result[column] = longest
+    return result
@@ -0,0 +1,313 @@
+# array_store.py - Memory-mapped, one-array-per-column copy of the game-by-game table
+#
+# The build writes every numeric column as a raw fixed-dtype file, rows sorted
+# by (playerId, season, gameNumber), plus offset arrays (player -> segments,
+# segment -> rows) and a sorted name lookup. Opening maps the files with
+# np.memmap: nothing is parsed or copied, so it costs the same whatever the
+# size of the league, and processes opening the same store (Streamlit
+# workers, dashboard_export.py) share its pages through the OS cache.
+#
+#     store = ArrayStore()
+#     (player_id,) = store.find("Nick Suzuki")
+#     store.series(player_id, "cum_points", season=2024)   # view, no copy
+#
+# Next to the arrays, snapshot.json holds what script.py's selectors need
+# (player names, their seasons, the stored columns), so its first render
+# reads one small JSON file before numpy or the store are even loaded.
+import json
+import os
+import shutil
+
+from cli import lazy_import
+from cumulative import segment_starts
+from moneypuck_loader import parse_game_date
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+ARRAY_DIR = "players_game_by_game.arrays"
+STORE_VERSION = 1
+SNAPSHOT_FILE = "snapshot.json"
+
+# dtype of each stored column; other integer columns keep their dtype and the
+# rest (new metrics) are float32. gameDate is stored as YYYYMMDD, like the
+# MoneyPuck files.
+COLUMN_DTYPES = {
+    "playerId": "int32",
+    "season": "int16",
+    "gameId": "int32",
+    "gameDate": "int32",
+    "gameNumber": "int16",
+}
+
+
+def _game_date_ints(dates):
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).to_numpy()
+
+
+def _text_array(values):
+    return np.asarray(values, dtype=str)
+
+
+def write_arrays(all_games, path=ARRAY_DIR):
+    """Write `all_games` as one .bin file per column plus the offset arrays."""
+    writer = ArrayWriter(path)
+    writer.append(all_games.sort_values(["playerId", "season", "gameNumber"], kind="stable"))
+    writer.close()
+
+
+class ArrayWriter:
+    """
+    write_arrays() one chunk at a time, for tables that do not fit in memory:
+    append() frames already in (playerId, season, gameNumber) order, the
+    whole table across calls, then close(). Column files grow as chunks come;
+    only the offsets (a few values per player) are kept until the end.
+    """
+
+    def __init__(self, path=ARRAY_DIR):
+        self.path = path
+        # Write next to the target and swap on close(); processes that still
+        # map the old files keep reading them until they reopen
+        self.tmp = path + ".tmp"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        os.makedirs(self.tmp)
+        self.rows = 0
+        self.dtypes = {}
+        self.segment_start, self.segment_season = [], []
+        self.player_id, self.player_segment = [], []
+        self.player_name, self.pairs = [], []
+        self.segments = self.players = 0
+        self.last = None  # (playerId, season, name) of the last row appended
+
+    def append(self, df):
+        arrays = {}
+        for column in df.columns:
+            if column == "name":
+                continue
+            if column == "gameDate":
+                arrays[column] = _game_date_ints(df[column]).astype("int32")
+            else:
+                default = df[column].dtype if df[column].dtype.kind in "iu" else "float32"
+                arrays[column] = df[column].to_numpy(dtype=self.dtypes.get(
+                    column, COLUMN_DTYPES.get(column, default)))
+        if not self.dtypes:
+            self.dtypes = {column: values.dtype for column, values in arrays.items()}
+        for column, values in arrays.items():
+            with open(os.path.join(self.tmp, f"{column}.bin"), "ab") as f:
+                values.tofile(f)
+        if not len(df):
+            return
+
+        # segment = one (playerId, season) run of rows, player = one run of
+        # segments; the first row only starts one if it differs from the last chunk's
+        starts = segment_starts(df, ["playerId", "season"])
+        player_starts = segment_starts(df, ["playerId"])
+        if self.last is not None:
+            player_id, season = arrays["playerId"][0], arrays["season"][0]
+            player_starts[0] = player_id != self.last[0]
+            starts[0] = player_starts[0] or season != self.last[1]
+        rows = np.flatnonzero(starts)
+        player_rows = np.flatnonzero(player_starts)
+        names = df["name"].astype(str).to_numpy()
+
+        self.segment_start.append(rows + self.rows)
+        self.segment_season.append(arrays["season"][rows])
+        self.player_id.append(arrays["playerId"][player_rows])
+        self.player_segment.append(np.searchsorted(rows, player_rows) + self.segments)
+        # Display name: the one of the player's latest season, i.e. of the row
+        # before the next player starts
+        ends = player_rows[player_rows > 0] - 1
+        if self.last is not None and player_starts[0]:
+            self.player_name.append(self.last[2])
+        self.player_name.extend(names[ends])
+
+        # Every spelling a player appears under
+        player = np.cumsum(player_starts) - 1 + self.players
+        pairs = pd.DataFrame({"name": names, "player": player}).drop_duplicates()
+        self.pairs.append(pairs)
+
+        self.rows += len(df)
+        self.segments += len(rows)
+        self.players = int(player[-1]) + 1
+        self.last = (arrays["playerId"][-1], arrays["season"][-1], names[-1])
+
+    def close(self):
+        """Write the offsets and metadata and move the store into place."""
+        if self.last is not None:
+            self.player_name.append(self.last[2])
+        offsets = {
+            "segment_start": np.append(np.concatenate(self.segment_start or [np.empty(0, "int64")]),
+                                       self.rows).astype("int64"),
+            "segment_season": np.concatenate(self.segment_season or [np.empty(0, "int16")]),
+            "player_id": np.concatenate(self.player_id or [np.empty(0, "int32")]),
+            "player_segment": np.append(np.concatenate(self.player_segment or [np.empty(0, "int64")]),
+                                        self.segments).astype("int64"),
+            "player_name": _text_array(self.player_name),
+        }
+        # Sorted for np.searchsorted
+        pairs = pd.concat(self.pairs) if self.pairs else pd.DataFrame({"name": [], "player": []})
+        pairs = pairs.drop_duplicates().sort_values(["name", "player"])
+        offsets["name_key"] = _text_array(pairs["name"])
+        offsets["name_player"] = pairs["player"].to_numpy(dtype="int32")
+
+        columns = {column: [dtype.str, self.rows] for column, dtype in self.dtypes.items()}
+        meta = {"version": STORE_VERSION, "rows": self.rows, "columns": columns, "offsets": {}}
+        for key, values in offsets.items():
+            values.tofile(os.path.join(self.tmp, f"{key}.bin"))
+            meta["offsets"][key] = [values.dtype.str, len(values)]
+        with open(os.path.join(self.tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        write_snapshot(ArrayStore(self.tmp), self.tmp)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp, self.path)
+
+
+def _map(folder, key, dtype, length):
+    if length == 0:  # np.memmap refuses empty files
+        return np.empty(0, dtype=dtype)
+    return np.memmap(os.path.join(folder, f"{key}.bin"), dtype=dtype, mode="r", shape=(length,))
+
+
+def snapshot(store):
+    """{"players": sorted names, "seasons": {name: seasons}, "columns": stored columns} of `store`."""
+    players = store.player_names()
+    return {
+        "players": players,
+        "seasons": {name: store.player_seasons(name) for name in players},
+        "columns": list(store.columns),
+    }
+
+
+def write_snapshot(store, path=ARRAY_DIR):
+    with open(os.path.join(path, SNAPSHOT_FILE), "w") as f:
+        json.dump(snapshot(store), f, separators=(",", ":"))
+
+
+def load_snapshot(path=ARRAY_DIR):
+    """The snapshot written with the store (computed from it for stores built without one)."""
+    try:
+        with open(os.path.join(path, SNAPSHOT_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return snapshot(ArrayStore(path))
+
+
+class ArrayStore:
+    """Read-only, memory-mapped view of a store written by write_arrays()."""
+
+    def __init__(self, path=ARRAY_DIR):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["version"] != STORE_VERSION:
+            raise ValueError(f"{path}: store version {meta['version']}, expected {STORE_VERSION}")
+        self.path = path
+        self.n_rows = meta["rows"]
+        self.columns = {key: _map(path, key, *spec) for key, spec in meta["columns"].items()}
+        self.offsets = {key: _map(path, key, *spec) for key, spec in meta["offsets"].items()}
+
+    def __len__(self):
+        return self.n_rows
+
+    # --- Players ---
+
+    def player_ids(self):
+        """Every playerId, sorted."""
+        return self.offsets["player_id"]
+
+    def _player(self, player_id):
+        ids = self.offsets["player_id"]
+        i = int(np.searchsorted(ids, player_id))
+        if i == len(ids) or ids[i] != player_id:
+            raise KeyError(player_id)
+        return i
+
+    def find(self, name):
+        """playerIds listed under `name` (usually one)."""
+        keys = self.offsets["name_key"]
+        a, b = np.searchsorted(keys, name, side="left"), np.searchsorted(keys, name, side="right")
+        players = np.unique(self.offsets["name_player"][a:b])
+        return [int(p) for p in self.offsets["player_id"][players]]
+
+    def player_name(self, player_id):
+        return str(self.offsets["player_name"][self._player(player_id)])
+
+    def player_names(self):
+        """Sorted display names (latest spelling of each player)."""
+        return sorted(set(self.offsets["player_name"].tolist()))
+
+    # --- Seasons and rows ---
+
+    def _segments(self, player_id):
+        i = self._player(player_id)
+        return int(self.offsets["player_segment"][i]), int(self.offsets["player_segment"][i + 1])
+
+    def seasons(self, player_id):
+        """Seasons of `player_id`, in order (a view)."""
+        return self.offsets["segment_season"][slice(*self._segments(player_id))]
+
+    def rows(self, player_id, season=None):
+        """(start, stop) rows of `player_id`, or of one of their seasons."""
+        first, last = self._segments(player_id)
+        starts = self.offsets["segment_start"]
+        if season is None:
+            return int(starts[first]), int(starts[last])
+        j = first + int(np.searchsorted(self.offsets["segment_season"][first:last], season))
+        if j == last or self.offsets["segment_season"][j] != season:
+            return 0, 0
+        return int(starts[j]), int(starts[j + 1])
+
+    def series(self, player_id, column, season=None):
+        """`column` for `player_id` (one season, or all in order): a view of the mapped file."""
+        return self.columns[column][slice(*self.rows(player_id, season))]
+
+    def player(self, player_id, columns=None, seasons=None):
+        """
+        {column: array} for `player_id`: views when the selected seasons are
+        consecutive (or `seasons` is None), copies otherwise.
+        """
+        columns = list(self.columns) if columns is None else columns
+        if seasons is None:
+            return {c: self.series(player_id, c) for c in columns}
+        ranges = [self.rows(player_id, int(s)) for s in sorted(seasons)]
+        ranges = [(a, b) for a, b in ranges if b > a]
+        if not ranges:
+            return {c: self.columns[c][:0] for c in columns}
+        if ranges[-1][1] - ranges[0][0] == sum(b - a for a, b in ranges):
+            return {c: self.columns[c][ranges[0][0]:ranges[-1][1]] for c in columns}
+        return {c: np.concatenate([self.columns[c][a:b] for a, b in ranges]) for c in columns}
+
+    # --- What script.py and dashboard_export.py use ---
+
+    def player_seasons(self, name):
+        """Seasons played under `name`, in order."""
+        seasons = set()
+        for player_id in self.find(name):
+            seasons.update(int(s) for s in self.seasons(player_id))
+        return sorted(seasons)
+
+    def season_series(self, name, stat, seasons):
+        """(season, gameNumber, `stat`) per selected season of `name`, in season order."""
+        for season in sorted(int(s) for s in seasons):
+            parts = [(self.series(p, "gameNumber", season), self.series(p, stat, season))
+                     for p in self.find(name)]
+            parts = [(x, y) for x, y in parts if len(x)]
+            if len(parts) == 1:
+                yield season, *parts[0]
+            elif parts:
+                yield season, np.concatenate([x for x, _ in parts]), np.concatenate([y for _, y in parts])
+
+    def to_frame(self, columns=None):
+        """
+        The whole table as a DataFrame (rows by playerId, season, gameNumber),
+        with each player's display name and gameDate as datetime64.
+        """
+        columns = list(self.columns) if columns is None else columns
+        data = {c: self.columns[c] for c in columns if c not in ("name", "gameDate")}
+        if "name" in columns:
+            starts = self.offsets["segment_start"][self.offsets["player_segment"]]
+            data["name"] = np.repeat(self.offsets["player_name"], np.diff(starts))
+        if "gameDate" in columns:
+            data["gameDate"] = parse_game_date(self.columns["gameDate"]).to_numpy()
+        return pd.DataFrame(data)[columns]
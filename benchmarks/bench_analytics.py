@@ -0,0 +1,94 @@
+# bench_analytics.py - Rolling pace / streaks: pandas groupby().rolling() vs analytics.add_analytics
+# Usage (from the project root): python benchmarks/bench_analytics.py [N_PLAYERS ...]
+#
+# Builds a synthetic combined frame (N_PLAYERS careers of 15 seasons x 82
+# games, with gameNumber and cum_* from cumulative.add_cumulative) and times
+# the naive pandas equivalent of every analytics column against the engine,
+# checking they agree. Then the longest streak / drought of every
+# player-season: run-length encoding vs a groupby max of the naive streaks.
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import STREAK_STATS, WINDOWS, add_analytics, analytics_columns, longest_streaks
+from cumulative import METRICS, SEGMENT_KEYS, add_cumulative
+
+SEASONS = 15
+GAMES = 82
+
+
+def synthetic(n_players):
+    rng = np.random.default_rng(0)
+    n = n_players * SEASONS * GAMES
+    goals = rng.binomial(2, 0.15, n)
+    df = pd.DataFrame({
+        "playerId": np.repeat(np.arange(n_players, dtype="int32"), SEASONS * GAMES),
+        "season": np.tile(np.repeat(np.arange(2008, 2008 + SEASONS, dtype="int16"), GAMES), n_players),
+        "I_F_points": (goals + rng.binomial(2, 0.2, n)).astype("float32"),
+        "I_F_goals": goals.astype("float32"),
+        "plusMinus": rng.integers(-2, 3, n).astype("float32"),
+    })
+    return add_cumulative(df)
+
+
+def groupby_rolling(df):
+    """The pandas way: one groupby().rolling() per stat and window, groupby cumsums for streaks."""
+    df = df.copy()
+    groups = df.groupby(SEGMENT_KEYS)
+    for source, target in METRICS:
+        stat = target.removeprefix("cum_")
+        for window in WINDOWS:
+            pace = groups[source].rolling(window, min_periods=1).mean()
+            df[f"pace{window}_{stat}"] = pace.reset_index(level=[0, 1], drop=True).astype("float32")
+        df[f"proj82_{stat}"] = (df[target] / df["gameNumber"] * 82).astype("float32")
+    for source, stat in STREAK_STATS:
+        scored = df[source] > 0
+        for column, flags in ((f"streak_{stat}", scored), (f"drought_{stat}", ~scored)):
+            breaks = (~flags).groupby([df[k] for k in SEGMENT_KEYS]).cumsum()
+            df[column] = flags.astype("int16").groupby([df["playerId"], df["season"], breaks]).cumsum()
+    return df
+
+
+def naive_longest(df):
+    return df.groupby(SEGMENT_KEYS, as_index=False).agg(
+        games=("gameNumber", "size"),
+        longest_streak=("streak_points", "max"),
+        longest_drought=("drought_points", "max"))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [300, 1500]
+    print(f"{len(analytics_columns())} columns: windows {WINDOWS}, per-82, streaks/droughts\n")
+    print(f"{'players':>8} {'rows':>9} {'groupby ms':>11} {'engine ms':>10} {'speedup':>8}  same"
+          f"   {'longest: groupby':>16} {'RLE':>7}  same")
+
+    for n_players in sizes:
+        df = synthetic(n_players)
+        old_ms, old = timed(groupby_rolling, df)
+        new_ms, new = timed(add_analytics, df)
+        same = all(np.allclose(old[c].to_numpy(), new[c].to_numpy(), atol=1e-5)
+                   for c in analytics_columns())
+
+        old_longest_ms, expected = timed(naive_longest, old)
+        rle_ms, result = timed(longest_streaks, df)
+        same_longest = all((expected[c].to_numpy() == result[c].to_numpy()).all()
+                           for c in ["games", "longest_streak", "longest_drought"])
+
+        print(f"{n_players:>8} {len(df):>9} {old_ms:>11.0f} {new_ms:>10.0f} {old_ms / new_ms:>7.1f}x  "
+              f"{'✅' if same else '❌'}   {old_longest_ms:>14.0f}ms {rle_ms:>5.0f}ms  "
+              f"{'✅' if same_longest else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# bench_archive.py - Disk footprint and cold-cache reads: data_gbg/ CSVs vs the career archive
+# Usage (from the project root): python benchmarks/bench_archive.py [--repeat N] [--folder data_gbg]
+#
+# Packs the CSVs into a temporary archive, then times reading every career
+# with the page cache emptied first (posix_fadvise DONTNEED on each file, no
+# root needed) and again warm: the columns the build uses, then all columns.
+# Also checks the build gives the same players_game_by_game.csv either way.
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+import career_archive
+import run_report
+from moneypuck_loader import read_archive_games, read_game_by_game
+
+
+def evict(paths):
+    """Drop `paths` from the page cache, so the next read comes from disk."""
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def disk_usage(paths):
+    """(bytes, allocated bytes) of `paths`."""
+    stats = [os.stat(path) for path in paths]
+    return sum(st.st_size for st in stats), sum(st.st_blocks * 512 for st in stats)
+
+
+def timed(fn, paths, repeat, cold):
+    best = None
+    for _ in range(repeat):
+        if cold:
+            evict(paths)
+        start = time.perf_counter()
+        rows = len(fn())
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Career archive vs loose CSVs")
+    parser.add_argument("--folder", default="data_gbg")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measure, best kept")
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.folder, "*.csv")))
+    if not files:
+        print(f"❌ No CSV files found in {args.folder}/")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = career_archive.CareerArchive(os.path.join(tmp, "archive"))
+        start = time.perf_counter()
+        career_archive.import_folder(args.folder, archive, verbose=False)
+        archive.close()
+        packed = time.perf_counter() - start
+        archive_files = archive.files()
+        players = archive.players()
+
+        csv_bytes, csv_blocks = disk_usage(files)
+        archive_bytes, archive_blocks = disk_usage(archive_files)
+        print(f"📦 {len(files)} CSV files → {len(players)} careers, packed in {packed:.1f}s\n")
+        print(f"{'':<10} {'files':>6} {'MB':>8} {'MB on disk':>11}")
+        print(f"{'CSV':<10} {len(files):>6} {csv_bytes / 1e6:>8.1f} {csv_blocks / 1e6:>11.1f}")
+        print(f"{'archive':<10} {len(archive_files):>6} {archive_bytes / 1e6:>8.1f} {archive_blocks / 1e6:>11.1f}")
+        print(f"💾 {csv_blocks / archive_blocks:.1f}x smaller on disk\n")
+
+        extra = [s for s in gbg.STATS if s != "plusMinus"]
+        reads = [
+            ("build cols", lambda: pd.concat([read_game_by_game(f, extra) for f in files]),
+             lambda: read_archive_games(archive, players, extra)),
+            ("all cols", lambda: pd.concat([pd.read_csv(f) for f in files]),
+             lambda: archive.read(players)),
+        ]
+        print(f"{'read':<11} {'cache':<6} {'CSV s':>7} {'archive s':>10} {'speedup':>8}")
+        for label, read_csv, read_archive in reads:
+            for cold in [True, False]:
+                t_csv, rows_csv = timed(read_csv, files, args.repeat, cold)
+                t_archive, rows_archive = timed(read_archive, archive_files, args.repeat, cold)
+                print(f"{label:<11} {'cold' if cold else 'warm':<6} {t_csv:>7.2f} {t_archive:>10.2f} "
+                      f"{t_csv / t_archive:>7.1f}x   ({rows_csv} / {rows_archive} rows)")
+
+        # Whole transform, without the build cache. A career saved twice in the
+        # folder (e.g. Nick_Suzuki.csv and 8480018.csv) is one career in the archive
+        ids = {}
+        for f in files:
+            name = os.path.basename(f)[:-4]
+            ids.setdefault(int(name) if name.isdigit() else career_archive.csv_player_id(f), f)
+        unique_files = sorted(ids.values())
+        report = run_report.RunReport("bench")
+        start = time.perf_counter()
+        from_csv, _, _ = gbg.build(unique_files, report=report)
+        t_csv = time.perf_counter() - start
+        start = time.perf_counter()
+        from_archive, _, _ = gbg.build([archive.key(p) for p in players], report=report, archive=archive)
+        t_archive = time.perf_counter() - start
+        same = from_csv.to_csv(index=False) == from_archive.to_csv(index=False)
+        print(f"\n🔄 build(): {t_csv:.2f}s from CSV, {t_archive:.2f}s from the archive "
+              f"({t_csv / t_archive:.1f}x), same output: {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# bench_array_store.py - Opening array_store vs loading the table, as the league grows
+# Usage (from the project root, after a build): python benchmarks/bench_array_store.py
+#
+# The current table is replicated (new playerIds and names) 1x / 5x / 20x. For
+# each size: time to open the store and get one player's season (cold: first
+# touch of those pages), vs loading the chart columns from Parquet and a CSV read.
+# Then PROCESSES processes map the largest store and read every column: their
+# added RSS is shared page cache (PSS ~ RSS / PROCESSES), not private copies.
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import array_store
+import build_players_game_by_game as gbg
+import parquet_store
+
+SCALES = [1, 5, 20]
+# What script.py plots
+CHART_COLUMNS = ["name", "season", "gameNumber", "cum_points", "cum_goals", "cum_plusMinus"]
+REPEAT = 5
+PROCESSES = 4
+
+
+def league(base, copies):
+    frames = []
+    for k in range(copies):
+        frame = base.copy()
+        frame["playerId"] = frame["playerId"] + k * 10_000_000
+        frame["name"] = frame["name"] + (f" #{k}" if k else "")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def median_ms(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def open_and_read(path, name):
+    store = array_store.ArrayStore(path)
+    (player_id,) = store.find(name)
+    season = int(store.seasons(player_id)[-1])
+    return float(store.series(player_id, "cum_points", season).sum())
+
+
+def smaps():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def reader(path, barrier, results):
+    before = smaps()
+    store = array_store.ArrayStore(path)
+    total = sum(float(column.sum(dtype="float64")) for column in store.columns.values())
+    barrier.wait()  # every process maps the store before anyone measures
+    after = smaps()
+    results.put((after["Rss"] - before["Rss"], after["Pss"] - before["Pss"], total))
+    barrier.wait()
+
+
+def main():
+    if not os.path.exists(gbg.OUTPUT_FILE):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    base = pd.read_csv(gbg.OUTPUT_FILE, parse_dates=["gameDate"])
+    name = base["name"].value_counts().index[0]
+
+    print(f"{'rows':>10} {'store MB':>9} {'open+series':>12} {'Parquet load':>17} {'read_csv':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            df = league(base, scale)
+            store_path = os.path.join(tmp, f"x{scale}.arrays")
+            parquet_path = os.path.join(tmp, f"x{scale}.parquet")
+            csv_path = os.path.join(tmp, f"x{scale}.csv")
+            array_store.write_arrays(df, store_path)
+            parquet_store.write_parquet(df, parquet_path)
+            df.to_csv(csv_path, index=False)
+            size = sum(os.path.getsize(os.path.join(store_path, f)) for f in os.listdir(store_path))
+
+            store_ms = median_ms(lambda: open_and_read(store_path, name))
+            parquet_ms = median_ms(lambda: parquet_store.read_games(parquet_path, columns=CHART_COLUMNS))
+            csv_ms = median_ms(lambda: pd.read_csv(csv_path))
+            print(f"{len(df):>10} {size / 1e6:>9.1f} {store_ms:>10.2f}ms {parquet_ms:>15.1f}ms {csv_ms:>7.0f}ms")
+
+        store_path = os.path.join(tmp, f"x{SCALES[-1]}.arrays")
+        # spawn: children start clean instead of inheriting this process's frames
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(PROCESSES)
+        results = context.Queue()
+        processes = [context.Process(target=reader, args=(store_path, barrier, results))
+                     for _ in range(PROCESSES)]
+        for p in processes:
+            p.start()
+        measures = [results.get() for _ in processes]
+        for p in processes:
+            p.join()
+
+    rss = statistics.mean(m[0] for m in measures) / 1024
+    pss = statistics.mean(m[1] for m in measures) / 1024
+    same = len({m[2] for m in measures}) == 1
+    print(f"\n{PROCESSES} processes reading every column of the x{SCALES[-1]} store "
+          f"({size / 1e6:.1f} MB): +{rss:.0f} MB RSS, +{pss:.0f} MB PSS per process "
+          f"{'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# bench_charts.py - Figure size and build time for long careers, before vs after downsampling
+# Usage (from the project root, after a build): python benchmarks/bench_charts.py
+#
+# For the longest careers of the array store and a synthetic 20-season one:
+#   before  every game of every season, SVG traces with markers
+#   after   charts.py as is: LTTB down to MAX_POINTS per figure, scattergl
+#           above WEBGL_THRESHOLD points
+#   cached  a rerun with the same (player, stat, seasons): only the JSON
+#           serialization st.plotly_chart does on every run
+# "error" is the largest gap, in points, between a downsampled curve
+# (interpolated) and the full one. Browser-side rendering is not timed here;
+# the number of points and markers sent is what drives it.
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import array_store
+import charts
+
+STAT = "cum_points"
+REPEAT = 5
+
+
+class SyntheticCareer:
+    """A 20-season, 82-game career with the season_series() interface."""
+
+    def __init__(self, seasons=20, games=82):
+        rng = np.random.default_rng(0)
+        self.data = {2005 + s: np.cumsum(rng.integers(0, 3, games)).astype("float32")
+                     for s in range(seasons)}
+
+    def player_seasons(self, name):
+        return list(self.data)
+
+    def season_series(self, name, stat, seasons):
+        for season in sorted(seasons):
+            y = self.data[season]
+            yield season, np.arange(1, len(y) + 1, dtype="int16"), y
+
+
+def timed(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def full_figure(index, name, seasons):
+    limits = charts.MAX_POINTS, charts.WEBGL_THRESHOLD
+    charts.MAX_POINTS = charts.WEBGL_THRESHOLD = 10**9
+    try:
+        return charts.cumulative_figure(index, name, STAT, seasons)
+    finally:
+        charts.MAX_POINTS, charts.WEBGL_THRESHOLD = limits
+
+
+def max_error(full, small):
+    error = 0.0
+    for a, b in zip(full.data, small.data):
+        x, y = np.asarray(a.x, dtype="float64"), np.asarray(a.y, dtype="float64")
+        error = max(error, np.abs(np.interp(x, np.asarray(b.x, dtype="float64"), b.y) - y).max())
+    return error
+
+
+def main():
+    if not os.path.isdir(array_store.ARRAY_DIR):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    store = array_store.ArrayStore()
+    longest = sorted(store.player_ids(), key=lambda p: -np.subtract(*store.rows(int(p))[::-1]))[:3]
+    careers = [(store, store.player_name(int(p))) for p in longest]
+    careers.append((SyntheticCareer(), "synthetic, 20 seasons"))
+
+    print(f"{'career':<24} {'points':>11} {'payload KB':>13} {'build+json ms':>15} "
+          f"{'cached ms':>10} {'trace':>10} {'error':>6}")
+    for index, name in careers:
+        seasons = index.player_seasons(name)
+        before_ms, before = timed(lambda: pio.to_json(full_figure(index, name, seasons), validate=False))
+        after_ms, after = timed(lambda: pio.to_json(
+            charts.cumulative_figure(index, name, STAT, seasons), validate=False))
+        figure = charts.cumulative_figure(index, name, STAT, seasons)
+        cached_ms, _ = timed(lambda: pio.to_json(figure, validate=False))
+
+        full = full_figure(index, name, seasons)
+        points = (sum(len(t.x) for t in full.data), sum(len(t.x) for t in figure.data))
+        print(f"{name[:24]:<24} {points[0]:>5}→{points[1]:<5} "
+              f"{len(before) / 1024:>6.1f}→{len(after) / 1024:<6.1f} "
+              f"{before_ms:>7.1f}→{after_ms:<7.1f} {cached_ms:>10.1f} "
+              f"{figure.data[0].type:>10} {max_error(full, figure):>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
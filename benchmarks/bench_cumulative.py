@@ -0,0 +1,72 @@
+# bench_cumulative.py - Running totals: one groupby pass per stat vs cumulative.add_cumulative
+# Usage (from the project root): python benchmarks/bench_cumulative.py [N_PLAYERS]
+#
+# Builds a synthetic combined frame (N_PLAYERS careers of 15 seasons x 82 games)
+# and times both approaches as the number of metrics grows from 3 to 30,
+# checking they produce the same columns.
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cumulative import add_cumulative
+
+METRIC_COUNTS = [3, 10, 20, 30]
+SEASONS = 15
+GAMES = 82
+
+
+def synthetic(n_players, n_metrics):
+    rng = np.random.default_rng(0)
+    n = n_players * SEASONS * GAMES
+    df = pd.DataFrame({
+        "playerId": np.repeat(np.arange(n_players, dtype="int32"), SEASONS * GAMES),
+        "season": np.tile(np.repeat(np.arange(2008, 2008 + SEASONS, dtype="int16"), GAMES), n_players),
+    })
+    for i in range(n_metrics):
+        df[f"stat{i}"] = rng.integers(0, 3, n).astype("float32")
+    return df
+
+
+def groupby_passes(df, metrics):
+    """What build_players_game_by_game.py did: cumcount + one cumsum per stat."""
+    df = df.copy()
+    df["gameNumber"] = df.groupby(["playerId", "season"]).cumcount() + 1
+    for source, target in metrics:
+        df[target] = df.groupby(["playerId", "season"])[source].cumsum()
+    return df
+
+
+def best_of(fn, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"📂 {n_players} players x {SEASONS} seasons x {GAMES} games "
+          f"= {n_players * SEASONS * GAMES} rows\n")
+    print(f"{'metrics':>8} {'groupby ms':>11} {'engine ms':>10} {'speedup':>8}  same")
+
+    for n_metrics in METRIC_COUNTS:
+        df = synthetic(n_players, n_metrics)
+        metrics = [(f"stat{i}", f"cum_stat{i}") for i in range(n_metrics)]
+
+        old_ms, old = best_of(groupby_passes, df, metrics)
+        new_ms, new = best_of(add_cumulative, df, metrics)
+
+        same = old.equals(new)
+        print(f"{n_metrics:>8} {old_ms:>11.1f} {new_ms:>10.1f} {old_ms / new_ms:>7.1f}x  "
+              f"{'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
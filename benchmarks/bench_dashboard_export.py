@@ -0,0 +1,130 @@
+# bench_dashboard_export.py - Inlined-table page (build_live_dashboard.R) vs dashboard_export.py
+# Usage (from the project root, after a build): python benchmarks/bench_dashboard_export.py
+#
+# "inlined" rebuilds what the R script ships: one page with the whole table and
+# the season summary as row JSON. "sharded" is dashboard_export.export(). Both
+# are served from a local HTTP server; page-ready is timed as what the page
+# needs before its first chart: download + JSON parse of the inlined data, or
+# of the index plus the first player's shard (gunzip included). Plotly
+# rendering is the same for both and is not timed.
+import gzip
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+import dashboard_export
+
+REPEAT = 5
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(folder):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=folder))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def write_inlined(folder):
+    """The R script's page: every row of the table plus the season summary, inlined."""
+    df = pd.read_csv(gbg.OUTPUT_FILE).rename(columns={"name": "player"})
+    summary = df.groupby(["player", "season"], as_index=False).agg(
+        GP=("gameNumber", "size"), G=("I_F_goals", "sum"), P=("I_F_points", "sum"),
+        plusMinus=("plusMinus", "sum"))
+    html = (f"<script>\nlet gameData = {df.to_json(orient='records')};\n"
+            f"let seasonData = {summary.to_json(orient='records')};\n</script>")
+    with open(os.path.join(folder, "index.html"), "w") as f:
+        f.write(html)
+    return len(html.encode("utf-8"))
+
+
+def inlined_ready(base):
+    html = get(f"{base}/index.html").decode("utf-8")
+    data = json.loads(re.search(r"let gameData = (.*);\n", html).group(1))
+    json.loads(re.search(r"let seasonData = (.*);\n", html).group(1))
+    # init(): the player list from every row, then the first player's rows
+    players = sorted({g["player"] for g in data})
+    return [g for g in data if g["player"] == players[0]]
+
+
+def sharded_ready(base):
+    html = get(f"{base}/index.html").decode("utf-8")
+    index = json.loads(re.search(r"const INDEX = (.*);\n", html).group(1))
+    player_id = index["players"][0][0]
+    return json.loads(gzip.decompress(get(f"{base}/players/{player_id}.json.gz")))
+
+
+def main():
+    if not os.path.exists(gbg.OUTPUT_FILE) or not os.path.isdir("players_game_by_game.parquet"):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as inlined_dir, tempfile.TemporaryDirectory() as sharded_dir:
+        inlined_bytes = write_inlined(inlined_dir)
+        with open(os.path.join(inlined_dir, "index.html"), "rb") as f:
+            inlined_gzip = len(gzip.compress(f.read(), mtime=0))
+
+        df = dashboard_export.load_games()
+        start = time.perf_counter()
+        stats = dashboard_export.export(df, sharded_dir)
+        export_ms = (time.perf_counter() - start) * 1000
+
+        shard_folder = os.path.join(sharded_dir, dashboard_export.SHARD_DIR)
+        shard_sizes = sorted(os.path.getsize(os.path.join(shard_folder, f)) for f in os.listdir(shard_folder))
+        index = json.loads(re.search(r"const INDEX = (.*);\n", open(
+            os.path.join(sharded_dir, "index.html"), encoding="utf-8").read()).group(1))
+        first_shard = os.path.getsize(os.path.join(shard_folder, f"{index['players'][0][0]}.json.gz"))
+
+        print(f"📂 {len(df)} rows, {stats['players']} players; export took {export_ms:.0f} ms\n")
+        print(f"{'':<28} {'inlined':>10} {'sharded':>10}")
+        print(f"{'page (raw)':<28} {inlined_bytes / 1024:>8.0f}KB {stats['html_bytes'] / 1024:>8.0f}KB")
+        print(f"{'page (gzip on the wire)':<28} {inlined_gzip / 1024:>8.0f}KB {stats['html_gzip_bytes'] / 1024:>8.0f}KB")
+        print(f"{'initial payload (gzip)':<28} {inlined_gzip / 1024:>8.0f}KB "
+              f"{(stats['html_gzip_bytes'] + first_shard) / 1024:>8.0f}KB  (page + first shard)")
+        print(f"{'shard size min/median/max':<28} {'':>10} "
+              f"{shard_sizes[0] / 1024:.1f}/{shard_sizes[len(shard_sizes) // 2] / 1024:.1f}/"
+              f"{shard_sizes[-1] / 1024:.1f} KB")
+
+        inlined_server, inlined_base = serve(inlined_dir)
+        sharded_server, sharded_base = serve(sharded_dir)
+        try:
+            inlined_ms = best_of(lambda: inlined_ready(inlined_base))
+            sharded_ms = best_of(lambda: sharded_ready(sharded_base))
+        finally:
+            inlined_server.shutdown()
+            sharded_server.shutdown()
+        print(f"{'page-ready (fetch + parse)':<28} {inlined_ms:>8.1f}ms {sharded_ms:>8.1f}ms  "
+              f"({inlined_ms / sharded_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# bench_download.py - Download throughput vs concurrency against a local stand-in server
+# Usage (from the project root): python benchmarks/bench_download.py [N_PLAYERS] [LATENCY_MS]
+#
+# Serves the careers already in data_gbg/ over HTTP with an artificial per-request
+# latency (and an occasional 503 to exercise the retries), downloads them into a
+# temp folder with download_all() and checks the files match byte for byte.
+# Later passes over the same folder measure refreshes where nothing changed:
+# served from the response cache, revalidated with 304s, and a subset of the
+# players (like the Canadiens download after a full-league one).
+import contextlib
+import filecmp
+import glob
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import download_all_moneypuck_players as dl
+import run_report
+from moneypuck_fetch import Downloader, ResponseCache
+
+CONCURRENCY = [1, 2, 4, 8, 16]
+FAIL_EVERY = 25  # every Nth request answers 503 once
+
+
+def start_server(directory, latency):
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def do_GET(self):
+            with lock:
+                counter["requests"] += 1
+                n = counter["requests"]
+            time.sleep(latency)
+            if n % FAIL_EVERY == 0:
+                self.send_error(503)
+                return
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counter
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    files = sorted(glob.glob("data_gbg/*.csv"))[:n_players]
+    if not files:
+        print("❌ No CSV files found in data_gbg/")
+        sys.exit(1)
+    players = {int(os.path.basename(f)[:-4]): os.path.basename(f)[:-4] for f in files}
+
+    server, counter = start_server(os.path.abspath("data_gbg"), latency)
+    base_url = f"http://127.0.0.1:{server.server_port}/{{player_id}}.csv"
+    print(f"📂 {len(players)} players, {latency * 1000:.0f} ms simulated latency, "
+          f"1 in {FAIL_EVERY} requests fails once\n")
+    print(f"{'concurrency':>11} {'seconds':>8} {'players/s':>10} {'requests':>9} {'identical':>10}")
+
+    for concurrency in CONCURRENCY:
+        counter["requests"] = 0
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = dl.download_all(players=players, base_url=base_url, folder=folder,
+                                        downloader=Downloader(concurrency, rate=0),
+                                        cache=ResponseCache(os.path.join(folder, "cache")),
+                                        report=run_report.RunReport("bench"), archive=None)
+            elapsed = time.perf_counter() - start
+
+            identical = all(
+                filecmp.cmp(f, os.path.join(folder, os.path.basename(f)), shallow=False)
+                for f in files
+            )
+        ok = "✅" if identical and stats["success"] == len(players) else "❌"
+        print(f"{concurrency:>11} {elapsed:>8.2f} {len(players) / elapsed:>10.1f} "
+              f"{counter['requests']:>9} {ok:>10}")
+
+    # Nightly refresh: everything already downloaded and unchanged on the server
+    print(f"\n{'pass':>20} {'seconds':>8} {'MB recv':>8} {'requests':>9} {'skipped':>8}")
+    subset = dict(list(players.items())[:8])
+    passes = [
+        ("initial", players, None),
+        ("refresh (cached)", players, None),
+        ("refresh (304)", players, 0),
+        ("subset (cached)", subset, None),
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        downloader = Downloader(8, rate=0)
+        for label, selection, max_age in passes:
+            cache = ResponseCache(os.path.join(folder, "cache"))
+            if max_age is not None:
+                cache.max_age = max_age
+            counter["requests"] = 0
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = dl.download_all(players=selection, base_url=base_url, folder=folder,
+                                        downloader=downloader, cache=cache,
+                                        report=run_report.RunReport("bench"), archive=None)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>20} {elapsed:>8.2f} {stats['bytes'] / 1e6:>8.1f} "
+                  f"{counter['requests']:>9} {stats['skipped']:>8}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# bench_loader.py - Parse time and memory of the pruned loader vs a plain read_csv
+# Usage (from the project root): python benchmarks/bench_loader.py [N_FILES]
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+from moneypuck_loader import read_game_by_game
+
+
+def plain_read(file):
+    # What build_players_game_by_game.py did before: every column, inferred
+    # dtypes, then the date conversion through strings
+    df = pd.read_csv(file)
+    df["gameDate"] = pd.to_datetime(df["gameDate"].astype(str), format="%Y%m%d", errors="coerce")
+    return df
+
+
+def measure(reader, files):
+    """Return (seconds, peak traced MB, frame MB) summed / maxed over `files`."""
+    seconds = 0.0
+    peak = 0
+    frame = 0
+    for file in files:
+        tracemalloc.start()
+        start = time.perf_counter()
+        df = reader(file)
+        seconds += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        frame = max(frame, df.memory_usage(deep=True).sum())
+    return seconds, peak / 1e6, frame / 1e6
+
+
+def main():
+    files = sorted(glob.glob(gbg.DATA_FOLDER))
+    if len(sys.argv) > 1:
+        files = files[:int(sys.argv[1])]
+    if not files:
+        print("❌ No CSV files found in data_gbg/")
+        sys.exit(1)
+
+    size = sum(os.path.getsize(f) for f in files) / 1e6
+    print(f"📂 {len(files)} files, {size:.0f} MB\n")
+    print(f"{'reader':<12} {'ms/file':>8} {'peak MB':>8} {'frame MB':>9}")
+
+    results = {}
+    for label, reader in [("read_csv", plain_read), ("loader", read_game_by_game)]:
+        seconds, peak, frame = measure(reader, files)
+        results[label] = (seconds, peak, frame)
+        print(f"{label:<12} {seconds * 1000 / len(files):>8.1f} {peak:>8.1f} {frame:>9.2f}")
+
+    (t0, p0, f0), (t1, p1, f1) = results["read_csv"], results["loader"]
+    print(f"\n⚡ {t0 / t1:.1f}x faster, {p0 / p1:.1f}x lower peak, {f0 / f1:.1f}x smaller frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# bench_pace_matrix.py - Game-N leaderboards: pace_matrix vs a filter on the long table
+# Usage (from the project root, after a build): python benchmarks/bench_pace_matrix.py
+#
+# The current table is replicated (new playerIds and names) 1x / 5x / 20x and
+# written as an array store plus matrices. Timed queries (median of REPEAT,
+# every game number in turn):
+#   - leaderboard: top 10 of one season after game N
+#   - rank: one player-season's rank after game N among every season
+# "long table" is the pandas way on the loaded table: filter, then sort / count.
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import array_store
+import build_players_game_by_game as gbg
+import pace_matrix
+
+SCALES = [1, 5, 20]
+REPEAT = 20
+STAT = "cum_points"
+
+
+def league(base, copies):
+    frames = []
+    for k in range(copies):
+        frame = base.copy()
+        frame["playerId"] = frame["playerId"] + k * 10_000_000
+        frame["name"] = frame["name"] + (f" #{k}" if k else "")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def long_leaderboard(df, season, game_number):
+    rows = df[(df["season"] == season) & (df["gameNumber"] == game_number)]
+    rows = rows.drop_duplicates(["playerId", "season"])
+    return rows.sort_values(STAT, ascending=False, kind="stable").head(10)
+
+
+def long_rank(df, player_id, season, game_number):
+    rows = df[df["gameNumber"] == game_number].drop_duplicates(["playerId", "season"])
+    value = rows.loc[(rows["playerId"] == player_id) & (rows["season"] == season), STAT].iloc[0]
+    return int((rows[STAT] > value).sum()) + 1
+
+
+def median_ms(fn, game_numbers):
+    times = []
+    for game_number in game_numbers:
+        start = time.perf_counter()
+        fn(game_number)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    if not os.path.exists(gbg.OUTPUT_FILE):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    base = pd.read_csv(gbg.OUTPUT_FILE, parse_dates=["gameDate"])
+    season = 2024
+    player = base[base["season"] == season]["name"].value_counts().index[0]
+    player_id = int(base.loc[base["name"] == player, "playerId"].iloc[0])
+    game_numbers = np.linspace(1, 60, REPEAT).astype(int)
+
+    print(f"📂 leaderboard: {season}, game N; rank: {player} {season} among every season\n")
+    print(f"{'rows':>10} {'build ms':>9} {'leaderboard: long':>18} {'matrix':>8} "
+          f"{'rank: long':>11} {'matrix':>8}  same")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            df = league(base, scale)
+            store_path = os.path.join(tmp, f"x{scale}.arrays")
+            matrix_path = os.path.join(tmp, f"x{scale}.matrix")
+            array_store.write_arrays(df, store_path)
+            start = time.perf_counter()
+            pace_matrix.write_matrix(array_store.ArrayStore(store_path), matrix_path)
+            build_ms = (time.perf_counter() - start) * 1000
+            matrix = pace_matrix.PaceMatrix(matrix_path)
+
+            long_lb = median_ms(lambda n: long_leaderboard(df, season, n), game_numbers)
+            matrix_lb = median_ms(lambda n: matrix.leaderboard(STAT, n, season), game_numbers)
+            long_rk = median_ms(lambda n: long_rank(df, player_id, season, n), game_numbers)
+            matrix_rk = median_ms(lambda n: matrix.rank(STAT, n, player_id, season), game_numbers)
+
+            same = all(
+                (long_leaderboard(df, season, n)[STAT].to_numpy()
+                 == matrix.leaderboard(STAT, n, season)[STAT].to_numpy()).all()
+                and long_rank(df, player_id, season, n) == matrix.rank(STAT, n, player_id, season)["rank"]
+                for n in game_numbers)
+            print(f"{len(df):>10} {build_ms:>9.0f} {long_lb:>16.1f}ms {matrix_lb:>6.2f}ms "
+                  f"{long_rk:>9.1f}ms {matrix_rk:>6.2f}ms  {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_parquet.py - Load time and size of players_game_by_game.csv vs the Parquet dataset
+# Usage (from the project root, after a build): python benchmarks/bench_parquet.py
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+import parquet_store
+
+REPEAT = 5
+COLUMNS = ["name", "season", "gameNumber", "cum_points", "cum_goals", "cum_plusMinus"]
+
+
+def dir_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    if not os.path.exists(gbg.OUTPUT_FILE) or not os.path.isdir(parquet_store.PARQUET_DIR):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    # The player with the most games, i.e. the worst case for a single-player load
+    df = pd.read_csv(gbg.OUTPUT_FILE)
+    player = df["name"].value_counts().index[0]
+    print(f"📂 {len(df)} rows, {df['name'].nunique()} players, sample player: {player}\n")
+
+    csv_mb = os.path.getsize(gbg.OUTPUT_FILE) / 1e6
+    parquet_mb = dir_size(parquet_store.PARQUET_DIR) / 1e6
+    print(f"{'':<28} {'CSV':>9} {'Parquet':>9}")
+    print(f"{'size on disk (MB)':<28} {csv_mb:>9.2f} {parquet_mb:>9.2f}")
+
+    rows = [
+        ("full table (ms)",
+         lambda: pd.read_csv(gbg.OUTPUT_FILE),
+         lambda: parquet_store.read_games()),
+        ("chart columns (ms)",
+         lambda: pd.read_csv(gbg.OUTPUT_FILE, usecols=COLUMNS),
+         lambda: parquet_store.read_games(columns=COLUMNS)),
+        ("one player (ms)",
+         lambda: (lambda d: d[d["name"] == player])(pd.read_csv(gbg.OUTPUT_FILE)),
+         lambda: parquet_store.read_games(columns=COLUMNS, name=player)),
+        ("player list (ms)",
+         lambda: sorted(pd.read_csv(gbg.OUTPUT_FILE, usecols=["name"])["name"].unique()),
+         lambda: parquet_store.player_names()),
+    ]
+    for label, csv_fn, parquet_fn in rows:
+        print(f"{label:<28} {best_of(csv_fn):>9.1f} {best_of(parquet_fn):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
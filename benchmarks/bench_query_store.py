@@ -0,0 +1,84 @@
+# bench_query_store.py - query_store (SQLite) vs the pandas full-scan path
+# Usage (from the project root, after a build): python benchmarks/bench_query_store.py
+#
+# "pandas" is what a consumer does today: load players_game_by_game.csv, then
+# filter / group. Each query is timed cold (including the load or connect) and
+# warm (data already loaded / connection open), and the answers are compared.
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+import query_store as qs
+
+REPEAT = 5
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def pandas_series(df, name, seasons):
+    rows = df[(df["name"] == name) & df["season"].isin(seasons)]
+    return rows.sort_values(["season", "gameNumber"])[["season", "gameNumber", "cum_points"]]
+
+
+def pandas_totals(df, name):
+    rows = df[df["name"] == name]
+    return rows.groupby(["playerId", "name", "season"], as_index=False).agg(
+        games=("gameNumber", "size"), I_F_points=("I_F_points", "sum"))
+
+
+def pandas_leaderboard(df, season, game_number):
+    rows = df[(df["season"] == season) & (df["gameNumber"] == game_number)]
+    return rows.sort_values(["cum_points", "name"], ascending=[False, True]).head(10)
+
+
+def main():
+    if not os.path.exists(gbg.OUTPUT_FILE) or not os.path.exists(qs.DB_FILE):
+        print("❌ Run python build_players_game_by_game.py first")
+        sys.exit(1)
+
+    df = pd.read_csv(gbg.OUTPUT_FILE)
+    name = df["name"].value_counts().index[0]
+    seasons = sorted(int(s) for s in df.loc[df["name"] == name, "season"].unique())[-3:]
+    season = int(df["season"].max())
+    print(f"📂 {len(df)} rows; player {name}, seasons {seasons}, leaderboard {season} game 41\n")
+
+    con = qs.connect()
+    # (label, pandas query, store query, column compared)
+    queries = [
+        ("player series",
+         lambda d: pandas_series(d, name, seasons),
+         lambda c: qs.player_series(c, name, "cum_points", seasons), "cum_points"),
+        ("season totals",
+         lambda d: pandas_totals(d, name),
+         lambda c: qs.season_totals(c, name=name), "I_F_points"),
+        ("leaderboard",
+         lambda d: pandas_leaderboard(d, season, 41),
+         lambda c: qs.leaderboard(c, season, 41), "cum_points"),
+    ]
+
+    print(f"{'query':<15} {'pandas cold':>12} {'sqlite cold':>12} {'pandas warm':>12} {'sqlite warm':>12}  same")
+    for label, pandas_fn, store_fn, column in queries:
+        pandas_cold, expected = best_of(lambda: pandas_fn(pd.read_csv(gbg.OUTPUT_FILE)))
+        store_cold, _ = best_of(lambda: store_fn(qs.connect()))
+        pandas_warm, _ = best_of(lambda: pandas_fn(df))
+        store_warm, result = best_of(lambda: store_fn(con))
+        same = len(result) == len(expected) and (
+            result[column].to_numpy() == expected[column].to_numpy()).all()
+        print(f"{label:<15} {pandas_cold:>10.1f}ms {store_cold:>10.1f}ms "
+              f"{pandas_warm:>10.2f}ms {store_warm:>10.2f}ms  {'✅' if same else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_roster.py - Time to build the "all players" roster, before vs after caching
+# Usage (from the project root): python benchmarks/bench_roster.py [LATENCY_MS]
+#
+# A local server stands in for MoneyPuck's seasonSummary endpoint (seasons
+# missing from data/ are served as a copy of the latest one). Compares the old
+# sequential read_csv(url) + iterrows + sleep(1) loop with select_players() on
+# a cold and on a warm cache, and checks they return the same roster.
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench_download
+import moneypuck_fetch as mf
+
+
+def legacy_roster(url_template, seasons):
+    """The previous get_multi_season_players() loop, verbatim apart from the URL."""
+    all_players = {}
+    for season in seasons:
+        df = pd.read_csv(url_template.format(season=season))
+        for _, row in df.iterrows():
+            all_players[row['playerId']] = row['name']
+        time.sleep(1)  # Be nice to the server
+    return list(all_players.keys()), all_players
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 100) / 1000
+
+    local = sorted(glob.glob("data/skaters_*.csv"))
+    if not local:
+        print("❌ No season summaries found in data/")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as root:
+        # /{season}/regular/skaters.csv, like moneypuck.com
+        for season in mf.SEASONS:
+            own = f"data/skaters_{season}_{season + 1}.csv"
+            os.makedirs(f"{root}/{season}/regular")
+            shutil.copy(own if os.path.exists(own) else local[-1], f"{root}/{season}/regular/skaters.csv")
+
+        bench_download.FAIL_EVERY = 10 ** 9  # no injected failures here
+        server, counter = bench_download.start_server(root, latency)
+        url = f"http://127.0.0.1:{server.server_port}/{{season}}/regular/skaters.csv"
+        mf.SEASON_SUMMARY_URL = url
+
+        print(f"📂 {len(mf.SEASONS)} seasons, {latency * 1000:.0f} ms simulated latency, "
+              f"{sum(os.path.exists(f'data/skaters_{s}_{s + 1}.csv') for s in mf.SEASONS)} in data/\n")
+        print(f"{'roster':<24} {'seconds':>8} {'requests':>9} {'players':>8}")
+
+        counter["requests"] = 0
+        start = time.perf_counter()
+        expected = legacy_roster(url, mf.SEASONS)
+        print(f"{'iterrows + sleep(1)':<24} {time.perf_counter() - start:>8.2f} "
+              f"{counter['requests']:>9} {len(expected[0]):>8}")
+
+        cache_dir = os.path.join(root, "cache")
+        for label in ["select_players (cold)", "select_players (warm)"]:
+            counter["requests"] = 0
+            cache = mf.ResponseCache(cache_dir)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = mf.select_players(downloader=mf.Downloader(8, rate=0), cache=cache)
+            elapsed = time.perf_counter() - start
+            same = "✅" if result == expected else "❌ differs"
+            print(f"{label:<24} {elapsed:>8.2f} {counter['requests']:>9} {len(result[0]):>8} {same}")
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
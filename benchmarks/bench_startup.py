@@ -0,0 +1,123 @@
+# bench_startup.py - Cold start of the pipeline scripts and time to first render of script.py
+# Usage (from the project root, after a build): python benchmarks/bench_startup.py [--repeat 5]
+#
+# Every measure runs in a fresh interpreter and keeps its best time:
+#   import     python -X importtime -c "import <module>": cumulative import
+#              time of the entry point, and its heaviest direct imports
+#   --help     wall time of `python <script> --help` (start-up, no work)
+#   no-op      wall time of build_players_game_by_game.py when nothing changed
+#   script.py  with streamlit already imported (as in `streamlit run`), time
+#              from the start of the script's first run to its first widget
+#              and to its chart (streamlit.testing's AppTest)
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENTRY_POINTS = ["build_players_game_by_game", "update_all", "download_all_moneypuck_players",
+                "dashboard_export", "build_dataset", "watch_updates", "cli"]
+
+# Run in a fresh interpreter: prints {mark: seconds since the run started}
+FIRST_RENDER = """
+import json, sys, time
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+marks = {}
+
+def mark(name, fn):
+    def wrapper(*args, **kwargs):
+        marks.setdefault(name, time.perf_counter())
+        return fn(*args, **kwargs)
+    return wrapper
+
+st.selectbox = mark("first_widget", st.selectbox)
+st.plotly_chart = mark("chart", st.plotly_chart)
+start = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+if app.exception:
+    sys.exit(str(app.exception))
+print(json.dumps({name: t - start for name, t in marks.items()}))
+"""
+
+
+def best(repeat, fn):
+    return min(fn() for _ in range(repeat))
+
+
+def wall(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def import_times(module):
+    """{imported module: cumulative µs} of one `import module`, and the direct imports of `module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    times, direct, children = {}, [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = int(cumulative)
+        # Children are listed before their parent: the direct imports of a
+        # top-level module are the depth-1 lines since the previous top-level one
+        if depth == 1:
+            children.append(name.strip())
+        elif depth == 0:
+            if name.strip() == module:
+                direct = children
+            children = []
+    return times, direct
+
+
+def first_render(repeat):
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", FIRST_RENDER, os.path.join(ROOT, "script.py")],
+                                cwd=ROOT, check=True, capture_output=True, text=True)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {mark: min(run[mark] for run in runs) for mark in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time, --help, no-op build and script.py first render")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measure, best kept (default: 5)")
+    args = parser.parse_args()
+
+    print(f"{'entry point':<34} {'import ms':>10} {'--help ms':>10}  heaviest imports")
+    for module in ENTRY_POINTS:
+        if not os.path.exists(os.path.join(ROOT, f"{module}.py")):
+            continue
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = min(times[module] for times, _ in runs) / 1000
+        times, direct = min(runs, key=lambda run: run[0][module])
+        heaviest = sorted(direct, key=times.get, reverse=True)[:3]
+        help_ms = best(args.repeat, lambda: wall([f"{module}.py", "--help"])) * 1000
+        print(f"{module:<34} {total:>10.0f} {help_ms:>10.0f}  "
+              + ", ".join(f"{name} {times[name] / 1000:.0f}" for name in heaviest))
+
+    import build_players_game_by_game as gbg
+    import build_cache
+    files, _, fingerprints = gbg.careers()
+    if gbg.is_up_to_date(files, build_cache.load_manifest(gbg.SIGNATURE), fingerprints):
+        no_op = best(args.repeat, lambda: wall(["build_players_game_by_game.py"]))
+        print(f"\n{'no-op build (nothing changed)':<34} {no_op * 1000:>10.0f} ms")
+    else:
+        print("\n⚠️  Outputs not up to date: build first to time the no-op build")
+
+    marks = first_render(args.repeat)
+    print(f"{'script.py first widget':<34} {marks['first_widget'] * 1000:>10.0f} ms")
+    print(f"{'script.py chart':<34} {marks['chart'] * 1000:>10.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
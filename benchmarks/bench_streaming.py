@@ -0,0 +1,129 @@
+# bench_streaming.py - Peak RSS and time of the in-memory vs the streaming (--streaming) build
+# Usage (from the project root):
+#   python benchmarks/bench_streaming.py                               # 1,500 and 10,000 players
+#   python benchmarks/bench_streaming.py --players 1500 --max-memory 300 512
+#   python benchmarks/bench_streaming.py --csv                         # from data_gbg/ CSVs
+#
+# Each league (generate_moneypuck.py, kept in --data-dir) is packed into a
+# career archive once, then built from scratch in a temporary folder: once in
+# memory, once per --max-memory cap with --streaming, each in its own process
+# so its peak RSS (the largest stage peak of the run report) is its own. Every
+# output of a streaming build is compared with the in-memory one: the CSV,
+# array store and matrices byte for byte, the Parquet and SQLite rows.
+import argparse
+import filecmp
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import build_players_game_by_game as gbg
+import career_archive
+import generate_moneypuck
+import parquet_store
+import query_store
+
+SCALES = [1500, 10000]
+CAPS = [512]
+OUTPUTS = ["players_game_by_game.csv", "players_game_by_game.arrays", "players_game_by_game.matrix",
+           "players_game_by_game.parquet", "players_game_by_game.sqlite"]
+
+
+def league(players, seasons, seed, data_dir, csv):
+    """
+    (path, name in the build folder) of the league's CSVs or, unless `csv`,
+    of its archive; generated / packed when missing.
+    """
+    folder = os.path.join(data_dir, f"{players}x{seasons}")
+    generate_moneypuck.ensure(folder, players, seasons, seed)
+    if csv:
+        return folder, "data_gbg"
+    path = folder + ".archive"
+    if not career_archive.exists(path):
+        print(f"📦 Packing {folder} into {path}...")
+        with career_archive.CareerArchive(path) as archive:
+            career_archive.import_folder(folder, archive, verbose=False)
+    return path, gbg.ARCHIVE_DIR
+
+
+def build(source, workdir, args):
+    """Run the build in `workdir` on `source`; returns (seconds, peak RSS MB, stage peaks)."""
+    os.makedirs(workdir)
+    os.symlink(os.path.abspath(source[0]), os.path.join(workdir, source[1]))
+    report = os.path.join(workdir, "report.jsonl")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "build_players_game_by_game.py"), "--full",
+                    "--report", report, *args], cwd=workdir, check=True, stdout=subprocess.DEVNULL)
+    seconds = time.perf_counter() - start
+    with open(report) as f:
+        records = [json.loads(line) for line in f]
+    stages = {r["stage"]: r["peak_rss_mb"] for r in records if r["type"] == "stage"}
+    return seconds, max(stages.values()), stages
+
+
+def same_outputs(a, b):
+    """True if the build outputs in folders `a` and `b` hold the same data."""
+    csv, arrays, matrix, parquet, sqlite = ([os.path.join(folder, name) for folder in (a, b)]
+                                            for name in OUTPUTS)
+    if not filecmp.cmp(*csv, shallow=False):
+        return False
+    for x, y in (arrays, matrix):
+        names = sorted(os.listdir(x))
+        if names != sorted(os.listdir(y)) or filecmp.cmpfiles(x, y, names, shallow=False)[1]:
+            return False
+    frames = [parquet_store.read_games(path).astype({"name": str}) for path in parquet]
+    if not frames[0].equals(frames[1]):
+        return False
+    tables = []
+    for path in sqlite:
+        with sqlite3.connect(path) as con:
+            tables.append(pd.read_sql_query(f"SELECT * FROM {query_store.TABLE} ORDER BY rowid", con))
+    return tables[0].equals(tables[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory vs streaming build: peak RSS and time")
+    parser.add_argument("--players", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--seasons", type=int, default=5, help="Seasons per career (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-memory", type=int, nargs="+", default=CAPS, metavar="MB",
+                        help=f"Caps of the streaming builds (default: {CAPS})")
+    parser.add_argument("--csv", action="store_true", help="Build from the CSVs rather than an archive")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "moneypuck_synthetic"),
+                        help="Where generated leagues are kept between runs")
+    args = parser.parse_args()
+
+    results = []
+    for players in args.players:
+        source = league(players, args.seasons, args.seed, args.data_dir, args.csv)
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = os.path.join(tmp, "memory")
+            seconds, peak, _ = build(source, memory, [])
+            results.append((players, "in memory", "", seconds, peak, ""))
+            print(f"✅ {players} players in memory: {seconds:.1f}s, {peak:.0f} MB")
+            for cap in args.max_memory:
+                streaming = os.path.join(tmp, f"streaming-{cap}")
+                seconds, peak, stages = build(source, streaming, ["--streaming", "--max-memory", str(cap)])
+                same = same_outputs(memory, streaming)
+                results.append((players, "streaming", cap, seconds, peak, "✅" if same else "❌"))
+                print(f"✅ {players} players streaming under {cap} MB: {seconds:.1f}s, {peak:.0f} MB "
+                      f"({', '.join(f'{s} {p:.0f}' for s, p in stages.items())})")
+
+    print(f"\n{'players':>8} {'mode':<10} {'cap MB':>7} {'seconds':>8} {'peak MB':>8}  same output")
+    for players, mode, cap, seconds, peak, same in results:
+        print(f"{players:>8} {mode:<10} {cap:>7} {seconds:>8.1f} {peak:>8.0f}  {same}")
+    if any(same == "❌" for *_, same in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
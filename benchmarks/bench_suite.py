@@ -0,0 +1,206 @@
+# bench_suite.py - Stage-by-stage timings of the build on synthetic leagues
+# Usage (from the project root):
+#   python benchmarks/bench_suite.py                          # 300, 1,500 and 10,000 players
+#   python benchmarks/bench_suite.py --players 300 1500 --repeat 3
+#   python benchmarks/bench_suite.py --compare benchmarks/results/OLD.json   # run, then compare
+#   python benchmarks/bench_suite.py --compare OLD.json NEW.json             # compare only
+#
+# Leagues come from generate_moneypuck.py (same header, 5 situations per
+# game, `--seasons` per career) and are kept in --data-dir between runs. The
+# stages are the build's own functions, run serially without the cache:
+#   parse      read_game_by_game() of every file
+#   filter     filter_games(): one situation, plusMinus, the kept columns
+#   aggregate  aggregate_games(): one row per game, in season order
+#   situations add_situations(): the stats of every game per situation
+#   concat     pd.concat of the per-player frames
+#   cumulate   add_totals(): gameNumber and the cum_* columns, per situation too
+#   sort       the final sort by name, season, gameDate
+#   write      to_csv of the combined table (without the situations)
+# Each stage keeps its best time over --repeat runs. Results (times, row and
+# byte counts, versions, commit) go to a JSON file; --compare prints the
+# ratio per stage and exits 1 when a stage got slower than --threshold.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import build_players_game_by_game as gbg
+import generate_moneypuck
+from moneypuck_loader import read_game_by_game
+
+STAGES = ["parse", "filter", "aggregate", "situations", "concat", "cumulate", "sort", "write"]
+SCALES = [300, 1500, 10000]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Differences under this many seconds are noise, whatever the ratio
+NOISE_SECONDS = 0.05
+
+
+def run_stages(files, output):
+    """One serial build of `files` into `output`: ({stage: seconds}, counts)."""
+    seconds = dict.fromkeys(STAGES, 0.0)
+    extra_columns = [s for s in gbg.STATS if s != "plusMinus"]
+    frames = []
+    rows_parsed = 0
+
+    for file in files:
+        start = time.perf_counter()
+        parsed_df = read_game_by_game(file, extra_columns=extra_columns)
+        parsed = time.perf_counter()
+        rows_parsed += len(parsed_df)
+        df = gbg.filter_games(parsed_df)
+        filtered = time.perf_counter()
+        games = gbg.aggregate_games(df)
+        aggregated = time.perf_counter()
+        games = gbg.add_situations(games, parsed_df)
+        done = time.perf_counter()
+        seconds["parse"] += parsed - start
+        seconds["filter"] += filtered - parsed
+        seconds["aggregate"] += aggregated - filtered
+        seconds["situations"] += done - aggregated
+        frames.append(games)
+
+    def timed(stage, fn):
+        start = time.perf_counter()
+        result = fn()
+        seconds[stage] = time.perf_counter() - start
+        return result
+
+    all_games = timed("concat", lambda: pd.concat(frames, ignore_index=True))
+    all_games = timed("cumulate", lambda: gbg.add_totals(all_games))
+    all_games = timed("sort", lambda: gbg.without_situations(all_games).sort_values(gbg.CSV_ORDER))
+    timed("write", lambda: all_games.to_csv(output, index=False))
+
+    counts = {
+        "files": len(files),
+        "input_bytes": sum(os.path.getsize(f) for f in files),
+        "rows_parsed": rows_parsed,
+        "rows_out": len(all_games),
+        "output_bytes": os.path.getsize(output),
+    }
+    return seconds, counts
+
+
+def run_scale(players, seasons, seed, repeat, data_dir):
+    folder = os.path.join(data_dir, f"{players}x{seasons}")
+    start = time.perf_counter()
+    files = generate_moneypuck.ensure(folder, players, seasons, seed)
+    print(f"📂 {players} players ready in {time.perf_counter() - start:.1f}s ({folder})")
+
+    best = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            seconds, counts = run_stages(files, os.path.join(tmp, "out.csv"))
+            best = seconds if best is None else {s: min(best[s], seconds[s]) for s in STAGES}
+    return {"players": players, **counts, "seconds": best, "total": sum(best.values())}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def print_results(results):
+    print(f"\n{'players':>8} {'rows in':>11} " + " ".join(f"{s:>9}" for s in STAGES) + f" {'total':>8}")
+    for r in results:
+        print(f"{r['players']:>8} {r['rows_parsed']:>11} "
+              + " ".join(f"{r['seconds'][s]:>8.2f}s" for s in STAGES) + f" {r['total']:>7.2f}s")
+
+
+def compare(old, new, threshold):
+    """Print new/old per stage and scale; returns the number of regressions."""
+    old_by_players = {r["players"]: r for r in old["results"]}
+    print(f"\n📊 {old['meta'].get('commit')} ({old['meta']['created']}) → "
+          f"{new['meta'].get('commit')} ({new['meta']['created']}), new / old:")
+    print(f"{'players':>8} " + " ".join(f"{s:>9}" for s in STAGES + ["total"]))
+    regressions = 0
+    for r in new["results"]:
+        base = old_by_players.get(r["players"])
+        if base is None:
+            continue
+        cells = []
+        for stage in STAGES + ["total"]:
+            before = base["total"] if stage == "total" else base["seconds"].get(stage)
+            if before is None:
+                # A stage the baseline did not have yet
+                cells.append(f"{'new':>8} ")
+                continue
+            after = r["total"] if stage == "total" else r["seconds"][stage]
+            ratio = after / before if before else float("inf")
+            slower = ratio > threshold and after - before > NOISE_SECONDS
+            regressions += slower and stage != "total"
+            cells.append(f"{ratio:>7.2f}x" + ("❌" if slower else " "))
+        print(f"{r['players']:>8} " + " ".join(cells))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each build stage on synthetic leagues")
+    parser.add_argument("--players", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--seasons", type=int, default=5, help="Seasons per career (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scale, best time kept")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "moneypuck_synthetic"),
+                        help="Where generated leagues are kept between runs")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/suite-<date>.json)")
+    parser.add_argument("--compare", nargs="+", metavar="RESULTS",
+                        help="Baseline results to compare this run with, or two results files to compare")
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="new / old ratio above which a stage counts as a regression (default: 1.10)")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline, or a baseline and a new results file")
+    loaded = []
+    for path in args.compare or []:
+        with open(path) as f:
+            loaded.append(json.load(f))
+
+    if len(loaded) == 2:
+        new = loaded[1]
+    else:
+        new = {
+            "meta": {**environment(), "seasons": args.seasons, "seed": args.seed, "repeat": args.repeat},
+            "results": [run_scale(players, args.seasons, args.seed, args.repeat, args.data_dir)
+                        for players in args.players],
+        }
+        print_results(new["results"])
+
+        output = args.output or os.path.join(RESULTS_DIR, f"suite-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(new, f, indent=1)
+        print(f"\n✅ Results written to {output}")
+
+    if loaded:
+        regressions = compare(loaded[0], new, args.threshold)
+        if regressions:
+            print(f"\n❌ {regressions} stage(s) slower than {args.threshold:.2f}x the baseline")
+            sys.exit(1)
+        print("\n✅ No stage slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bench_workers.py - Scaling of build_players_game_by_game.py with --workers
+# Usage (from the project root): python benchmarks/bench_workers.py
+import contextlib
+import glob
+import hashlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build_players_game_by_game as gbg
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def main():
+    files = sorted(glob.glob(gbg.DATA_FOLDER))
+    if not files:
+        print("❌ No CSV files found in data_gbg/")
+        sys.exit(1)
+
+    print(f"📂 {len(files)} files, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}  sha1(output)")
+
+    baseline = None
+    digests = set()
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            all_games, _, _ = gbg.build(files, workers)
+        elapsed = time.perf_counter() - start
+
+        digest = hashlib.sha1(all_games.to_csv(index=False).encode()).hexdigest()[:12]
+        digests.add(digest)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x  {digest}")
+
+    print()
+    if len(digests) == 1:
+        print("✅ Output identical for every worker count")
+    else:
+        print("❌ Output differs between worker counts!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# generate_moneypuck.py - Synthetic MoneyPuck game-by-game career files
+# Usage: python benchmarks/generate_moneypuck.py --players 1500 --seasons 5 --output /tmp/gbg
+#
+# Writes one {playerId}.csv per player, shaped like data_gbg/: the same
+# 157-column MoneyPuck header, 5 rows per game (other, all, 5on5, 4on5, 5on4)
+# and per-game stats that are consistent the way the real ones are ("all" is
+# the sum of the four situations, I_F_points = goals + assists). Careers are
+# `seasons` consecutive seasons of 50 to 82 games, so the files (and every
+# benchmark run on them) only depend on players, seasons and seed.
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+
+ID_COLUMNS = ["playerId", "season", "name", "gameId", "playerTeam", "opposingTeam",
+              "home_or_away", "gameDate", "position", "situation"]
+
+STAT_COLUMNS = (
+    "icetime shifts gameScore onIce_xGoalsPercentage offIce_xGoalsPercentage "
+    "onIce_corsiPercentage offIce_corsiPercentage onIce_fenwickPercentage "
+    "offIce_fenwickPercentage iceTimeRank I_F_xOnGoal I_F_xGoals I_F_xRebounds "
+    "I_F_xFreeze I_F_xPlayStopped I_F_xPlayContinuedInZone "
+    "I_F_xPlayContinuedOutsideZone I_F_flurryAdjustedxGoals "
+    "I_F_scoreVenueAdjustedxGoals I_F_flurryScoreVenueAdjustedxGoals "
+    "I_F_primaryAssists I_F_secondaryAssists I_F_shotsOnGoal I_F_missedShots "
+    "I_F_blockedShotAttempts I_F_shotAttempts I_F_points I_F_goals I_F_rebounds "
+    "I_F_reboundGoals I_F_freeze I_F_playStopped I_F_playContinuedInZone "
+    "I_F_playContinuedOutsideZone I_F_savedShotsOnGoal "
+    "I_F_savedUnblockedShotAttempts penalties I_F_penalityMinutes I_F_faceOffsWon "
+    "I_F_hits I_F_takeaways I_F_giveaways I_F_lowDangerShots "
+    "I_F_mediumDangerShots I_F_highDangerShots I_F_lowDangerxGoals "
+    "I_F_mediumDangerxGoals I_F_highDangerxGoals I_F_lowDangerGoals "
+    "I_F_mediumDangerGoals I_F_highDangerGoals I_F_scoreAdjustedShotsAttempts "
+    "I_F_unblockedShotAttempts I_F_scoreAdjustedUnblockedShotAttempts "
+    "I_F_dZoneGiveaways I_F_xGoalsFromxReboundsOfShots "
+    "I_F_xGoalsFromActualReboundsOfShots I_F_reboundxGoals "
+    "I_F_xGoals_with_earned_rebounds "
+    "I_F_xGoals_with_earned_rebounds_scoreAdjusted "
+    "I_F_xGoals_with_earned_rebounds_scoreFlurryAdjusted I_F_shifts "
+    "I_F_oZoneShiftStarts I_F_dZoneShiftStarts I_F_neutralZoneShiftStarts "
+    "I_F_flyShiftStarts I_F_oZoneShiftEnds I_F_dZoneShiftEnds "
+    "I_F_neutralZoneShiftEnds I_F_flyShiftEnds faceoffsWon faceoffsLost "
+    "timeOnBench penalityMinutes penalityMinutesDrawn penaltiesDrawn "
+    "shotsBlockedByPlayer OnIce_F_xOnGoal OnIce_F_xGoals "
+    "OnIce_F_flurryAdjustedxGoals OnIce_F_scoreVenueAdjustedxGoals "
+    "OnIce_F_flurryScoreVenueAdjustedxGoals OnIce_F_shotsOnGoal "
+    "OnIce_F_missedShots OnIce_F_blockedShotAttempts OnIce_F_shotAttempts "
+    "OnIce_F_goals OnIce_F_rebounds OnIce_F_reboundGoals OnIce_F_lowDangerShots "
+    "OnIce_F_mediumDangerShots OnIce_F_highDangerShots OnIce_F_lowDangerxGoals "
+    "OnIce_F_mediumDangerxGoals OnIce_F_highDangerxGoals OnIce_F_lowDangerGoals "
+    "OnIce_F_mediumDangerGoals OnIce_F_highDangerGoals "
+    "OnIce_F_scoreAdjustedShotsAttempts OnIce_F_unblockedShotAttempts "
+    "OnIce_F_scoreAdjustedUnblockedShotAttempts "
+    "OnIce_F_xGoalsFromxReboundsOfShots OnIce_F_xGoalsFromActualReboundsOfShots "
+    "OnIce_F_reboundxGoals OnIce_F_xGoals_with_earned_rebounds "
+    "OnIce_F_xGoals_with_earned_rebounds_scoreAdjusted "
+    "OnIce_F_xGoals_with_earned_rebounds_scoreFlurryAdjusted OnIce_A_xOnGoal "
+    "OnIce_A_xGoals OnIce_A_flurryAdjustedxGoals OnIce_A_scoreVenueAdjustedxGoals "
+    "OnIce_A_flurryScoreVenueAdjustedxGoals OnIce_A_shotsOnGoal "
+    "OnIce_A_missedShots OnIce_A_blockedShotAttempts OnIce_A_shotAttempts "
+    "OnIce_A_goals OnIce_A_rebounds OnIce_A_reboundGoals OnIce_A_lowDangerShots "
+    "OnIce_A_mediumDangerShots OnIce_A_highDangerShots OnIce_A_lowDangerxGoals "
+    "OnIce_A_mediumDangerxGoals OnIce_A_highDangerxGoals OnIce_A_lowDangerGoals "
+    "OnIce_A_mediumDangerGoals OnIce_A_highDangerGoals "
+    "OnIce_A_scoreAdjustedShotsAttempts OnIce_A_unblockedShotAttempts "
+    "OnIce_A_scoreAdjustedUnblockedShotAttempts "
+    "OnIce_A_xGoalsFromxReboundsOfShots OnIce_A_xGoalsFromActualReboundsOfShots "
+    "OnIce_A_reboundxGoals OnIce_A_xGoals_with_earned_rebounds "
+    "OnIce_A_xGoals_with_earned_rebounds_scoreAdjusted "
+    "OnIce_A_xGoals_with_earned_rebounds_scoreFlurryAdjusted OffIce_F_xGoals "
+    "OffIce_A_xGoals OffIce_F_shotAttempts OffIce_A_shotAttempts "
+    "xGoalsForAfterShifts xGoalsAgainstAfterShifts corsiForAfterShifts "
+    "corsiAgainstAfterShifts fenwickForAfterShifts fenwickAgainstAfterShifts"
+).split()
+
+HEADER = ",".join(ID_COLUMNS + STAT_COLUMNS)
+
+# Row order of a game in the real files, and each situation's share of a game
+SITUATIONS = ["other", "all", "5on5", "4on5", "5on4"]
+SHARES = {"other": 0.07, "5on5": 0.75, "4on5": 0.06, "5on4": 0.12}
+
+# Not additive over situations: drawn on their own for every row
+RATIO_COLUMNS = {c for c in STAT_COLUMNS if "Percentage" in c} | {"iceTimeRank", "gameScore"}
+
+TEAMS = ("ANA ARI BOS BUF CAR CBJ CGY CHI COL DAL DET EDM FLA LAK MIN MTL NJD NSH "
+         "NYI NYR OTT PHI PIT SEA SJS STL TBL TOR VAN VGK WPG WSH").split()
+FIRST_NAMES = ("Alex Ben Cole Dylan Evan Felix Gabe Hugo Ivan Jake Kyle Liam Mason "
+               "Nick Owen Paul Quinn Ryan Sam Tyler Victor Will Xavier Yann Zach").split()
+SYLLABLES = ("la mar son ber gau tier dro vic ken nel ro bin cha pel fon tan dal "
+             "mer kov ski").split()
+
+# Games drawn up front: every game of every career is one of them
+POOL_SIZE = 2048
+
+
+def _is_expected(column):
+    # xGoals, xOnGoal, xRebounds... (floats in the real files)
+    return "xGoals" in column or column.startswith(("I_F_x", "OnIce_F_x", "OnIce_A_x"))
+
+
+def _rate(column):
+    """Mean of an additive stat over a full game (all situations)."""
+    if column == "icetime":
+        return 1100.0
+    if column == "timeOnBench":
+        return 2400.0
+    if column in ("shifts", "I_F_shifts"):
+        return 22.0
+    if "ShiftStarts" in column or "ShiftEnds" in column:
+        return 5.0
+    if column == "OnIce_F_goals":
+        return 0.45  # plus the player's own points, added in draw_games()
+    scale = 5.0 if column.startswith("OnIce") else 12.0 if column.startswith("OffIce") else 1.0
+    if _is_expected(column):
+        return 0.25 * scale
+    if "Goals" in column or column.endswith("goals") or "Assists" in column:
+        return 0.3 * scale
+    return 2.5 * scale
+
+
+def draw_games(rng, n_games=POOL_SIZE):
+    """
+    `n_games` games as {situation: (n_games, len(STAT_COLUMNS)) float array},
+    "all" being the sum of the four others for additive stats.
+    """
+    index = {c: i for i, c in enumerate(STAT_COLUMNS)}
+    games = {}
+    for situation, share in SHARES.items():
+        values = np.empty((n_games, len(STAT_COLUMNS)))
+        for i, column in enumerate(STAT_COLUMNS):
+            mean = _rate(column) * share
+            if _is_expected(column):
+                values[:, i] = rng.gamma(2.0, mean / 2.0, n_games)
+            else:
+                values[:, i] = rng.poisson(mean, n_games)
+        points = values[:, [index["I_F_goals"], index["I_F_primaryAssists"],
+                            index["I_F_secondaryAssists"]]].sum(axis=1)
+        values[:, index["I_F_points"]] = points
+        values[:, index["OnIce_F_goals"]] += points  # on the ice for their own points
+        games[situation] = values
+    games["all"] = sum(games[s] for s in SHARES)
+
+    for situation, values in games.items():
+        for column in RATIO_COLUMNS:
+            i = index[column]
+            if column == "iceTimeRank":
+                values[:, i] = rng.integers(1, 19, n_games)
+            elif column == "gameScore":
+                values[:, i] = rng.normal(0.4, 0.6, n_games)
+            else:
+                values[:, i] = rng.random(n_games)
+    return games
+
+
+def format_games(games):
+    """The comma-joined stat columns of every pooled game, per situation."""
+    return {situation: [",".join(str(v) for v in row) for row in np.round(values, 3).tolist()]
+            for situation, values in games.items()}
+
+
+def player_name(i):
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    rest = i // len(FIRST_NAMES)
+    last = SYLLABLES[rest % len(SYLLABLES)] + SYLLABLES[rest // len(SYLLABLES) % len(SYLLABLES)]
+    return f"{first} {last.capitalize()}" + (f" {rest // len(SYLLABLES) ** 2 + 1}"
+                                              if rest >= len(SYLLABLES) ** 2 else "")
+
+
+def career_lines(rng, player_id, name, seasons, first_season, tails):
+    """Lines (header excluded) of one career: `seasons` seasons from `first_season`."""
+    position = rng.choice(["C", "L", "R", "D"])
+    lines = []
+    for season in range(first_season, first_season + seasons):
+        n_games = int(rng.integers(50, 83))
+        team = rng.choice(TEAMS)
+        opponents = rng.choice([t for t in TEAMS if t != team], n_games)
+        homes = rng.choice(["HOME", "AWAY"], n_games)
+        game_ids = season * 1_000_000 + 20_000 + np.sort(rng.choice(np.arange(1, 1313), n_games, replace=False))
+        days = np.datetime64(f"{season}-10-05") + np.cumsum(rng.integers(1, 4, n_games))
+        dates = [d.replace("-", "") for d in days.astype(str)]
+        pool = rng.integers(0, POOL_SIZE, n_games)
+        for g in range(n_games):
+            prefix = f"{player_id},{season},{name},{game_ids[g]},{team},{opponents[g]},{homes[g]},{dates[g]},{position},"
+            for situation in SITUATIONS:
+                lines.append(f"{prefix}{situation},{tails[situation][pool[g]]}\n")
+    return lines
+
+
+def generate(folder, players=300, seasons=5, seed=0, first_season=2008, last_season=2025):
+    """
+    Write `players` synthetic career files in `folder` (emptied first).
+    Returns the sorted list of paths.
+    """
+    rng = np.random.default_rng(seed)
+    tails = format_games(draw_games(rng))
+
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    paths = []
+    for i in range(players):
+        player_id = 8_400_000 + i
+        start = int(rng.integers(first_season, max(first_season, last_season - seasons + 1) + 1))
+        path = os.path.join(folder, f"{player_id}.csv")
+        with open(path, "w") as f:
+            f.write(HEADER + "\n")
+            f.writelines(career_lines(rng, player_id, player_name(i), seasons, start, tails))
+        paths.append(path)
+    return paths
+
+
+def ensure(folder, players, seasons, seed=0):
+    """
+    The files of generate(folder, players, seasons, seed), generated only when
+    `folder` does not already hold them (params.json). Returns the sorted paths.
+    """
+    params = {"players": players, "seasons": seasons, "seed": seed}
+    marker = os.path.join(folder, "params.json")
+    if os.path.exists(marker):
+        with open(marker) as f:
+            if json.load(f) == params:
+                return [os.path.join(folder, f"{8_400_000 + i}.csv") for i in range(players)]
+    paths = generate(folder, players, seasons, seed)
+    with open(marker, "w") as f:
+        json.dump(params, f)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic MoneyPuck game-by-game career files")
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--seasons", type=int, default=5, help="Seasons per career (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="Folder to (re)create")
+    args = parser.parse_args()
+
+    paths = generate(args.output, args.players, args.seasons, args.seed)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"✅ {len(paths)} files, {size / 1e6:.0f} MB in {args.output}/")
+
+
+if __name__ == "__main__":
+    main()
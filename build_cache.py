@@ -0,0 +1,136 @@
+# build_cache.py - Manifest and per-player cache for incremental rebuilds
+#
+# The manifest records (size, mtime, sha1) for every data_gbg/ file and where
+# its transformed frame is cached. A rebuild only re-transforms files whose
+# fingerprint changed; the rest are loaded back from the cache. Careers read
+# from the career archive are not files: their (size, sha1) come from the
+# archive's index and are passed in as `fingerprints`.
+import hashlib
+import json
+import os
+import pickle
+
+CACHE_DIR = ".build_cache"
+MANIFEST_FILE = os.path.join(CACHE_DIR, "manifest.json")
+
+# Bump when process_file() changes what it produces, to invalidate old caches
+CACHE_VERSION = 2
+
+
+def _stat(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _result_path(file):
+    return os.path.join(CACHE_DIR, os.path.basename(file) + ".pkl")
+
+
+def new_manifest(signature=""):
+    return {"version": CACHE_VERSION, "signature": signature, "files": {}, "output": None}
+
+
+def load_manifest(signature=""):
+    """
+    Return the saved manifest, or an empty one if missing or outdated.
+    `signature` describes the build settings the cached results depend on;
+    a different one invalidates the cache.
+    """
+    try:
+        with open(MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return new_manifest(signature)
+    if manifest.get("version") != CACHE_VERSION or manifest.get("signature") != signature:
+        return new_manifest(signature)
+    return manifest
+
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, MANIFEST_FILE)
+
+
+def split_changed(files, manifest, fingerprints=None):
+    """
+    Split `files` into (unchanged, changed) against the manifest.
+    Size and mtime are checked first; the content hash is only computed when
+    they differ, so a touched-but-identical file still counts as unchanged.
+    With `fingerprints` ({file: fingerprint}) those are compared instead.
+    """
+    unchanged, changed = [], []
+    for file in files:
+        entry = manifest["files"].get(file)
+        if entry is None or not os.path.exists(_result_path(file)):
+            changed.append(file)
+            continue
+        if fingerprints is not None:
+            (unchanged if entry == fingerprints[file] else changed).append(file)
+            continue
+        stat = _stat(file)
+        if entry["size"] == stat["size"] and entry["mtime_ns"] == stat["mtime_ns"]:
+            unchanged.append(file)
+        elif entry["size"] == stat["size"] and entry["sha1"] == _sha1(file):
+            entry.update(stat)
+            unchanged.append(file)
+        else:
+            changed.append(file)
+    return unchanged, changed
+
+
+def forget_missing(files, manifest):
+    """Drop manifest entries (and cached results) for files that no longer exist."""
+    removed = sorted(set(manifest["files"]) - set(files))
+    for file in removed:
+        del manifest["files"][file]
+        try:
+            os.remove(_result_path(file))
+        except OSError:
+            pass
+    return removed
+
+
+def load_result(file):
+    """Return the cached (df, message, error) for `file`."""
+    with open(_result_path(file), "rb") as f:
+        return pickle.load(f)
+
+
+def store_result(file, result, manifest, fingerprint=None):
+    """Cache the (df, message, error) of `file` and record its fingerprint."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(_result_path(file), "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    manifest["files"][file] = fingerprint or {**_stat(file), "sha1": _sha1(file)}
+
+
+def output_is_current(output_file, manifest):
+    """True if `output_file` is the one written by the last cached build."""
+    return (
+        manifest["output"] is not None
+        and os.path.exists(output_file)
+        and manifest["output"] == {"path": output_file, **_stat(output_file)}
+    )
+
+
+def is_up_to_date(files, manifest, output_file, fingerprints=None):
+    """True if no file was added, changed or removed since `output_file` was written."""
+    if set(files) != set(manifest["files"]):
+        return False
+    _, changed = split_changed(files, manifest, fingerprints)
+    return not changed and output_is_current(output_file, manifest)
+
+
+def record_output(output_file, manifest):
+    manifest["output"] = {"path": output_file, **_stat(output_file)}
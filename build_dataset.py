@@ -1,35 +1,57 @@
-import pandas as pd
+import argparse
 import glob
 import os
 
+from cli import lazy_import
+from moneypuck_loader import read_season_summary
+
+pd = lazy_import("pandas")
+
 # Dossier contenant tes CSV
 DATA_FOLDER = "data/*.csv"
 
-dfs = []
+OUTPUT_FILE = "all_seasons_clean.csv"
+
+
+def build_seasons(pattern=DATA_FOLDER):
+    """Every season summary of `pattern`, one row per player-season ("other" situation)."""
+    dfs = []
+
+    for file in sorted(glob.glob(pattern)):
+        print("Chargement :", os.path.basename(file))
+        # Seulement les colonnes utilisées, avec des types compacts
+        df = read_season_summary(file)
+
+        # Garder seulement la situation "other" (ou 5v5 si tu préfères)
+        df = df[df["situation"] == "other"]
+
+        # Calcul du plus/minus
+        df["plusMinus"] = df["OnIce_F_goals"] - df["OnIce_A_goals"]
+
+        # Colonnes essentielles
+        keep = [
+            "playerId", "season", "name", "team",
+            "I_F_points", "I_F_goals", "plusMinus"
+        ]
+
+        df = df[keep]
+        dfs.append(df)
 
-for file in glob.glob(DATA_FOLDER):
-    print("Chargement :", os.path.basename(file))
-    df = pd.read_csv(file)
+    # Fusionner toutes les saisons
+    return pd.concat(dfs, ignore_index=True)
 
-    # Garder seulement la situation "other" (ou 5v5 si tu préfères)
-    df = df[df["situation"] == "other"]
 
-    # Calcul du plus/minus
-    df["plusMinus"] = df["OnIce_F_goals"] - df["OnIce_A_goals"]
+def main():
+    parser = argparse.ArgumentParser(description=f"Build {OUTPUT_FILE} from the season summaries of data/")
+    parser.parse_args()
 
-    # Colonnes essentielles
-    keep = [
-        "playerId", "season", "name", "team",
-        "I_F_points", "I_F_goals", "plusMinus"
-    ]
+    all_seasons = build_seasons()
 
-    df = df[keep]
-    dfs.append(df)
+    # Sauvegarder
+    all_seasons.to_csv(OUTPUT_FILE, index=False)
 
-# Fusionner toutes les saisons
-all_seasons = pd.concat(dfs, ignore_index=True)
+    print(f"✅ Fichier créé : {OUTPUT_FILE}")
 
-# Sauvegarder
-all_seasons.to_csv("all_seasons_clean.csv", index=False)
 
-print("✅ Fichier créé : all_seasons_clean.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,133 +1,779 @@
-import pandas as pd
+import os
+
+# Read when pyarrow loads (pandas loads it): its default allocator (mimalloc)
+# keeps much of what it frees, the system one hands it back to the OS with
+# run_report.release_memory(), which the streaming build relies on
+os.environ.setdefault("ARROW_DEFAULT_MEMORY_POOL", "system")
+
 import glob
+import argparse
+import importlib
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import array_store
+import build_cache
+import career_archive
+import pace_matrix
+import parquet_store
+import query_store
+import run_report
+import sorted_runs
+from analytics import add_analytics
+from cli import lazy_import
+from cumulative import METRICS, SITUATIONS, add_cumulative, situation_metrics
+from moneypuck_loader import read_archive_games, read_game_by_game
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 # Folder containing all player game-by-game CSVs
 DATA_FOLDER = "data_gbg/*.csv"
+# ... or the compressed archive of the same careers, read instead when present
+ARCHIVE_DIR = career_archive.ARCHIVE_DIR
+OUTPUT_FILE = "players_game_by_game.csv"
+
+# Per-game stats summed per match; plusMinus is derived from the on-ice goals
+STATS = [source for source, _ in METRICS]
+
+# Columns of the per-game frame
+KEEP = ["playerId", "name", "season", "gameId", "gameDate"] + STATS
+
+# The same stats per situation (I_F_points_5on5...), summed from the rows
+# read for the main ones, in the same pass. Only their running totals are kept,
+# and only in the array store: the CSV, Parquet and SQLite copies keep their columns
+SITUATION_METRICS = situation_metrics()
+SITUATION_STATS = [source for source, _ in SITUATION_METRICS]
+SITUATION_COLUMNS = [target for _, target in SITUATION_METRICS]
+
+# What the per-player frames (and so the cache) depend on
+SIGNATURE = ",".join(STATS) + ";" + ",".join(SITUATIONS)
+
+# Careers read from the archive and transformed together
+ARCHIVE_BATCH = 256
+
+REQUIRED_COLUMNS = ["playerId", "name", "season", "gameId", "gameDate", "situation"]
+
+# Row order of the CSV (and the SQLite copy), of the Parquet copy (one season
+# partition after the other) and of the array store
+CSV_ORDER = ["name", "season", "gameDate"]
+PARQUET_ORDER = ["season", "name", "gameDate"]
+ARRAY_ORDER = ["playerId", "season", "gameNumber"]
+
+# Streaming build (--streaming): sorted runs are written here, then merged
+RUNS_DIR = os.path.join(build_cache.CACHE_DIR, "runs")
+# Default peak RSS cap of the streaming build, in MB
+MAX_MEMORY_MB = 512
+# Least memory the cap must leave for the data once the modules are loaded,
+# and the share of it the batches are sized for (the rest absorbs the
+# fragmentation of the heap from one batch to the next)
+MIN_BUDGET_MB = 64
+BUDGET_SHARE = 0.85
+# Sizing against that budget: a batch of player frames takes about
+# RUN_OVERHEAD times its size while combined, sorted and saved; the footer of
+# an archive segment FOOTER_OVERHEAD times its size once parsed; an archived
+# row about ARCHIVE_ROW_BYTES while read and aggregated; a row being merged
+# about MERGE_ROW_BYTES (see benchmarks/bench_streaming.py)
+RUN_OVERHEAD = 9
+FOOTER_OVERHEAD = 9
+ARCHIVE_ROW_BYTES = 650
+MERGE_ROW_BYTES = 2500
+# Libraries of the streaming build: they load lazily (cli.lazy_import), so
+# memory_budget() loads them before measuring what the process already uses
+STREAMING_LIBRARIES = ["numpy", "pandas", "pyarrow", "pyarrow.csv", "pyarrow.dataset",
+                       "pyarrow.ipc", "pyarrow.parquet"]
+
+
+def filter_games(df):
+    """Rows of ONE situation per player ("all", else "other") with plusMinus, KEEP columns only."""
+    # --- Keep only ONE situation to avoid duplicates ---
+    is_all = df["situation"] == "all"
+    has_all = df["playerId"].isin(df.loc[is_all, "playerId"].unique())
+    df = df[is_all | (~has_all & (df["situation"] == "other"))]
+
+    # --- Compute per-game plus/minus ---
+    if "OnIce_F_goals" in df.columns and "OnIce_A_goals" in df.columns:
+        df["plusMinus"] = df["OnIce_F_goals"] - df["OnIce_A_goals"]
+    else:
+        df["plusMinus"] = 0
+
+    # --- Keep only useful columns ---
+    return df[KEEP]
 
-print("🔍 Scanning for CSV files...")
-files = glob.glob(DATA_FOLDER)
-print(f"✅ Found {len(files)} CSV files in data_gbg/\n")
 
-if len(files) == 0:
-    print("❌ No CSV files found!")
-    exit(1)
+def aggregate_games(df):
+    """One row per game (stats summed), in season / date order."""
+    # --- Group by match to avoid duplicates ---
+    df = df.groupby(
+        ["playerId", "name", "season", "gameId", "gameDate"],
+        as_index=False,
+        observed=True
+    ).agg({stat: "sum" for stat in STATS})
 
-dfs = []
-errors = []
+    # --- Sort games correctly ---
+    return df.sort_values(["season", "gameDate"])
 
-for i, file in enumerate(files, 1):
+
+def _game_keys(df):
+    return (df["playerId"].to_numpy("int64") << 32) + df["gameId"].to_numpy("int64")
+
+
+def add_situations(games, df):
+    """
+    `games` (aggregate_games() of `df`) with the stats of every game summed
+    per situation of SITUATIONS: one <stat>_<situation> column each (0 when
+    the situation has no row). One bincount per stat over all the rows of
+    `df`, instead of one filter and groupby per situation.
+    """
+    codes, keys = pd.factorize(_game_keys(df))
+    rows = pd.Index(keys).get_indexer(_game_keys(games))
+    position = pd.Index(SITUATIONS).get_indexer(df["situation"])
+    kept = position >= 0
+    bins = codes[kept] * len(SITUATIONS) + position[kept]
+
+    sums = {}
+    for stat in STATS:
+        if stat != "plusMinus":
+            values = df[stat].to_numpy("float64")
+        elif "OnIce_F_goals" in df.columns and "OnIce_A_goals" in df.columns:
+            values = df["OnIce_F_goals"].to_numpy("float64") - df["OnIce_A_goals"].to_numpy("float64")
+        else:
+            values = np.zeros(len(df))
+        # NaN counts as 0, as in the groupby sum of aggregate_games()
+        totals = np.bincount(bins, weights=np.nan_to_num(values[kept]), minlength=len(keys) * len(SITUATIONS))
+        sums[stat] = totals.reshape(-1, len(SITUATIONS))[rows]
+
+    columns = {}
+    for j, situation in enumerate(SITUATIONS):
+        for stat in STATS:
+            columns[f"{stat}_{situation}"] = sums[stat][:, j].astype(games[stat].dtype)
+    return pd.concat([games, pd.DataFrame(columns, index=games.index)], axis=1)
+
+
+def add_totals(all_games):
+    """add_cumulative() of the main and per-situation stats; only the running totals of the situations stay."""
+    return add_cumulative(all_games, METRICS + SITUATION_METRICS).drop(columns=SITUATION_STATS)
+
+
+def without_situations(all_games):
+    """`all_games` without the per-situation columns, for every copy but the array store."""
+    return all_games.drop(columns=SITUATION_COLUMNS, errors="ignore")
+
+
+def process_file(file):
+    """
+    Transform one player career file into its game-by-game frame, one row per
+    game in season order (running totals are added once, on the combined frame).
+    Returns (df, message, error): df is None when the file was skipped.
+    """
     try:
-        print(f"[{i}/{len(files)}] Processing: {file}...", end=" ")
-        
-        df = pd.read_csv(file)
-        
+        # Only the ~10 columns used below (plus any extra METRICS source), with
+        # compact dtypes and gameDate already converted from YYYYMMDD
+        df = read_game_by_game(file, extra_columns=[s for s in STATS if s != "plusMinus"])
+
         # Check if file has data
         if len(df) == 0:
-            print("⚠️  Empty file, skipping")
-            continue
-        
+            return None, "⚠️  Empty file, skipping", None
+
         # Check required columns
-        required_cols = ['playerId', 'name', 'season', 'gameId', 'gameDate', 'situation']
-        missing = [col for col in required_cols if col not in df.columns]
+        missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         if missing:
-            print(f"⚠️  Missing columns: {missing}, skipping")
-            errors.append((file, f"Missing columns: {missing}"))
-            continue
+            return None, f"⚠️  Missing columns: {missing}, skipping", f"Missing columns: {missing}"
 
-        # --- Fix date format (YYYYMMDD) ---
-        df["gameDate"] = pd.to_datetime(
-            df["gameDate"].astype(str),
-            format="%Y%m%d",
-            errors="coerce"
-        )
+        # Check if required stats columns exist (plusMinus is derived below)
+        missing = [col for col in STATS if col != "plusMinus" and col not in df.columns]
+        if missing:
+            return None, "⚠️  Missing stats columns, skipping", f"Missing {' or '.join(missing)}"
 
-        # --- Keep only ONE situation to avoid duplicates ---
-        if "all" in df["situation"].unique():
-            df = df[df["situation"] == "all"]
-        else:
-            df = df[df["situation"] == "other"]
+        df = add_situations(aggregate_games(filter_games(df)), df)
 
-        # --- Compute per-game plus/minus ---
-        if "OnIce_F_goals" in df.columns and "OnIce_A_goals" in df.columns:
-            df["plusMinus"] = df["OnIce_F_goals"] - df["OnIce_A_goals"]
-        else:
-            df["plusMinus"] = 0
-
-        # --- Keep only useful columns ---
-        keep = [
-            "playerId", "name", "season", "gameId", "gameDate",
-            "I_F_points", "I_F_goals", "plusMinus"
-        ]
-        
-        # Check if required stats columns exist
-        if "I_F_points" not in df.columns or "I_F_goals" not in df.columns:
-            print(f"⚠️  Missing stats columns, skipping")
-            errors.append((file, "Missing I_F_points or I_F_goals"))
-            continue
-        
-        df = df[keep]
-
-        # --- Group by match to avoid duplicates ---
-        df = df.groupby(
-            ["playerId", "name", "season", "gameId", "gameDate"],
-            as_index=False
-        ).agg({
-            "I_F_points": "sum",
-            "I_F_goals": "sum",
-            "plusMinus": "sum"
-        })
-
-        # --- Sort games correctly ---
-        df = df.sort_values(["season", "gameDate"])
-
-        # --- Add game number (1, 2, 3...) per season ---
-        df["gameNumber"] = df.groupby(["playerId", "season"]).cumcount() + 1
-
-        # --- Add cumulative stats ---
-        df["cum_points"] = df.groupby(["playerId", "season"])["I_F_points"].cumsum()
-        df["cum_goals"] = df.groupby(["playerId", "season"])["I_F_goals"].cumsum()
-        df["cum_plusMinus"] = df.groupby(["playerId", "season"])["plusMinus"].cumsum()
-
-        dfs.append(df)
         player_name = df['name'].iloc[0]
-        print(f"✅ {player_name} ({len(df)} games)")
+        return df, f"✅ {player_name} ({len(df)} games)", None
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        errors.append((file, str(e)))
-
-print(f"\n{'='*60}")
-print(f"📊 Processing Summary:")
-print(f"{'='*60}")
-print(f"✅ Successfully processed: {len(dfs)} players")
-print(f"❌ Errors: {len(errors)}")
-
-if errors:
-    print(f"\n⚠️  Files with errors:")
-    for file, error in errors:
-        print(f"   - {file}: {error}")
-
-if len(dfs) == 0:
-    print("\n❌ No data to combine! Check the errors above.")
-    exit(1)
-
-# --- Combine all players ---
-print(f"\n🔄 Combining all players...")
-all_games = pd.concat(dfs, ignore_index=True)
-
-# --- Final sort ---
-all_games = all_games.sort_values(["name", "season", "gameDate"])
-
-print(f"✅ Combined {len(all_games)} total games")
-print(f"✅ {all_games['name'].nunique()} unique players:")
-for player in sorted(all_games['name'].unique()):
-    player_games = len(all_games[all_games['name'] == player])
-    print(f"   - {player}: {player_games} games")
-
-# --- Save final dataset ---
-all_games.to_csv("players_game_by_game.csv", index=False)
-
-print(f"\n{'='*60}")
-print(f"✅ players_game_by_game.csv created successfully!")
-print(f"📂 {len(all_games)} rows, {all_games['name'].nunique()} players")
-print(f"{'='*60}")
+        return None, f"❌ Error: {e}", str(e)
+
+
+def measured_process_file(file):
+    """process_file() plus its (wall, cpu) seconds, measured where it runs."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = process_file(file)
+    return result + ((time.perf_counter() - wall, time.process_time() - cpu),)
+
+
+def process_files(files, workers=1, max_pending=None):
+    """
+    Yield (file, df, message, error, (wall, cpu)) for every file, in the order
+    of `files`. With workers > 1 the transforms run in a process pool; results
+    are still yielded in input order so the combined output does not depend on
+    scheduling. With `max_pending`, at most that many files are submitted
+    ahead of the one being yielded, so results cannot pile up in memory.
+    """
+    if workers <= 1:
+        for file in files:
+            yield (file,) + measured_process_file(file)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if max_pending is None:
+            chunksize = max(1, len(files) // (workers * 8))
+            for file, result in zip(files, pool.map(measured_process_file, files, chunksize=chunksize)):
+                yield (file,) + result
+            return
+        pending = deque()
+        for file in files:
+            pending.append((file, pool.submit(measured_process_file, file)))
+            if len(pending) >= max_pending:
+                file, future = pending.popleft()
+                yield (file,) + future.result()
+        for file, future in pending:
+            yield (file,) + future.result()
+
+
+def archive_batches(archive, player_ids, batch_size=ARCHIVE_BATCH, batch_rows=None):
+    """Split `player_ids` into batches of `batch_size` players, and of about `batch_rows` archived rows when given."""
+    batch, rows = [], 0
+    for player_id in player_ids:
+        n = archive.entry(player_id)["rows"]
+        if batch and (len(batch) == batch_size or (batch_rows and rows + n > batch_rows)):
+            yield batch
+            batch, rows = [], 0
+        batch.append(player_id)
+        rows += n
+    if batch:
+        yield batch
+
+
+def _archive_games(archive, batch, extra_columns):
+    """
+    Read, filter and aggregate the careers of `batch` as one frame; only that
+    frame outlives the call. Returns (games, message, error), games None when skipped.
+    """
+    df = read_archive_games(archive, batch, extra_columns=extra_columns)
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        return None, f"⚠️  Missing columns: {missing}, skipping", f"Missing columns: {missing}"
+    missing = [col for col in extra_columns if col not in df.columns]
+    if missing:
+        return None, "⚠️  Missing stats columns, skipping", f"Missing {' or '.join(missing)}"
+    return add_situations(aggregate_games(filter_games(df)), df), "⚠️  Empty file, skipping", None
+
+
+def process_archive(archive, player_ids, batch_size=ARCHIVE_BATCH, batch_rows=None):
+    """
+    process_files() for careers of a career_archive.CareerArchive: each batch
+    of players is read in one pass (only the columns used) and filtered /
+    aggregated as one frame, then split per player. Yields the same tuples,
+    keyed by archive.key(playerId), in the order of `player_ids`; the (wall,
+    cpu) seconds are the player's share of its batch.
+    With `batch_rows`, batches also stop at about that many archived rows and
+    the memory of each is handed back to the OS before the next.
+    """
+    extra_columns = [s for s in STATS if s != "plusMinus"]
+    for batch in archive_batches(archive, player_ids, batch_size, batch_rows):
+        wall, cpu = time.perf_counter(), time.process_time()
+        results = {}
+        try:
+            games, message, error = _archive_games(archive, batch, extra_columns)
+            if games is not None:
+                for player_id, player_games in games.groupby("playerId", sort=False):
+                    # Only this player's names, as when read from its own file
+                    player_games["name"] = player_games["name"].cat.remove_unused_categories()
+                    results[player_id] = (player_games, f"✅ {player_games['name'].iloc[0]} "
+                                                        f"({len(player_games)} games)", None)
+                games = None
+        except Exception as e:
+            message, error = f"❌ Error: {e}", str(e)
+        if batch_rows:
+            run_report.release_memory()
+
+        share = 1 / len(batch)
+        seconds = ((time.perf_counter() - wall) * share, (time.process_time() - cpu) * share)
+        for player_id in batch:
+            yield (archive.key(player_id),) + results.pop(player_id, (None, message, error)) + (seconds,)
+
+
+def iter_results(files, workers=1, manifest=None, report=None, verbose=False, archive=None,
+                 batch_rows=None):
+    """
+    Yield (file, df, message, error) for every file, in the order of `files`:
+    df is its game-by-game frame, None when the file was skipped.
+    With a build_cache manifest, only new or changed files are transformed and
+    the others are loaded from the cache, each when its turn comes.
+    With a career `archive`, `files` are its keys (archive.key(playerId)) and
+    are read from it in bulk (`workers` does not apply).
+    With `batch_rows` (bounded memory), the archive is read that many rows at
+    most at a time, and a worker pool only runs a few files ahead.
+    Stages and files are recorded in `report` (a run_report.RunReport); one
+    line per file is printed when `verbose`, a progress bar otherwise.
+    """
+    report = report or run_report.RunReport("build")
+    todo = files
+    cached = set()
+    player_ids = fingerprints = None
+    if archive is not None:
+        player_ids = {archive.key(player_id): player_id for player_id in archive.players()}
+        fingerprints = archive.fingerprints()
+
+    if manifest is not None:
+        with report.stage("load_cache") as stage:
+            build_cache.forget_missing(files, manifest)
+            unchanged, todo = build_cache.split_changed(files, manifest, fingerprints)
+            cached = set(unchanged)
+            stage.add(files=len(cached))
+        report.count("build.cached", len(cached))
+        if cached:
+            print(f"♻️  {len(cached)} unchanged files loaded from cache")
+
+    with report.stage("transform") as stage, \
+            run_report.Progress(len(todo), "🔄 Processing", enabled=False if verbose else None) as progress:
+        if archive is None:
+            processed = process_files(todo, workers, max_pending=workers * 4 if batch_rows else None)
+        else:
+            processed = process_archive(archive, [player_ids[key] for key in todo], batch_rows=batch_rows)
+        i = cached_rows = 0
+        for file in files:
+            if file in cached:
+                df, message, error = build_cache.load_result(file)
+                cached_rows += 0 if df is None else len(df)
+                yield file, df, message, error
+                continue
+
+            _, df, message, error, (wall, cpu) = next(processed)
+            i += 1
+            if verbose:
+                print(f"[{i}/{len(todo)}] Processing: {file}... {message}")
+            progress.update(note=os.path.basename(file))
+            if manifest is not None:
+                build_cache.store_result(file, (df, message, error), manifest,
+                                         fingerprints and fingerprints[file])
+
+            size = os.path.getsize(file) if archive is None else archive.size(player_ids[file])
+            rows = 0 if df is None else len(df)
+            status = "error" if error else "skipped" if df is None else "ok"
+            report.file("transform", file, wall, cpu, rows=rows, bytes=size, status=status)
+            report.count(f"build.{status}")
+            stage.add(rows=rows, bytes=size)
+            yield file, df, message, error
+        stage.add(files=len(todo), cached_rows=cached_rows, workers=workers if archive is None else 1)
+        if workers > 1 and todo and archive is None:
+            stage.add(workers_peak_rss_mb=run_report.children_peak_rss_mb())
+
+
+def build(files, workers=1, manifest=None, report=None, verbose=False, archive=None):
+    """
+    Transform and combine all player files (see iter_results()). Returns
+    (all_games, n_players, errors); with a build_cache manifest the combined
+    result is the same as without.
+    """
+    report = report or run_report.RunReport("build")
+    dfs = []
+    errors = []
+
+    # Combined in the order of `files`, whatever came from the cache
+    for file, df, message, error in iter_results(files, workers, manifest, report, verbose, archive):
+        if error:
+            errors.append((file, error))
+        if df is not None:
+            dfs.append(df)
+
+    if len(dfs) == 0:
+        return None, 0, errors
+    return combine(dfs, report), len(dfs), errors
+
+
+def combine(dfs, report=None):
+    """The combined, sorted frame of the per-player frames `dfs` (in the order of their files)."""
+    report = report or run_report.RunReport("build")
+    with report.stage("combine") as stage:
+        # --- Combine all players ---
+        all_games = pd.concat(dfs, ignore_index=True)
+
+        # --- Game number (1, 2, 3...) and cumulative stats per season, all at once ---
+        # Each player's frame is in season/game order, so every (playerId, season)
+        # is a contiguous block here, before the sort by name below
+        all_games = add_totals(all_games)
+
+        # --- Final sort ---
+        all_games = all_games.sort_values(CSV_ORDER)
+        stage.add(rows=len(all_games))
+    return all_games
+
+
+def _write(report, stage_name, path, rows, fn):
+    with report.stage(stage_name) as stage:
+        fn()
+        stage.add(rows=rows, bytes=run_report.path_size(path))
+
+
+def write_outputs(all_games, manifest, parquet_by_player=False, report=None, changed=None):
+    """
+    Write the CSV and its Parquet, SQLite, array store and matrix copies from
+    the combined frame of build(), and record the CSV in the build_cache `manifest`.
+    `changed`, (playerIds, seasons) of the only rows that differ from the
+    existing outputs, limits the Parquet copy to those seasons' partitions
+    and the SQLite copy to those players' rows.
+    """
+    report = report or run_report.RunReport("build")
+    rows = len(all_games)
+
+    # --- Save final dataset ---
+    table = without_situations(all_games)
+    _write(report, "write_csv", OUTPUT_FILE, rows, lambda: table.to_csv(OUTPUT_FILE, index=False))
+    build_cache.record_output(OUTPUT_FILE, manifest)
+    build_cache.save_manifest(manifest)
+
+    # --- Columnar copy for fast, pruned loads ---
+    if changed is not None and os.path.isdir(parquet_store.PARQUET_DIR):
+        _write(report, "write_parquet", parquet_store.PARQUET_DIR, int(table["season"].isin(changed[1]).sum()),
+               lambda: parquet_store.update_seasons(table, changed[1], by_player=parquet_by_player))
+    else:
+        _write(report, "write_parquet", parquet_store.PARQUET_DIR, rows,
+               lambda: parquet_store.write_parquet(table, by_player=parquet_by_player))
+
+    # --- Indexed SQLite copy for single-player / leaderboard queries ---
+    if changed is not None and os.path.exists(query_store.DB_FILE):
+        _write(report, "write_sqlite", query_store.DB_FILE, int(table["playerId"].isin(changed[0]).sum()),
+               lambda: query_store.update_players(table, changed[0]))
+    else:
+        _write(report, "write_sqlite", query_store.DB_FILE, rows, lambda: query_store.write_sqlite(table))
+
+    # --- Memory-mapped column arrays for zero-copy per-player reads ---
+    # Rolling pace / streaks / per-82 and the per-situation totals go in the
+    # array store only (the CSV keeps its columns); computed in combine order
+    # (the index), where every (playerId, season) is contiguous as for the
+    # cumulative columns
+    _write(report, "write_arrays", array_store.ARRAY_DIR, rows,
+           lambda: array_store.write_arrays(add_analytics(all_games.sort_index())))
+    write_matrix(rows, report)
+
+
+def write_matrix(rows, report):
+    """Player-season x gameNumber matrices, from the array store just written."""
+    _write(report, "write_matrix", pace_matrix.MATRIX_DIR, rows,
+           lambda: pace_matrix.write_matrix(array_store.ArrayStore()))
+
+
+# --- Streaming build: sorted runs on disk, then k-way merges ---
+
+def _name_order_key(names, season_first=False):
+    """
+    sorted_runs.merge() key of the CSV order (name, season, gameDate) as one
+    int64: rank of the name among `names` (missing last), season, YYYYMMDD;
+    with `season_first`, of the Parquet order (season, name, gameDate).
+    """
+    index = pd.Index(sorted(names))
+
+    def key(df):
+        rank = index.get_indexer(df["name"]).astype("int64")
+        rank[rank < 0] = len(index)
+        season = df["season"].to_numpy("int64")
+        dates = df["gameDate"]
+        day = (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).fillna(99_999_999)
+        head = season * (len(index) + 1) + rank if season_first else rank * 10_000 + season
+        return head * 100_000_000 + day.to_numpy("int64")
+    return key
+
+
+def _array_order_key(df):
+    """sorted_runs.merge() key of the array store order (playerId, season, gameNumber)."""
+    return ((df["playerId"].to_numpy("int64") * 10_000 + df["season"].to_numpy("int64")) * 10_000
+            + df["gameNumber"].to_numpy("int64"))
+
+
+def _write_batch(frames, run_dir, n):
+    """
+    Combine one batch of player frames as build() does and save it as run `n`
+    three times: in the CSV's order, in the Parquet copy's, and with the
+    analytics and per-situation columns in the array store's. Returns (rows, names).
+    """
+    games = add_totals(pd.concat(frames, ignore_index=True).astype({"name": str}))
+    by_name = without_situations(games).sort_values(CSV_ORDER)
+    sorted_runs.write_run(by_name, os.path.join(run_dir, f"csv-{n:05d}.arrow"))
+    # From the CSV order, as write_parquet() sorts the combined frame
+    sorted_runs.write_run(by_name.sort_values(PARQUET_ORDER, kind="stable"),
+                          os.path.join(run_dir, f"parquet-{n:05d}.arrow"))
+    by_name = None
+    sorted_runs.write_run(add_analytics(games).sort_values(ARRAY_ORDER, kind="stable"),
+                          os.path.join(run_dir, f"arrays-{n:05d}.arrow"))
+    return len(games), set(games["name"].dropna())
+
+
+def memory_budget(max_memory, archive=None):
+    """
+    Bytes left for the data under a `max_memory` MB cap: what the process
+    already uses and, reading a career `archive`, the parsed footer of a
+    segment are taken out.
+    """
+    for name in STREAMING_LIBRARIES:
+        importlib.import_module(name)
+    used = run_report.rss_mb() or 0
+    if archive is not None:
+        used += archive.footer_bytes() * FOOTER_OVERHEAD / 1e6
+    budget = max_memory - used
+    if budget < MIN_BUDGET_MB:
+        raise ValueError(f"--max-memory {max_memory} MB leaves less than {MIN_BUDGET_MB} MB "
+                         f"for the data (the build already needs {used:.0f} MB)")
+    return budget * BUDGET_SHARE * 1e6
+
+
+def check_max_memory(parser, max_memory):
+    """parser.error() when a --max-memory cap leaves no room for the data of a streaming build."""
+    if max_memory <= 0:
+        parser.error(f"argument --max-memory: must be a positive number of MB, not {max_memory}")
+    try:
+        memory_budget(max_memory, careers()[1])
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def write_runs(files, budget, workers=1, manifest=None, report=None, verbose=False, archive=None):
+    """
+    build() in bounded memory, first half: the player frames are combined in
+    batches of about `budget` / RUN_OVERHEAD bytes and every batch is saved
+    as sorted runs in RUNS_DIR (see _write_batch()).
+    Returns (n_runs, names, rows, n_players, errors).
+    """
+    report = report or run_report.RunReport("build")
+    shutil.rmtree(RUNS_DIR, ignore_errors=True)
+    os.makedirs(RUNS_DIR)
+    errors = []
+    names = set()
+    frames, size = [], 0
+    n_runs = rows = n_players = 0
+
+    def flush():
+        with report.stage("write_runs") as stage:
+            batch_rows, batch_names = _write_batch(frames, RUNS_DIR, n_runs)
+            stage.add(rows=batch_rows, players=len(frames))
+        names.update(batch_names)
+        return batch_rows
+
+    # The archive is read next to the frames waiting for their run
+    read_budget = budget - budget / RUN_OVERHEAD
+    results = iter_results(files, workers, manifest, report, verbose, archive,
+                           batch_rows=int(read_budget / ARCHIVE_ROW_BYTES))
+    for file, df, message, error in results:
+        if error:
+            errors.append((file, error))
+        if df is None:
+            continue
+        # A batch ends between two players, never inside a (playerId, season) block
+        if size >= budget / RUN_OVERHEAD and df["playerId"].iloc[0] != frames[-1]["playerId"].iloc[-1]:
+            rows += flush()
+            n_runs += 1
+            frames, size = [], 0
+            run_report.release_memory()
+        frames.append(df)
+        size += df.memory_usage(deep=True).sum()
+        n_players += 1
+    if frames:
+        rows += flush()
+        n_runs += 1
+    return n_runs, names, rows, n_players, errors
+
+
+def merge_runs(n_runs, names, budget, parquet_by_player=False, report=None):
+    """
+    build() in bounded memory, second half: k-way merge the runs of
+    write_runs() chunk by chunk into the CSV and SQLite copies (in name
+    order), the Parquet copy (in season order, one partition open at a time)
+    and the array store (in playerId order). Gives the same files as writing
+    the combined frame.
+    """
+    report = report or run_report.RunReport("build")
+    merge_rows = max(sorted_runs.BATCH_ROWS, int(budget / MERGE_ROW_BYTES))
+
+    def runs(kind):
+        return [os.path.join(RUNS_DIR, f"{kind}-{n:05d}.arrow") for n in range(n_runs)]
+
+    run_report.release_memory()
+    with report.stage("merge_csv") as stage:
+        tmp = OUTPUT_FILE + ".tmp"
+        sqlite = query_store.SqliteWriter()
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            for i, chunk in enumerate(sorted_runs.merge(runs("csv"), _name_order_key(names), merge_rows)):
+                chunk.to_csv(f, index=False, header=i == 0)
+                sqlite.append(chunk)
+                stage.add(rows=len(chunk))
+        sqlite.close()
+        os.replace(tmp, OUTPUT_FILE)
+        stage.add(bytes=run_report.path_size(OUTPUT_FILE), runs=n_runs)
+
+    run_report.release_memory()
+    with report.stage("merge_parquet") as stage:
+        def chunks():
+            for chunk in sorted_runs.merge(runs("parquet"), _name_order_key(names, season_first=True),
+                                           merge_rows):
+                stage.add(rows=len(chunk))
+                yield chunk
+        parquet_store.write_parquet_chunks(chunks(), by_player=parquet_by_player, names=sorted(names))
+        stage.add(bytes=run_report.path_size(parquet_store.PARQUET_DIR), runs=n_runs)
+
+    run_report.release_memory()
+    with report.stage("merge_arrays") as stage:
+        writer = array_store.ArrayWriter()
+        for chunk in sorted_runs.merge(runs("arrays"), _array_order_key, merge_rows):
+            writer.append(chunk)
+            stage.add(rows=len(chunk))
+        writer.close()
+        stage.add(bytes=run_report.path_size(array_store.ARRAY_DIR), runs=n_runs)
+    run_report.release_memory()
+
+
+def is_up_to_date(files, manifest, fingerprints=None):
+    """True if no career changed since the outputs were written, and they all exist."""
+    return (build_cache.is_up_to_date(files, manifest, OUTPUT_FILE, fingerprints)
+            and os.path.isdir(parquet_store.PARQUET_DIR)
+            and os.path.exists(query_store.DB_FILE)
+            and os.path.isdir(array_store.ARRAY_DIR)
+            and os.path.isdir(pace_matrix.MATRIX_DIR))
+
+
+def input_files():
+    """The files the build reads: the career archive's, or the data_gbg/ CSVs."""
+    if career_archive.exists(ARCHIVE_DIR):
+        return career_archive.CareerArchive(ARCHIVE_DIR).files()
+    return glob.glob(DATA_FOLDER)
+
+
+def careers():
+    """
+    (careers, archive, fingerprints): the archive keys of its careers, by
+    playerId, or the sorted data_gbg/ CSVs (archive and fingerprints None).
+    Sorted so the combine order is the same from one run (and one machine)
+    to the next, archived careers in the order of the {playerId}.csv names.
+    """
+    if career_archive.exists(ARCHIVE_DIR):
+        archive = career_archive.CareerArchive(ARCHIVE_DIR)
+        return [archive.key(player_id) for player_id in archive.players()], archive, archive.fingerprints()
+    return sorted(glob.glob(DATA_FOLDER)), None, None
+
+
+def run(workers=1, full=False, parquet_by_player=False, report=None, verbose=False,
+        streaming=False, max_memory=MAX_MEMORY_MB):
+    """
+    The whole build: data_gbg.archive/ (or data_gbg/) → players_game_by_game.csv
+    and the Parquet, SQLite, array store and matrix copies. Returns the
+    combined frame, or None when nothing changed since the last build.
+    With `streaming`, nothing is combined in memory (write_runs() then
+    merge_runs(), within about `max_memory` MB) and None is returned too.
+    """
+    report = report or run_report.RunReport("build")
+
+    print("🔍 Scanning for careers...")
+    with report.stage("scan") as stage:
+        files, archive, fingerprints = careers()
+        source = "data_gbg/" if archive is None else f"{ARCHIVE_DIR}/"
+        stage.add(files=len(files), source=source)
+    print(f"✅ Found {len(files)} careers in {source}\n")
+
+    if len(files) == 0:
+        print("❌ No careers found!")
+        exit(1)
+
+    # The cached frames depend on which stats are summed, in which situations
+    manifest = (build_cache.new_manifest(SIGNATURE) if full
+                else build_cache.load_manifest(SIGNATURE))
+    if not full and is_up_to_date(files, manifest, fingerprints):
+        print(f"✅ Nothing changed since the last build, {OUTPUT_FILE} is up to date")
+        report.count("build.up_to_date")
+        return None
+
+    if workers > 1 and archive is None:
+        print(f"⚙️  Using {workers} worker processes\n")
+
+    if streaming:
+        budget = memory_budget(max_memory, archive)
+        print(f"💾 Streaming build, peak RSS capped at {max_memory} MB\n")
+        all_games = None
+        n_runs, names, n_rows, n_players, errors = write_runs(files, budget, workers, manifest,
+                                                              report, verbose, archive)
+    else:
+        all_games, n_players, errors = build(files, workers, manifest, report, verbose, archive)
+        n_rows = 0 if all_games is None else len(all_games)
+        names = set() if all_games is None else set(all_games["name"].dropna())
+    build_cache.save_manifest(manifest)
+
+    print(f"\n{'='*60}")
+    print(f"📊 Processing Summary:")
+    print(f"{'='*60}")
+    print(f"✅ Successfully processed: {n_players} players")
+    print(f"❌ Errors: {len(errors)}")
+
+    if errors:
+        print(f"\n⚠️  Files with errors:")
+        for file, error in errors:
+            print(f"   - {file}: {error}")
+
+    if not n_rows:
+        shutil.rmtree(RUNS_DIR, ignore_errors=True)
+        print("\n❌ No data to combine! Check the errors above.")
+        exit(1)
+
+    print(f"\n🔄 Combining all players...")
+    print(f"✅ Combined {n_rows} total games")
+    print(f"✅ {len(names)} unique players")
+    if verbose and all_games is not None:
+        for player, player_games in all_games['name'].value_counts().sort_index().items():
+            print(f"   - {player}: {player_games} games")
+
+    if streaming:
+        # --- Every copy but the matrices, merged from the sorted runs ---
+        print(f"🔀 Merging the sorted runs ({n_runs} batches)...")
+        try:
+            merge_runs(n_runs, names, budget, parquet_by_player, report)
+        finally:
+            shutil.rmtree(RUNS_DIR, ignore_errors=True)
+        build_cache.record_output(OUTPUT_FILE, manifest)
+        build_cache.save_manifest(manifest)
+        write_matrix(n_rows, report)
+    else:
+        write_outputs(all_games, manifest, parquet_by_player, report)
+
+    print(f"\n{'='*60}")
+    print(f"✅ {OUTPUT_FILE} created successfully!")
+    print(f"✅ {parquet_store.PARQUET_DIR}/ created successfully!")
+    print(f"✅ {query_store.DB_FILE} created successfully!")
+    print(f"✅ {array_store.ARRAY_DIR}/ created successfully!")
+    print(f"✅ {pace_matrix.MATRIX_DIR}/ created successfully!")
+    print(f"📂 {n_rows} rows, {len(names)} players")
+    if streaming:
+        peak = report.summary()["peak_rss_mb"]
+        if peak is not None:
+            print(f"{'⚠️ ' if peak > max_memory else '💾'} Peak RSS {peak:.0f} MB (cap: {max_memory} MB)")
+    print(f"{'='*60}")
+    return all_games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build players_game_by_game.csv from data_gbg.archive/ or data_gbg/")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes for the per-file transform of data_gbg/ CSVs (default: 1)")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the incremental cache and re-transform every file")
+    parser.add_argument("--parquet-by-player", action="store_true",
+                        help="Partition the Parquet output by playerId as well as season "
+                             "(one small file per player-season)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Bounded-memory build: sorted runs on disk, then a k-way merge "
+                             "(same output, for leagues that do not fit in memory)")
+    parser.add_argument("--max-memory", type=int, default=MAX_MEMORY_MB, metavar="MB",
+                        help=f"Peak RSS cap of --streaming, in MB (default: {MAX_MEMORY_MB})")
+    run_report.add_arguments(parser)
+    args = parser.parse_args()
+    if args.streaming:
+        check_max_memory(parser, args.max_memory)
+    report = run_report.from_args("build", args)
+
+    try:
+        run(args.workers, args.full, args.parquet_by_player, report, args.verbose,
+            args.streaming, args.max_memory)
+    finally:
+        print(f"📝 Run report: {report.write()}")
+
+
+if __name__ == "__main__":
+    main()
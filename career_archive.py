@@ -0,0 +1,408 @@
+# career_archive.py - zstd Parquet archive of the raw game-by-game careers
+#
+# data_gbg/ holds one plain CSV per player: ~157 columns repeated in every
+# header, 5 situation rows per game. The archive keeps the same rows, all
+# columns, in a few zstd-compressed Parquet segments with one row group per
+# player, plus an index.json:
+#
+#     data_gbg.archive/
+#       index.json              playerId → segment, row group, rows, and the
+#                               size / sha1 / mtime of the CSV it came from
+#       part-00000.parquet
+#       part-00001.parquet
+#
+# add() replaces a player's career: the new rows go to the segment being
+# written and the old row group is no longer referenced. close() publishes
+# the new segment in the index and compacts the archive (rewrites the live
+# row groups) once dead rows outweigh half the live ones. read() loads the
+# live row groups of many players at once, only the requested columns.
+#
+#     python career_archive.py                # import / refresh from data_gbg/
+#     python career_archive.py --compact      # rewrite without dead rows
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+
+from cli import lazy_import
+
+pa = lazy_import("pyarrow")
+pacsv = lazy_import("pyarrow.csv")
+pq = lazy_import("pyarrow.parquet")
+
+ARCHIVE_DIR = "data_gbg.archive"
+INDEX_FILE = "index.json"
+
+# Bump when the stored layout changes; older archives must be re-imported
+ARCHIVE_VERSION = 1
+
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 3
+
+# Careers written to one segment before starting the next
+SEGMENT_PLAYERS = 512
+
+# Compact when dead rows exceed this share of the live ones
+COMPACT_RATIO = 0.5
+
+# Identifier and text columns; every other column is a stat, kept as float64
+# so the values are exactly the ones of the CSV (Arrow type names: pyarrow
+# only loads when a career is read)
+COLUMN_TYPES = {
+    "playerId": "int32",
+    "season": "int16",
+    "name": "string",
+    "gameId": "int32",
+    "playerTeam": "string",
+    "opposingTeam": "string",
+    "home_or_away": "string",
+    "gameDate": "int32",
+    "position": "string",
+    "situation": "string",
+}
+
+
+def exists(path=ARCHIVE_DIR):
+    return os.path.exists(os.path.join(path, INDEX_FILE))
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def csv_player_id(path):
+    """The playerId of a career CSV, from its first row (files named after the player)."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        row = next(reader, None)
+    if row is None or "playerId" not in header:
+        return None
+    return int(row[header.index("playerId")])
+
+
+def read_career_csv(path):
+    """One career CSV as an Arrow table with the archive's column types."""
+    table = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(column_types=COLUMN_TYPES))
+    fields = []
+    for field in table.schema:
+        if field.name in COLUMN_TYPES or pa.types.is_string(field.type):
+            fields.append(field)
+        else:
+            fields.append(pa.field(field.name, pa.float64()))
+    return table.cast(pa.schema(fields))
+
+
+def _conform(table, schema):
+    """`table` with the columns of `schema` (missing ones as nulls), or None if it has others."""
+    if not set(table.column_names) <= set(schema.names):
+        return None
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(len(table), field.type))
+            continue
+        column = table[field.name]
+        if column.type != field.type:
+            try:
+                column = column.cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                return None
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class CareerArchive:
+    """
+    Segments + index of the archive at `path`. Thread-safe add(); call close()
+    (or use it as a context manager) to publish what was added.
+    """
+
+    def __init__(self, path=ARCHIVE_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writer = None
+        self._segment = None
+        self._row_groups = 0
+        self._pending = {}
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.path, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+        if index is None or index.get("version") != ARCHIVE_VERSION:
+            index = {"version": ARCHIVE_VERSION, "next": 0, "players": {}, "segments": {}}
+        return index
+
+    def _save_index(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, sort_keys=True)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+
+    # --- Lookups ---
+
+    def players(self):
+        """Archived playerIds, in increasing order."""
+        return sorted(int(player_id) for player_id in self.index["players"])
+
+    def entry(self, player_id):
+        """The latest career stored for `player_id` (even if not published yet), or None."""
+        key = str(player_id)
+        return self._pending.get(key) or self.index["players"].get(key)
+
+    def key(self, player_id):
+        """Name of a career in caches and reports: "data_gbg.archive#8478402"."""
+        return f"{self.path}#{player_id}"
+
+    def size(self, player_id):
+        """Size in bytes of the CSV the career came from, or None if not archived."""
+        entry = self.entry(player_id)
+        return None if entry is None else entry["size"]
+
+    def fingerprints(self):
+        """{key: {"size", "sha1"}} of every career, to detect changed players."""
+        return {self.key(player_id): {"size": entry["size"], "sha1": entry["sha1"]}
+                for player_id, entry in self.index["players"].items()}
+
+    def files(self):
+        """The index and segment files: what a reader of the archive depends on."""
+        return [os.path.join(self.path, name) for name in [INDEX_FILE] + sorted(self.index["segments"])]
+
+    def disk_bytes(self):
+        return sum(os.path.getsize(path) for path in self.files() if os.path.exists(path))
+
+    def footer_bytes(self):
+        """
+        Largest Parquet footer (metadata of every row group and column) among
+        the segments. read() parses it whole, at roughly 9x its size in memory.
+        """
+        sizes = [0]
+        for name in self.index["segments"]:
+            # A Parquet file ends with the footer length (4 bytes) and "PAR1"
+            with open(os.path.join(self.path, name), "rb") as f:
+                f.seek(-8, os.SEEK_END)
+                sizes.append(int.from_bytes(f.read(4), "little"))
+        return max(sizes)
+
+    def dead_rows(self):
+        live = sum(entry["rows"] for entry in self.index["players"].values())
+        return sum(segment["rows"] for segment in self.index["segments"].values()) - live
+
+    # --- Writing ---
+
+    def add(self, player_id, csv_path, mtime=None):
+        """Store (or replace) the career of `player_id` from its CSV. Returns its rows."""
+        table = read_career_csv(csv_path)
+        entry = {"rows": len(table), "size": os.path.getsize(csv_path), "sha1": _sha1(csv_path),
+                 "mtime": time.time() if mtime is None else mtime}
+        with self._lock:
+            conformed = None if self._writer is None else _conform(table, self._writer.schema)
+            if conformed is None or self._row_groups >= SEGMENT_PLAYERS:
+                self._close_segment()
+                self._open_segment(table.schema)
+                conformed = table
+            self._writer.write_table(conformed, row_group_size=max(1, len(conformed)))
+            self._pending[str(player_id)] = {**entry, "segment": self._segment, "row_group": self._row_groups}
+            self._row_groups += 1
+        return len(table)
+
+    def remove(self, player_id):
+        with self._lock:
+            self._pending.pop(str(player_id), None)
+            self.index["players"].pop(str(player_id), None)
+
+    def _open_segment(self, schema):
+        os.makedirs(self.path, exist_ok=True)
+        self._segment = f"part-{self.index['next']:05d}.parquet"
+        self.index["next"] += 1
+        self._writer = pq.ParquetWriter(os.path.join(self.path, self._segment), schema,
+                                        compression=COMPRESSION, compression_level=COMPRESSION_LEVEL)
+        self._row_groups = 0
+
+    def _close_segment(self):
+        """Finish the segment being written and publish its careers in the index."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        self.index["segments"][self._segment] = {"rows": pq.ParquetFile(
+            os.path.join(self.path, self._segment)).metadata.num_rows}
+        self.index["players"].update(self._pending)
+        self._pending = {}
+        self._drop_unused_segments()
+        self._save_index()
+
+    def _drop_unused_segments(self):
+        used = {entry["segment"] for entry in self.index["players"].values()}
+        for name in list(self.index["segments"]):
+            if name not in used:
+                del self.index["segments"][name]
+
+    def _remove_orphans(self):
+        # Segments no longer in the index (replaced, compacted, or an interrupted write)
+        keep = set(self.index["segments"]) | {INDEX_FILE}
+        for name in os.listdir(self.path):
+            if name not in keep and (name.endswith(".parquet") or name.endswith(".tmp")):
+                os.remove(os.path.join(self.path, name))
+
+    def close(self, compact=None):
+        """
+        Publish the careers added since the last close. Compacts when dead rows
+        exceed COMPACT_RATIO of the live ones (or always / never with compact=True / False).
+        """
+        with self._lock:
+            self._close_segment()
+            live = sum(entry["rows"] for entry in self.index["players"].values())
+            if compact is None:
+                compact = self.dead_rows() > COMPACT_RATIO * live
+            if compact and self.dead_rows():
+                self._compact()
+            if os.path.isdir(self.path):
+                self._drop_unused_segments()
+                self._save_index()
+                self._remove_orphans()
+
+    def _compact(self):
+        """Copy every live row group into new segments, in playerId order."""
+        old = dict(self.index["players"])
+        moved = {}
+        files = {}
+        for player_id in sorted(old, key=int):
+            entry = old[player_id]
+            if entry["segment"] not in files:
+                files[entry["segment"]] = pq.ParquetFile(os.path.join(self.path, entry["segment"]))
+            table = files[entry["segment"]].read_row_group(entry["row_group"])
+            conformed = None if self._writer is None else _conform(table, self._writer.schema)
+            if conformed is None or self._row_groups >= SEGMENT_PLAYERS:
+                self._finish_compacted(moved)
+                self._open_segment(table.schema)
+                conformed = table
+            self._writer.write_table(conformed, row_group_size=max(1, len(conformed)))
+            moved[player_id] = {**entry, "segment": self._segment, "row_group": self._row_groups}
+            self._row_groups += 1
+        self._finish_compacted(moved)
+
+    def _finish_compacted(self, moved):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        self.index["segments"][self._segment] = {
+            "rows": sum(e["rows"] for e in moved.values() if e["segment"] == self._segment)}
+        self.index["players"].update(moved)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Reading ---
+
+    def _read_segment(self, segment, row_groups, columns):
+        """{(segment, row_group): table} for `row_groups` of `segment`. Its footer is freed on return."""
+        parquet = pq.ParquetFile(os.path.join(self.path, segment))
+        names = parquet.schema_arrow.names
+        wanted = None if columns is None else [c for c in columns if c in names]
+        table = parquet.read_row_groups(row_groups, columns=wanted)
+        pieces, offset = {}, 0
+        for row_group in row_groups:
+            rows = parquet.metadata.row_group(row_group).num_rows
+            pieces[segment, row_group] = table.slice(offset, rows)
+            offset += rows
+        return pieces
+
+    def read(self, players=None, columns=None):
+        """
+        The rows of `players` (default: all, by playerId), in that order, as one
+        Arrow table with only `columns` (those a segment lacks are left out,
+        as read_csv(usecols=callable) would).
+        """
+        players = self.players() if players is None else list(players)
+        by_segment = {}
+        published = self.index["players"]
+        for player_id in players:
+            entry = published.get(str(player_id))
+            if entry is not None:
+                by_segment.setdefault(entry["segment"], []).append(entry["row_group"])
+
+        # One read per segment (its row groups in file order), then sliced per player
+        pieces = {}
+        for segment, row_groups in by_segment.items():
+            pieces.update(self._read_segment(segment, sorted(set(row_groups)), columns))
+
+        tables = [pieces[entry["segment"], entry["row_group"]]
+                  for entry in (published.get(str(p)) for p in players) if entry is not None]
+        if not tables:
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="permissive")
+
+
+def import_folder(folder="data_gbg", archive=None, verbose=True, paths=None):
+    """
+    Add every career CSV of `folder` (or only `paths`) whose content differs
+    from the archived one (all of them into a new archive). Files are keyed by
+    the playerId they contain, so a copy named after the player
+    ("Nick_Suzuki.csv") is the same career as its {playerId}.csv.
+    Returns (added, unchanged).
+    """
+    own = archive is None
+    archive = archive or CareerArchive()
+    added = unchanged = 0
+    try:
+        for path in sorted(glob.glob(os.path.join(folder, "*.csv")) if paths is None else paths):
+            player_id = os.path.basename(path)[:-4]
+            if not player_id.isdigit():
+                player_id = csv_player_id(path)
+                if player_id is None:
+                    continue
+            entry = archive.entry(player_id)
+            if entry is not None and entry["size"] == os.path.getsize(path) and entry["sha1"] == _sha1(path):
+                unchanged += 1
+                continue
+            if archive.add(player_id, path, mtime=os.path.getmtime(path)) == 0:
+                # Header only: nothing worth keeping
+                archive.remove(player_id)
+                continue
+            added += 1
+            if verbose:
+                print(f"📦 {path}")
+    finally:
+        if own:
+            archive.close()
+    return added, unchanged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack data_gbg/ careers into a compressed Parquet archive")
+    parser.add_argument("--folder", default="data_gbg", help="Career CSVs to import (default: data_gbg)")
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help=f"Archive folder (default: {ARCHIVE_DIR})")
+    parser.add_argument("--compact", action="store_true", help="Rewrite the archive without dead rows")
+    parser.add_argument("--verbose", action="store_true", help="One line per imported file")
+    args = parser.parse_args()
+
+    archive = CareerArchive(args.archive)
+    csv_bytes = sum(os.path.getsize(p) for p in glob.glob(os.path.join(args.folder, "*.csv")))
+    added, unchanged = import_folder(args.folder, archive, verbose=args.verbose)
+    archive.close(compact=True if args.compact else None)
+
+    print(f"✅ {added} careers added or replaced, {unchanged} unchanged")
+    print(f"📦 {args.archive}/: {len(archive.players())} players, {len(archive.index['segments'])} segments, "
+          f"{archive.disk_bytes() / 1e6:.1f} MB ({csv_bytes / 1e6:.1f} MB of CSV in {args.folder}/)")
+
+
+if __name__ == "__main__":
+    main()
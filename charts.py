@@ -0,0 +1,139 @@
+# charts.py - Plotly figures for script.py
+#
+# Built with graph_objects straight from the per-season slices of an
+# ArrayStore (season_series): one trace per season, no groupby and none of
+# plotly.express's per-trace overhead (~5 ms a trace, i.e. 100 ms for a
+# long career).
+#
+# Long careers are capped at MAX_POINTS per figure: each trace is
+# downsampled with LTTB (largest triangle three buckets), which keeps the
+# shape of the cumulative curves, and drops its markers. Figures with more
+# than WEBGL_THRESHOLD points of data use WebGL traces (scattergl).
+from plotly.colors import qualitative
+
+from cli import lazy_import
+
+# graph_objects (with numpy, pandas) only loads for the first figure
+np = lazy_import("numpy")
+go = lazy_import("plotly.graph_objects")
+
+# Same palette and look as px.line(..., color="season", markers=True)
+COLORS = qualitative.Plotly
+
+# Points sent per figure, split between its traces (never below MIN_POINTS_PER_TRACE)
+MAX_POINTS = 600
+MIN_POINTS_PER_TRACE = 20
+
+WEBGL_THRESHOLD = 1000
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of the `n_out` points of (x, y) kept by Largest-Triangle-Three-
+    Buckets: the first and last points, and in each bucket between them the
+    point forming the largest triangle with the previous pick and the mean of
+    the next bucket. Every index when there are already `n_out` or fewer.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    # Buckets hold a few points each: plain floats beat per-bucket numpy calls
+    x = np.asarray(x, dtype="float64").tolist()
+    y = np.asarray(y, dtype="float64").tolist()
+
+    # n_out - 2 buckets over the inner points, never empty since n_out <= n
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int).tolist()
+    keep = [0]
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            stop = edges[i + 2]
+            next_x = sum(x[hi:stop]) / (stop - hi)
+            next_y = sum(y[hi:stop]) / (stop - hi)
+        else:
+            next_x, next_y = x[-1], y[-1]
+        xa, ya = x[a], y[a]
+        best, a = -1.0, lo
+        for j in range(lo, hi):
+            area = abs((xa - next_x) * (y[j] - ya) - (xa - x[j]) * (next_y - ya))
+            if area > best:
+                best, a = area, j
+        keep.append(a)
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+def _traces(series):
+    """
+    One trace per (name, x, y, options) of `series`, downsampled to the
+    figure's point budget, as scattergl when the data is large.
+    """
+    series = list(series)
+    total = sum(len(x) for _, x, _, _ in series)
+    per_trace = max(MIN_POINTS_PER_TRACE, MAX_POINTS // max(len(series), 1))
+    scatter = go.Scattergl if total > WEBGL_THRESHOLD else go.Scatter
+
+    traces = []
+    for name, x, y, options in series:
+        keep = lttb(x, y, per_trace)
+        downsampled = len(keep) < len(x)
+        if downsampled:
+            x, y = np.asarray(x)[keep], np.asarray(y)[keep]
+        mode = options.pop("mode", "lines+markers")
+        traces.append(scatter(
+            x=x,
+            y=y,
+            mode="lines" if downsampled else mode,
+            name=name,
+            **options,
+        ))
+    return traces
+
+
+def cumulative_figure(index, player, stat, seasons):
+    """One line per season of `player`: `stat` against gameNumber."""
+    series = [
+        (str(season), x, y, dict(
+            legendgroup=str(season),
+            line=dict(color=COLORS[i % len(COLORS)]),
+            hovertemplate=f"season={season}<br>gameNumber=%{{x}}<br>{stat}=%{{y}}<extra></extra>",
+        ))
+        for i, (season, x, y) in enumerate(index.season_series(player, stat, seasons))
+    ]
+
+    return go.Figure(data=_traces(series), layout=dict(
+        title=f"{player} – {stat} (comparaison par saison)",
+        xaxis_title="gameNumber",
+        yaxis_title=stat,
+        legend_title_text="season",
+    ))
+
+
+def pace_figure(matrix, stat, rows, game_number, season):
+    """
+    `stat` after each game for the PaceMatrix `rows` (player-seasons), with
+    the league median of `season` and a marker at `game_number`.
+    """
+    median = matrix.quantiles(stat, (0.5,), season)[0]
+    series = [(f"médiane {season}", np.arange(1, len(median) + 1), median, dict(
+        mode="lines",
+        line=dict(color="gray", dash="dash"),
+        hovertemplate=f"gameNumber=%{{x}}<br>médiane={stat}=%{{y}}<extra></extra>",
+    ))]
+    for i, row in enumerate(rows):
+        label = f"{matrix.name[row]} ({matrix.season[row]})"
+        y = matrix.curve(stat, matrix.player_id[row], matrix.season[row])
+        series.append((label, np.arange(1, len(y) + 1), y, dict(
+            mode="lines",
+            line=dict(color=COLORS[i % len(COLORS)]),
+            hovertemplate=f"{label}<br>gameNumber=%{{x}}<br>{stat}=%{{y}}<extra></extra>",
+        )))
+
+    figure = go.Figure(data=_traces(series), layout=dict(
+        title=f"{stat} – rythme comparé ({season})",
+        xaxis_title="gameNumber",
+        yaxis_title=stat,
+    ))
+    figure.add_vline(x=game_number, line_dash="dot", line_color="black")
+    return figure
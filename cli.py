@@ -0,0 +1,69 @@
+# cli.py - Common entry point of the pipeline scripts, and their deferred imports
+#
+# pandas, numpy, pyarrow, requests and plotly cost most of a script's start-up
+# (0.3-0.6 s before any work). The modules of the pipeline bind them with
+# lazy_import() instead of `import`: the real import happens the first time
+# one of their attributes is used, so `--help`, a build with nothing to do
+# or the first widgets of script.py never pay for what they do not use.
+#
+#     python cli.py                      # list the commands
+#     python cli.py build --full         # same as python build_players_game_by_game.py --full
+#     python cli.py watch --seasons
+#
+# Only the module of the command is imported, then its main() runs with the
+# remaining arguments. Standard library only, so listing the commands is instant.
+import importlib
+import sys
+import types
+
+# command -> (module, description)
+COMMANDS = {
+    "download": ("download_all_moneypuck_players", "Download the MoneyPuck careers"),
+    "archive": ("career_archive", "Import / refresh data_gbg/ into the career archive"),
+    "build": ("build_players_game_by_game", "Build players_game_by_game.csv and its copies"),
+    "seasons": ("build_dataset", "Build all_seasons_clean.csv from data/"),
+    "dashboard": ("dashboard_export", "Export the HTML dashboard"),
+    "update": ("update_all", "Download, build and export everything"),
+    "watch": ("watch_updates", "Rebuild whenever careers change"),
+}
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for the module `name` until one of its attributes is needed, then imports it."""
+
+    def __getattr__(self, attr):
+        # Only called for attributes not copied yet; the import system makes
+        # concurrent first uses (pipeline threads) import the module once
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """`name` (e.g. "pandas", "pyarrow.parquet"), imported at its first use."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def usage():
+    lines = ["Usage: python cli.py COMMAND [ARGS...]", "", "Commands:"]
+    lines += [f"  {name:<10} {description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "python cli.py COMMAND --help for the options of a command"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    if argv[0] not in COMMANDS:
+        print(f"❌ Unknown command {argv[0]!r}\n\n{usage()}")
+        sys.exit(2)
+    module_name = COMMANDS[argv[0]][0]
+    # argparse of the command shows its own script name
+    sys.argv = [f"{module_name}.py"] + argv[1:]
+    importlib.import_module(module_name).main()
+
+
+if __name__ == "__main__":
+    main()
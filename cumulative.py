@@ -0,0 +1,63 @@
+# cumulative.py - Game numbers and running totals in one vectorized pass
+#
+# Instead of one groupby cumcount plus one groupby cumsum per stat, the rows
+# are treated as contiguous (playerId, season) segments found once: game
+# numbers come from the segment starts, and every metric gets its running
+# total from a single grouped cumsum over the segment labels, which restarts
+# at each segment (no global total to subtract, so fractional stats keep the
+# exact per-segment sums).
+from cli import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# (per-game column, cumulative column) - add a stat here to get its running total
+METRICS = [
+    ("I_F_points", "cum_points"),
+    ("I_F_goals", "cum_goals"),
+    ("plusMinus", "cum_plusMinus"),
+]
+
+# Game situations that also get their own running totals, next to the
+# main ones (situation "all"): one block of METRICS per situation
+SITUATIONS = ["5on5", "5on4", "4on5", "other"]
+
+SEGMENT_KEYS = ["playerId", "season"]
+
+
+def situation_metrics(metrics=METRICS, situations=SITUATIONS):
+    """(per-game column, cumulative column) of every metric in every situation: I_F_points_5on5..."""
+    return [(f"{source}_{situation}", f"{target}_{situation}")
+            for situation in situations for source, target in metrics]
+
+
+def segment_starts(df, keys=SEGMENT_KEYS):
+    """Boolean mask of the rows where a new (playerId, season) segment begins."""
+    starts = np.zeros(len(df), dtype=bool)
+    if len(df) == 0:
+        return starts
+    starts[0] = True
+    for key in keys:
+        values = df[key].to_numpy()
+        starts[1:] |= values[1:] != values[:-1]
+    return starts
+
+
+def add_cumulative(df, metrics=METRICS, keys=SEGMENT_KEYS):
+    """
+    Return `df` with gameNumber and the cumulative column of every metric.
+    Rows of each (playerId, season) must be contiguous and in game order,
+    which is how build_players_game_by_game.py combines the per-player frames.
+    """
+    starts = segment_starts(df, keys)
+    segment = np.cumsum(starts) - 1
+    first_row = np.flatnonzero(starts)
+
+    columns = {"gameNumber": np.arange(len(df)) - first_row[segment] + 1}
+    sources = [source for source, _ in metrics]
+    totals = df[sources].groupby(segment, sort=False).cumsum()
+    for source, target in metrics:
+        columns[target] = totals[source].to_numpy()
+
+    # Added in one go rather than column by column
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
@@ -0,0 +1,495 @@
+# dashboard_export.py - Sharded export of the game-by-game table for the HTML dashboard
+#
+# build_live_dashboard.R inlines the whole table into one page, so the page
+# grows with the league. This writes a page holding only a small index
+# (players, seasons, season totals) plus one gzip-compressed, columnar JSON
+# shard per player in players/<playerId>.json.gz: the page fetches the shard
+# of the player being viewed, and nothing else.
+#
+# Usage: python dashboard_export.py [--output dashboard_output]
+#        python -m http.server -d dashboard_output   (fetch() needs http://)
+import argparse
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+
+import array_store
+from cli import lazy_import
+import run_report
+from cumulative import segment_starts
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+OUTPUT_DIR = "dashboard_output"
+SHARD_DIR = "players"
+
+# Columns read from the array store, and the per-game columns of a shard
+COLUMNS = ["playerId", "name", "season", "gameNumber", "gameDate",
+           "I_F_points", "I_F_goals", "plusMinus", "cum_points"]
+GAME_COLUMNS = ["gameNumber", "gameDate", "I_F_points", "I_F_goals", "plusMinus", "cum_points"]
+
+# One row per season in the index: what the stats table shows
+SUMMARY_COLUMNS = ["season", "GP", "G", "A", "P", "plusMinus", "PPG"]
+
+# The "updated" date of the index inlined in a page
+UPDATED = re.compile(rb'"updated":"([^"]*)"')
+
+
+def _values(column):
+    """Column as a list for JSON: ints when every value is whole (goals, points...)."""
+    values = column.to_numpy()
+    if values.dtype.kind == "f" and np.isfinite(values).all() and (values == np.round(values)).all():
+        return values.astype("int64").tolist()
+    return values.tolist()
+
+
+def _gzip_json(data):
+    # mtime=0 so an unchanged shard is byte-identical from one export to the next
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return gzip.compress(text.encode("utf-8"), compresslevel=9, mtime=0)
+
+
+def _write_if_changed(path, payload):
+    """Write `payload` unless `path` already holds it; True when written."""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+    return True
+
+
+def _previous_page(path):
+    """The page already at `path` (bytes) and its "updated" date, or (None, None)."""
+    if not os.path.exists(path):
+        return None, None
+    with open(path, "rb") as f:
+        page = f.read()
+    match = UPDATED.search(page)
+    return page, match and match.group(1).decode("utf-8")
+
+
+def load_games(path=array_store.ARRAY_DIR):
+    """The columns the dashboard needs, sorted by player, season and game."""
+    # The array store is already in that order: no sort, no parse
+    return array_store.ArrayStore(path).to_frame(COLUMNS)
+
+
+def games_from_frame(all_games):
+    """
+    load_games() from a frame of the build (or ArrayStore.to_frame()) already
+    in memory: same rows, order, dtypes and display names as the array store.
+    """
+    # write_arrays() sorts the combine order (the index) the same way
+    df = all_games.sort_index().sort_values(["playerId", "season", "gameNumber"], kind="stable")
+    data = {}
+    for column in COLUMNS:
+        values = df[column]
+        if column == "name":
+            # Display name: the one of the player's latest season
+            data[column] = values.astype(str).groupby(df["playerId"].to_numpy()).transform("last").to_numpy()
+        elif column == "gameDate":
+            data[column] = values.to_numpy()
+        else:
+            default = values.dtype if values.dtype.kind in "iu" else "float32"
+            data[column] = values.to_numpy(dtype=array_store.COLUMN_DTYPES.get(column, default))
+    return pd.DataFrame(data)
+
+
+def season_summary(df):
+    """GP / G / A / P / +/- / PPG per (playerId, season), like build_live_dashboard.R."""
+    summary = df.groupby(["playerId", "season"], sort=True).agg(
+        GP=("gameNumber", "size"),
+        G=("I_F_goals", "sum"),
+        P=("I_F_points", "sum"),
+        plusMinus=("plusMinus", "sum"),
+    ).reset_index()
+    summary["A"] = summary["P"] - summary["G"]
+    summary["PPG"] = (summary["P"] / summary["GP"]).round(2)
+    return summary
+
+
+def build_index(df, summary):
+    """
+    The data inlined in the page: one [playerId, name] per player (name of the
+    latest season, since some players are listed under several spellings),
+    every season, and each player's season totals as rows of SUMMARY_COLUMNS.
+    """
+    last = df.drop_duplicates("playerId", keep="last").sort_values("name", kind="stable")
+    columns = {c: _values(summary[c]) for c in SUMMARY_COLUMNS}
+    totals = {}
+    for i, player_id in enumerate(summary["playerId"].tolist()):
+        totals.setdefault(str(player_id), []).append([columns[c][i] for c in SUMMARY_COLUMNS])
+    return {
+        "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "games": len(df),
+        "players": [[int(p), n] for p, n in zip(last["playerId"], last["name"])],
+        "seasons": sorted(int(s) for s in df["season"].unique()),
+        "summaryColumns": SUMMARY_COLUMNS,
+        "summary": totals,
+    }
+
+
+def player_shards(df):
+    """
+    Yield (playerId, shard) for every player. A shard is columnar:
+    {"id", "name", "seasons": {season: {column: [values in game order]}}}.
+    `df` must be sorted by playerId, season, gameNumber (see load_games).
+    """
+    # Every column converted once; players and seasons are then list slices
+    columns = {c: _values(df[c]) for c in GAME_COLUMNS if c != "gameDate"}
+    columns["gameDate"] = df["gameDate"].dt.strftime("%Y-%m-%d").tolist()
+    player_ids = df["playerId"].to_numpy()
+    seasons = df["season"].to_numpy()
+    names = df["name"].to_numpy()
+
+    season_starts = np.append(np.flatnonzero(segment_starts(df, ["playerId", "season"])), len(df))
+    shard = None
+    for a, b in zip(season_starts[:-1], season_starts[1:]):
+        player_id = int(player_ids[a])
+        if shard is None or shard["id"] != player_id:
+            if shard is not None:
+                yield shard["id"], shard
+            shard = {"id": player_id, "name": names[a], "seasons": {}}
+        shard["name"] = names[a]
+        shard["seasons"][str(int(seasons[a]))] = {c: columns[c][a:b] for c in GAME_COLUMNS}
+    if shard is not None:
+        yield shard["id"], shard
+
+
+def render_html(index):
+    """The page, with the index inlined (the only data it loads up front)."""
+    data = json.dumps(index, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+    return (HTML_TEMPLATE
+            .replace("__PLAYERS__", str(len(index["players"])))
+            .replace("__GAMES__", f"{index['games']:,}")
+            .replace("__UPDATED__", index["updated"])
+            .replace("__INDEX__", data))
+
+
+def export(df, folder=OUTPUT_DIR):
+    """
+    Write index.html and players/<playerId>.json.gz into `folder`. Unchanged
+    shards (and the page, when no data changed) are left untouched and shards
+    of players no longer in `df` removed.
+    Returns the counts and sizes of what was written.
+    """
+    shard_folder = os.path.join(folder, SHARD_DIR)
+    os.makedirs(shard_folder, exist_ok=True)
+
+    stats = {"players": 0, "written": 0, "removed": 0, "shard_bytes": 0}
+    kept = set()
+    for player_id, shard in player_shards(df):
+        payload = _gzip_json(shard)
+        filename = f"{player_id}.json.gz"
+        kept.add(filename)
+        stats["players"] += 1
+        stats["shard_bytes"] += len(payload)
+        stats["written"] += _write_if_changed(os.path.join(shard_folder, filename), payload)
+
+    for filename in os.listdir(shard_folder):
+        if filename not in kept:
+            os.remove(os.path.join(shard_folder, filename))
+            stats["removed"] += 1
+
+    # Same data as the page already there: keep its date, so it is not rewritten
+    index = build_index(df, season_summary(df))
+    page = os.path.join(folder, "index.html")
+    previous, updated = _previous_page(page)
+    html = render_html(index).encode("utf-8")
+    if updated is not None:
+        unchanged = render_html({**index, "updated": updated}).encode("utf-8")
+        html = previous if unchanged == previous else html
+    stats["html_written"] = _write_if_changed(page, html)
+    stats["html_bytes"] = len(html)
+    stats["html_gzip_bytes"] = len(gzip.compress(html, mtime=0))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the HTML dashboard (index + one shard per player)")
+    parser.add_argument("--output", default=OUTPUT_DIR,
+                        help=f"Output folder (default: {OUTPUT_DIR})")
+    run_report.add_arguments(parser)
+    args = parser.parse_args()
+    report = run_report.from_args("dashboard", args)
+
+    if not os.path.isdir(array_store.ARRAY_DIR):
+        print(f"❌ {array_store.ARRAY_DIR}/ not found, run python build_players_game_by_game.py first")
+        exit(1)
+
+    print(f"🔄 Loading data from {array_store.ARRAY_DIR}/...")
+    with report.stage("load") as stage:
+        df = load_games()
+        stage.add(rows=len(df))
+    print(f"✅ Loaded {df['playerId'].nunique()} players, {len(df)} total games")
+
+    with report.stage("export") as stage:
+        stats = export(df, args.output)
+        stage.add(rows=stats["players"], bytes=stats["shard_bytes"] + stats["html_bytes"],
+                  written=stats["written"], removed=stats["removed"])
+    print(f"✅ {stats['players']} player shards ({stats['written']} updated, "
+          f"{stats['removed']} removed), {stats['shard_bytes'] / 1024:.0f} KB in total")
+    print(f"✅ index.html: {stats['html_bytes'] / 1024:.0f} KB "
+          f"({stats['html_gzip_bytes'] / 1024:.0f} KB gzipped)")
+    print(f"\n✅ Dashboard created!")
+    print(f"📝 Run report: {report.write()}")
+    print(f"📂 Serve it: python -m http.server -d {args.output}  (then open http://localhost:8000)")
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>NHL Game-by-Game Stats</title>
+    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .header { text-align: center; margin-bottom: 20px; }
+        .header h1 { color: #333; margin-bottom: 10px; }
+        .update-info { display: flex; justify-content: center; align-items: center; gap: 20px;
+                       color: #666; font-size: 14px; flex-wrap: wrap; }
+        .stats-badge { background: #e3f2fd; padding: 5px 15px; border-radius: 15px; font-size: 12px;
+                       color: #1976d2; font-weight: bold; }
+        .status-indicator { display: inline-block; width: 10px; height: 10px; border-radius: 50%;
+                            margin-right: 5px; background: #28a745; box-shadow: 0 0 10px #28a745; }
+        .container { display: grid; grid-template-columns: 250px 1fr; gap: 20px; max-width: 1800px; margin: 0 auto; }
+        .right-column { display: flex; flex-direction: column; gap: 20px; }
+        .panel { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        h2 { margin-top: 0; color: #555; font-size: 18px; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
+        select { width: 100%; padding: 10px; font-size: 16px; border: 2px solid #ddd; border-radius: 4px;
+                 margin-bottom: 10px; cursor: pointer; }
+        select:focus { outline: none; border-color: #007bff; }
+        table { width: 100%; border-collapse: collapse; font-size: 14px; }
+        th { background: #007bff; color: white; padding: 10px; text-align: left; font-weight: bold; }
+        td { padding: 8px; border-bottom: 1px solid #eee; }
+        tr:hover { background: #f8f9fa; }
+        #plot { height: 500px; }
+        .search-box { margin-bottom: 15px; }
+        .search-box input { width: 100%; padding: 10px; font-size: 14px; border: 2px solid #ddd; border-radius: 4px; }
+        .search-box input:focus { outline: none; border-color: #007bff; }
+        .player-count { font-size: 12px; color: #666; margin-top: 5px; }
+        .left-column { height: fit-content; position: sticky; top: 20px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🏒 NHL Game-by-Game Statistics</h1>
+        <div class="update-info">
+            <span class="stats-badge">👥 __PLAYERS__ Players</span>
+            <span class="stats-badge">🎮 __GAMES__ Games</span>
+            <span>
+                <span class="status-indicator"></span>
+                Last updated: <strong>__UPDATED__</strong>
+            </span>
+        </div>
+    </div>
+
+    <div class="container">
+        <div class="left-column">
+            <div class="panel">
+                <h2>Select Player</h2>
+                <div class="search-box">
+                    <input type="text" id="searchBox" placeholder="Search players..." />
+                </div>
+                <select id="playerSelect" size="30"></select>
+                <div class="player-count" id="playerCount"></div>
+            </div>
+        </div>
+
+        <div class="right-column">
+            <div class="panel">
+                <h2>Season Statistics</h2>
+                <div id="statsTable"></div>
+            </div>
+
+            <div class="panel">
+                <div id="plot"></div>
+            </div>
+        </div>
+    </div>
+
+    <script>
+        // Players, seasons and season totals only; game-by-game data is
+        // fetched per player from players/<playerId>.json.gz
+        const INDEX = __INDEX__;
+
+        const shards = new Map();
+        let currentPlayer = null;
+
+        async function fetchShard(playerId) {
+            if (!shards.has(playerId)) {
+                const request = fetch(`players/${playerId}.json.gz`).then(async response => {
+                    if (!response.ok) throw new Error(`players/${playerId}.json.gz: ${response.status}`);
+                    const bytes = new Uint8Array(await response.arrayBuffer());
+                    // Decompressed by the browser already if served with Content-Encoding: gzip
+                    if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+                        return JSON.parse(new TextDecoder().decode(bytes));
+                    }
+                    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+                    return new Response(stream).json();
+                });
+                shards.set(playerId, request);
+                request.catch(() => shards.delete(playerId));
+            }
+            return shards.get(playerId);
+        }
+
+        function updatePlayerList(players) {
+            const select = document.getElementById("playerSelect");
+            select.innerHTML = "";
+
+            players.forEach(([id, name]) => {
+                const option = document.createElement("option");
+                option.value = id;
+                option.textContent = name;
+                select.appendChild(option);
+            });
+
+            document.getElementById("playerCount").textContent =
+                `${players.length} player${players.length !== 1 ? "s" : ""}`;
+        }
+
+        document.getElementById("searchBox").addEventListener("input", (e) => {
+            const search = e.target.value.toLowerCase();
+            const filtered = INDEX.players.filter(([, name]) => name.toLowerCase().includes(search));
+            updatePlayerList(filtered);
+
+            if (filtered.length > 0) {
+                document.getElementById("playerSelect").value = filtered[0][0];
+            }
+        });
+
+        document.getElementById("playerSelect").addEventListener("change", (e) => {
+            selectPlayer(Number(e.target.value));
+        });
+
+        async function selectPlayer(playerId) {
+            currentPlayer = playerId;
+
+            // The stats table comes from the index, no fetch needed
+            const columns = INDEX.summaryColumns;
+            const seasons = (INDEX.summary[playerId] || []).map(row =>
+                Object.fromEntries(columns.map((c, i) => [c, row[i]])));
+            updateStatsTable(seasons);
+
+            const shard = await fetchShard(playerId);
+            if (currentPlayer !== playerId) return;  // another player was picked meanwhile
+            plotPlayer(shard);
+        }
+
+        function plotPlayer(shard) {
+            const traces = Object.keys(shard.seasons).sort().map(season => {
+                const games = shard.seasons[season];
+
+                return {
+                    x: games.gameNumber,
+                    y: games.cum_points,
+                    mode: "lines+markers",
+                    name: season,
+                    line: { width: 2 },
+                    marker: { size: 6 },
+                    text: games.gameNumber.map((n, i) =>
+                        `<b>Game ${n}</b><br>` +
+                        `Date: ${games.gameDate[i]}<br>` +
+                        `─────────────<br>` +
+                        `Points: ${games.I_F_points[i]}<br>` +
+                        `Goals: ${games.I_F_goals[i]}<br>` +
+                        `+/-: ${games.plusMinus[i] >= 0 ? "+" : ""}${games.plusMinus[i]}<br>` +
+                        `─────────────<br>` +
+                        `Cumulative: <b>${games.cum_points[i]}</b> pts`
+                    ),
+                    hovertemplate: "%{text}<extra></extra>"
+                };
+            });
+
+            const layout = {
+                title: {
+                    text: `${shard.name} - Cumulative Points by Game`,
+                    font: { size: 18, weight: "bold" }
+                },
+                xaxis: { title: "Game Number", gridcolor: "#f0f0f0" },
+                yaxis: { title: "Cumulative Points", gridcolor: "#f0f0f0" },
+                hovermode: "closest",
+                showlegend: true,
+                legend: { orientation: "h", y: -0.15, x: 0.5, xanchor: "center" },
+                plot_bgcolor: "#fafafa",
+                paper_bgcolor: "white"
+            };
+
+            Plotly.newPlot("plot", traces, layout, {responsive: true});
+        }
+
+        function updateStatsTable(seasons) {
+            const sorted = seasons.sort((a, b) => b.season - a.season);
+
+            let html = `
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Season</th><th>GP</th><th>G</th><th>A</th><th>P</th><th>+/-</th><th>PPG</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+            `;
+
+            sorted.forEach(s => {
+                html += `
+                    <tr>
+                        <td><strong>${s.season}</strong></td>
+                        <td>${s.GP}</td>
+                        <td>${s.G}</td>
+                        <td>${s.A}</td>
+                        <td><strong>${s.P}</strong></td>
+                        <td>${s.plusMinus >= 0 ? "+" : ""}${s.plusMinus}</td>
+                        <td>${s.PPG}</td>
+                    </tr>
+                `;
+            });
+
+            const totals = {
+                GP: sorted.reduce((sum, s) => sum + s.GP, 0),
+                G: sorted.reduce((sum, s) => sum + s.G, 0),
+                A: sorted.reduce((sum, s) => sum + s.A, 0),
+                P: sorted.reduce((sum, s) => sum + s.P, 0),
+                plusMinus: sorted.reduce((sum, s) => sum + s.plusMinus, 0)
+            };
+            totals.PPG = (totals.P / totals.GP).toFixed(2);
+
+            html += `
+                    <tr style="background: #e3f2fd; font-weight: bold;">
+                        <td>CAREER</td>
+                        <td>${totals.GP}</td>
+                        <td>${totals.G}</td>
+                        <td>${totals.A}</td>
+                        <td>${totals.P}</td>
+                        <td>${totals.plusMinus >= 0 ? "+" : ""}${totals.plusMinus}</td>
+                        <td>${totals.PPG}</td>
+                    </tr>
+                </tbody>
+            </table>
+            `;
+
+            document.getElementById("statsTable").innerHTML = html;
+        }
+
+        updatePlayerList(INDEX.players);
+        console.log("✅ Loaded", INDEX.players.length, "players");
+        if (INDEX.players.length > 0) {
+            document.getElementById("playerSelect").value = INDEX.players[0][0];
+            selectPlayer(INDEX.players[0][0]);
+        }
+    </script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    main()
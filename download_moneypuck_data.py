@@ -1,37 +1,9 @@
 # download_moneypuck_data.py - Automatically download all player data
-import requests
-import pandas as pd
-import time
-from pathlib import Path
+from cli import lazy_import
+from moneypuck_fetch import download_players, select_players
 
-# Create data folder if it doesn't exist
-DATA_FOLDER = Path("data_gbg")
-DATA_FOLDER.mkdir(exist_ok=True)
-
-# MoneyPuck URL pattern (adjust if needed)
-# Format: https://moneypuck.com/moneypuck/playerData/careers/gameByGame/8471214.csv
-BASE_URL = "https://moneypuck.com/moneypuck/playerData/careers/gameByGame/{player_id}.csv"
-
-def download_player_data(player_id, player_name=None):
-    """Download game-by-game data for a single player"""
-    url = BASE_URL.format(player_id=player_id)
-    filename = DATA_FOLDER / f"{player_id}.csv"
-    
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Save the CSV
-        with open(filename, 'wb') as f:
-            f.write(response.content)
-        
-        name = player_name if player_name else player_id
-        print(f"✅ Downloaded: {name} ({player_id})")
-        return True
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed: {player_id} - {e}")
-        return False
+# Only loaded if OPTION 2 below is used
+pd = lazy_import("pandas")
 
 def get_all_player_ids():
     """
@@ -55,36 +27,18 @@ def get_all_player_ids():
     # df = pd.read_csv("player_ids.csv")
     # player_ids = df['playerId'].tolist()
     
-    # OPTION 3: Scrape from MoneyPuck's player list page
-    # (Would need BeautifulSoup - see below)
+    # OPTION 3: Every player of the recent seasons
+    # (what download_all_moneypuck_players.py does)
+    # player_ids, _ = select_players()
     
     return player_ids
 
 def download_all_players():
     """Download data for all players"""
-    player_ids = get_all_player_ids()
-    
-    print(f"📥 Starting download for {len(player_ids)} players...")
-    print(f"📂 Saving to: {DATA_FOLDER.absolute()}\n")
-    
-    success_count = 0
-    fail_count = 0
-    
-    for i, player_id in enumerate(player_ids, 1):
-        print(f"[{i}/{len(player_ids)}] ", end="")
-        
-        if download_player_data(player_id):
-            success_count += 1
-        else:
-            fail_count += 1
-        
-        # Be nice to the server - wait between requests
-        time.sleep(0.5)
+    player_ids, player_names = select_players(player_ids=get_all_player_ids())
     
-    print(f"\n{'='*50}")
-    print(f"✅ Successfully downloaded: {success_count}")
-    print(f"❌ Failed: {fail_count}")
-    print(f"📂 Files saved to: {DATA_FOLDER.absolute()}")
+    # Same session, cache and URL as the other download scripts
+    return download_players(player_ids, player_names)
 
 if __name__ == "__main__":
-    download_all_players()
\ No newline at end of file
+    download_all_players()
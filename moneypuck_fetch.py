@@ -0,0 +1,674 @@
+# moneypuck_fetch.py - Shared fetch library behind every MoneyPuck download script
+#
+# One pooled requests.Session shared by a thread pool. A token bucket spreads
+# requests over time instead of sleeping after every player, and transient
+# failures (timeouts, connection errors, 429/5xx) are retried with exponential
+# backoff and jitter. Responses are streamed to disk in chunks and validated on
+# the fly (header row, row count) without ever building a DataFrame.
+#
+# Every download goes through an on-disk response cache keyed by URL: a recent
+# enough entry is served with no network call at all, an older one is
+# revalidated with a conditional GET (ETag / Last-Modified, 304 = unchanged).
+#
+# Careers are appended to the career archive (career_archive.py) rather than
+# kept as one CSV per player, unless a download is given archive=None.
+import contextlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date
+from email.utils import formatdate
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import career_archive
+from cli import lazy_import
+import run_report
+from moneypuck_loader import GAME_BY_GAME_SCHEMA, SEASON_SUMMARY_SCHEMA, read_season_summary
+
+pd = lazy_import("pandas")
+requests = lazy_import("requests")
+
+DATA_FOLDER = Path("data_gbg")
+ARCHIVE_DIR = career_archive.ARCHIVE_DIR
+
+CAREER_URL = "https://moneypuck.com/moneypuck/playerData/careers/gameByGame/regular/skaters/{player_id}.csv"
+SEASON_SUMMARY_URL = "https://moneypuck.com/moneypuck/playerData/seasonSummary/{season}/regular/skaters.csv"
+
+# Seasons scanned for the "all players" roster
+SEASONS = [2024, 2023, 2022, 2021, 2020, 2019]  # Last 6 seasons
+
+# Season summaries already kept by build_dataset.py; finished seasons are read from here
+LOCAL_SEASON_FILE = "data/skaters_{season}_{next_season}.csv"
+
+# Response cache: index.json + bodies/ for responses not saved elsewhere
+CACHE_DIR = ".http_cache"
+
+# Entries checked more recently than this are served without any request
+DEFAULT_MAX_AGE = 6 * 3600
+
+# Status codes worth retrying: rate limited or server-side trouble
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Streaming chunk size: bounds the memory held per download
+CHUNK_SIZE = 64 * 1024
+
+# Anything smaller is an empty or error page, not a career file
+MIN_FILE_SIZE = 100
+
+# Header rows longer than this are not MoneyPuck CSVs
+MAX_HEADER_SIZE = 64 * 1024
+
+# A downloaded file must at least have the columns the pipeline reads
+CAREER_COLUMNS = list(GAME_BY_GAME_SCHEMA)
+SEASON_SUMMARY_COLUMNS = list(SEASON_SUMMARY_SCHEMA)
+
+STATUS_ICONS = {
+    "success": "✅",
+    "skipped": "⏭️",
+    "no_data": "⚠️",
+    "timeout": "⏱️",
+    "invalid": "❌",
+    "error": "❌"
+}
+
+STATUS_MESSAGES = {
+    "success": "Téléchargé",
+    "skipped": "Inchangé",
+    "no_data": "Pas de données",
+    "timeout": "Timeout",
+    "invalid": "Données invalides",
+    "error": "Erreur"
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts of `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size):
+    """A requests.Session whose connection pool can serve `pool_size` threads."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class Downloader:
+    """
+    Shared session, rate limit and retry policy for many concurrent GETs.
+    `rate` is in requests per second (0 disables the limit).
+    """
+
+    def __init__(self, concurrency=8, rate=10.0, retries=3, backoff=0.5, timeout=15):
+        self.concurrency = max(1, concurrency)
+        self.session = make_session(self.concurrency)
+        self.limiter = TokenBucket(rate, burst=self.concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.retry_count = 0
+        self.request_count = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def _sleep_before_retry(self, attempt):
+        with self._lock:
+            self.retry_count += 1
+        # Full jitter: anywhere between 0 and the exponential delay
+        time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def get(self, url, **kwargs):
+        """
+        Rate-limited GET with retries. Returns the last response (which may
+        still be an error status) or raises the last requests exception.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            with self._lock:
+                self.request_count += 1
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if attempt == self.retries:
+                    raise
+            else:
+                # Streamed bodies are counted by whoever consumes them
+                if not kwargs.get("stream"):
+                    self.count_bytes(len(response.content))
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    return response
+                response.close()
+            self._sleep_before_retry(attempt)
+
+    def count_bytes(self, n):
+        with self._lock:
+            self.bytes_received += n
+
+    def map(self, fn, items):
+        """
+        Run fn(item) for every item on the thread pool and yield (item, result)
+        as each one finishes. Closing the generator cancels pending items.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(fn, item): item for item in items}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def close(self):
+        self.session.close()
+
+
+def _check_header(header, required_columns):
+    columns = header.decode("utf-8", errors="replace").strip().split(",")
+    return all(col in columns for col in required_columns)
+
+
+def stream_to_file(response, filename, required_columns=(), chunk_size=CHUNK_SIZE):
+    """
+    Write a streamed response to `filename` chunk by chunk, checking the header
+    row and counting rows as it goes. The data lands in a temp file next to
+    `filename` and is only renamed over it when valid.
+    Returns (status, size): status is "success", "no_data" or "invalid".
+    """
+    folder = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".", suffix=".part")
+    size = 0
+    newlines = 0
+    header = b""
+    header_ok = None
+    last = b"\n"
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                f.write(chunk)
+                size += len(chunk)
+                newlines += chunk.count(b"\n")
+                last = chunk[-1:]
+
+                if header_ok is None:
+                    header += chunk
+                    if b"\n" in header:
+                        header_ok = _check_header(header.split(b"\n", 1)[0], required_columns)
+                        header = b""
+                        if not header_ok:
+                            break
+                    elif len(header) > MAX_HEADER_SIZE:
+                        header_ok = False
+                        break
+
+        if header_ok is None and size > 0:
+            # Header only, no newline at all
+            header_ok = _check_header(header, required_columns)
+
+        rows = newlines - 1 + (last != b"\n")
+        if size < MIN_FILE_SIZE or (header_ok and rows <= 0):
+            status = "no_data"
+        elif not header_ok:
+            status = "invalid"
+        else:
+            os.replace(tmp, filename)
+            return "success", size
+        os.remove(tmp)
+        return status, size
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses keyed by URL. Each entry records where the
+    body was saved, its size, its validators (ETag, Last-Modified) and when it
+    was last checked against the server. Thread-safe; call save() when done.
+    """
+
+    def __init__(self, folder=CACHE_DIR, max_age=DEFAULT_MAX_AGE):
+        self.folder = Path(folder)
+        self.index_file = self.folder / "index.json"
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_file) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def body_path(self, name):
+        """Where to keep a response body that has no other home (e.g. season summaries)."""
+        return self.folder / "bodies" / name
+
+    # `path` is where the body was saved. Bodies that are not files (a career
+    # in the archive) are named by a key and their size / mtime passed in.
+
+    def _entry(self, url, path, size=None):
+        with self._lock:
+            entry = self.entries.get(url)
+        if entry is None or entry["path"] != str(path):
+            return None
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return None
+        if size != entry["size"]:
+            return None
+        return entry
+
+    def is_fresh(self, url, path, max_age=None, size=None):
+        """
+        True if `path` holds the cached body of `url` and was checked within
+        max_age (the cache's own unless given; float("inf") = never expires).
+        """
+        max_age = self.max_age if max_age is None else max_age
+        entry = self._entry(url, path, size)
+        return entry is not None and time.time() - entry["checked_at"] < max_age
+
+    def conditional_headers(self, url, path, size=None, mtime=None):
+        """
+        Headers for a conditional GET of `url`, or {} if `path` is missing or
+        empty. Files saved before the cache knew about them fall back to their
+        mtime as If-Modified-Since.
+        """
+        if size is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return {}
+            size, mtime = st.st_size, st.st_mtime
+        if not size:
+            return {}
+
+        headers = {}
+        entry = self._entry(url, path, size)
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers and mtime is not None:
+            headers["If-Modified-Since"] = formatdate(mtime, usegmt=True)
+        return headers
+
+    def record(self, url, response, path, size):
+        with self._lock:
+            self.entries[url] = {
+                "path": str(path),
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "checked_at": time.time(),
+            }
+
+    def touch(self, url, path, size=None):
+        """Mark `url` as just revalidated (304), recording it if it was unknown."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None or entry["path"] != str(path):
+                entry = self.entries[url] = {"path": str(path), "etag": None, "last_modified": None}
+            entry["size"] = os.path.getsize(path) if size is None else size
+            entry["checked_at"] = time.time()
+
+    def save(self):
+        with self._lock:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.index_file)
+
+
+_shared = {}
+
+
+def shared_downloader(concurrency=8, rate=10.0, retries=3):
+    """
+    The process-wide Downloader, so every script (and the pipeline) reuses one
+    session and one rate limit. Created on first use with these settings.
+    """
+    if "downloader" not in _shared:
+        _shared["downloader"] = Downloader(concurrency=concurrency, rate=rate, retries=retries)
+    return _shared["downloader"]
+
+
+def shared_cache(max_age=DEFAULT_MAX_AGE):
+    """The process-wide ResponseCache (max_age is updated on every call)."""
+    if "cache" not in _shared:
+        _shared["cache"] = ResponseCache()
+    _shared["cache"].max_age = max_age
+    return _shared["cache"]
+
+
+def _fetch(url, path, downloader, cache, save, max_age=None, size=None, mtime=None):
+    """
+    Fetch `url` through the cache into wherever save(response) puts it;
+    `path` names the saved body (and size / mtime describe it when it is not
+    a file). Returns "success", "skipped" (fresh in cache or 304), "no_data"
+    or "invalid"; requests exceptions propagate to the caller.
+    """
+    if cache.is_fresh(url, path, max_age, size):
+        return "skipped"
+
+    headers = cache.conditional_headers(url, path, size, mtime)
+    response = downloader.get(url, headers=headers, stream=True)
+
+    with response:
+        # Unchanged since our copy
+        if response.status_code == 304:
+            cache.touch(url, path, size)
+            return "skipped"
+
+        # Handle 404 gracefully
+        if response.status_code == 404:
+            return "no_data"
+
+        response.raise_for_status()
+        result, written = save(response)
+
+    downloader.count_bytes(written)
+    if result == "success":
+        cache.record(url, response, path, written)
+    return result
+
+
+def fetch_to_file(url, path, downloader, cache, required_columns=(), max_age=None):
+    """Fetch `url` into the file `path` through the cache (`max_age` overrides the cache's)."""
+    def save(response):
+        # Written straight to disk in chunks; the header and row count are
+        # checked on the way, the file is only swapped in when valid
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return stream_to_file(response, path, required_columns)
+
+    return _fetch(url, path, downloader, cache, save, max_age)
+
+
+def fetch_to_archive(url, player_id, archive, downloader, cache, required_columns=(), max_age=None):
+    """
+    Fetch the career of `player_id` into a career_archive.CareerArchive: it is
+    streamed and checked like a file, then added to the archive (replacing
+    the stored one) and the temporary CSV removed.
+    """
+    def save(response):
+        Path(archive.path).mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=archive.path, prefix=".", suffix=".csv.tmp")
+        os.close(fd)
+        try:
+            result, written = stream_to_file(response, tmp, required_columns)
+            if result == "success":
+                archive.add(player_id, tmp)
+            return result, written
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    entry = archive.entry(player_id)
+    return _fetch(url, archive.key(player_id), downloader, cache, save, max_age,
+                  size=0 if entry is None else entry["size"],
+                  mtime=None if entry is None else entry["mtime"])
+
+
+def download_player_data(player_id, downloader, cache, base_url=CAREER_URL, folder=DATA_FOLDER,
+                         archive=None):
+    """
+    Download game-by-game data for a single player, into `archive` (a
+    career_archive.CareerArchive) or else `folder`. Returns its outcome.
+    """
+    url = base_url.format(player_id=player_id)
+
+    try:
+        if archive is not None:
+            return fetch_to_archive(url, player_id, archive, downloader, cache, CAREER_COLUMNS)
+        filename = Path(folder) / f"{player_id}.csv"
+        return fetch_to_file(url, filename, downloader, cache, CAREER_COLUMNS)
+    except requests.exceptions.Timeout:
+        return "timeout"
+    except requests.exceptions.RequestException:
+        return "error"
+
+
+def current_season(today=None):
+    """The season in progress (or about to start): 2025 for 2025-26, from September on."""
+    today = today or date.today()
+    return today.year if today.month >= 9 else today.year - 1
+
+
+def read_season(season, downloader=None, cache=None):
+    """
+    The season summary of `season` (data/skaters_*.csv columns).
+    Finished seasons never change: they are read from data/ when present, and
+    otherwise fetched once and cached for good. The current season follows
+    the cache's max_age.
+    """
+    finished = season < current_season()
+    local = Path(LOCAL_SEASON_FILE.format(season=season, next_season=season + 1))
+    if finished and local.exists():
+        return read_season_summary(local)
+
+    downloader = downloader or shared_downloader()
+    cache = cache or shared_cache()
+    url = SEASON_SUMMARY_URL.format(season=season)
+    path = cache.body_path(f"seasonSummary_{season}_skaters.csv")
+    max_age = float("inf") if finished else None
+    result = fetch_to_file(url, path, downloader, cache, SEASON_SUMMARY_COLUMNS, max_age)
+    if result not in ["success", "skipped"]:
+        raise ValueError(f"season summary {season}: {result}")
+    return read_season_summary(path)
+
+
+def select_players(team=None, player_ids=None, seasons=SEASONS, downloader=None, cache=None):
+    """
+    Pick the players to download. Returns (player_ids, {playerId: name}).
+    player_ids: explicit list of IDs (names unknown)
+    team: team code or list of codes, filtered on the first season in `seasons`
+    otherwise: every player seen in `seasons`
+    """
+    if player_ids is not None:
+        return list(player_ids), {}
+
+    downloader = downloader or shared_downloader()
+    cache = cache or shared_cache()
+
+    if team is not None:
+        teams = [team] if isinstance(team, str) else list(team)
+        season = seasons[0]
+        try:
+            df = read_season(season, downloader, cache)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            return [], {}
+        df = df[df["team"].isin(teams)]
+        names = dict(zip(df["playerId"].tolist(), df["name"].astype(str).tolist()))
+        return list(names), names
+
+    print("📋 Fetching players from multiple seasons...\n")
+
+    def fetch(season):
+        try:
+            return read_season(season, downloader, cache)
+        except Exception as e:
+            return e
+
+    # Seasons are fetched concurrently (and rate limited by the downloader),
+    # then reported in the order of `seasons`
+    frames = dict(downloader.map(fetch, seasons))
+    cache.save()
+
+    rosters = []
+    for season in seasons:
+        df = frames[season]
+        if isinstance(df, Exception):
+            print(f"  ❌ {season}-{season+1}: Failed - {df}")
+            continue
+        rosters.append(df[["playerId", "name"]].astype({"name": str}))
+        print(f"  ✅ {season}-{season+1}: {df['playerId'].nunique()} players")
+
+    if not rosters:
+        print("\n✅ Total unique players: 0\n")
+        return [], {}
+
+    # IDs in order of first appearance, name from the oldest season they
+    # played in (same result as filling a dict season by season)
+    players = pd.concat(rosters, ignore_index=True)
+    player_ids = players.drop_duplicates("playerId")["playerId"].tolist()
+    last = players.drop_duplicates("playerId", keep="last")
+    names = dict(zip(last["playerId"].tolist(), last["name"].tolist()))
+
+    print(f"\n✅ Total unique players: {len(player_ids)}\n")
+    return player_ids, {player_id: names[player_id] for player_id in player_ids}
+
+
+def download_players(player_ids, player_names=None, title="Résumé du téléchargement",
+                     concurrency=8, rate=10.0, retries=3, max_age=DEFAULT_MAX_AGE,
+                     base_url=CAREER_URL, folder=DATA_FOLDER, downloader=None, cache=None,
+                     report=None, verbose=False, archive=ARCHIVE_DIR):
+    """
+    Download the careers of `player_ids` concurrently through the shared
+    session and response cache, with a progress bar (one line per player when
+    `verbose`) and a summary. Careers go into the career archive at `archive`
+    (created from the CSVs already in `folder` the first time), or are saved
+    as `folder`/{playerId}.csv with archive=None. Every player, outcome and
+    retry is recorded in `report` (a run_report.RunReport; without one, a
+    "download" report is written to .run_reports/). Returns the outcome
+    counters plus "requests", "retries" and "bytes" for this run.
+    """
+    own_report = report is None
+    report = report or run_report.RunReport("download")
+    player_names = player_names or {}
+    downloader = downloader or shared_downloader(concurrency, rate, retries)
+    cache = cache or shared_cache(max_age)
+    if archive is not None:
+        new_archive = not career_archive.exists(archive)
+        archive = career_archive.CareerArchive(archive)
+        if new_archive and Path(folder).is_dir():
+            with report.stage("import") as stage:
+                added, _ = career_archive.import_folder(folder, archive, verbose=False)
+                stage.add(rows=added)
+            if added:
+                print(f"📦 {added} careers of {folder}/ imported into {archive.path}/")
+    else:
+        Path(folder).mkdir(parents=True, exist_ok=True)
+
+    print(f"📥 Starting download for {len(player_ids)} players...")
+    print(f"⚙️  {downloader.concurrency} concurrent downloads, "
+          f"max {downloader.limiter.rate or '∞'} requests/s")
+    print(f"📂 Saving to: {Path(archive.path if archive else folder).absolute()}\n")
+
+    # Counters
+    stats = {
+        "success": 0,
+        "skipped": 0,
+        "no_data": 0,
+        "timeout": 0,
+        "invalid": 0,
+        "error": 0
+    }
+    before = (downloader.request_count, downloader.retry_count, downloader.bytes_received)
+
+    # Safety: stop after too many consecutive failures
+    max_consecutive_fails = 20
+    consecutive_fails = 0
+
+    def fetch(player_id):
+        start = time.perf_counter()
+        result = download_player_data(player_id, downloader, cache, base_url, folder, archive)
+        return result, time.perf_counter() - start
+
+    # Rate limiting and retries are handled by the downloader, no fixed sleeps
+    with report.stage("download") as stage, \
+            run_report.Progress(len(player_ids), "📥 Downloading", enabled=False if verbose else None) as progress, \
+            (archive or contextlib.nullcontext()):
+        results = downloader.map(fetch, player_ids)
+        for i, (player_id, (result, seconds)) in enumerate(results, 1):
+            player_name = player_names.get(player_id) or str(player_id)
+            stats[result] += 1
+            if archive is not None:
+                path, size = archive.key(player_id), archive.size(player_id)
+            else:
+                path = Path(folder) / f"{player_id}.csv"
+                size = path.stat().st_size if result == "success" else None
+            report.file("download", path, seconds, status=result,
+                        bytes=size if result == "success" else None)
+            report.count(f"download.{result}")
+
+            if verbose:
+                print(f"[{i}/{len(player_ids)}] {player_name:<35} "
+                      f"{STATUS_ICONS[result]} {STATUS_MESSAGES[result]}")
+            progress.update(note=player_name)
+
+            # Check for too many failures (in completion order)
+            if result in ["timeout", "error"]:
+                consecutive_fails += 1
+                if consecutive_fails >= max_consecutive_fails:
+                    print(f"\n\n⚠️  {max_consecutive_fails} échecs consécutifs. Arrêt de sécurité.")
+                    report.count("download.aborted")
+                    results.close()
+                    break
+            else:
+                consecutive_fails = 0
+
+        cache.save()
+        stage.add(rows=sum(stats.values()), bytes=downloader.bytes_received - before[2],
+                  requests=downloader.request_count - before[0],
+                  retries=downloader.retry_count - before[1])
+
+    transfer = {
+        "requests": downloader.request_count - before[0],
+        "retries": downloader.retry_count - before[1],
+        "bytes": downloader.bytes_received - before[2],
+    }
+    for key, n in transfer.items():
+        report.count(f"download.{key}", n)
+
+    # Summary
+    print(f"\n{'='*70}")
+    print(f"📊 {title}:")
+    print(f"{'='*70}")
+    print(f"✅ Téléchargés avec succès:  {stats['success']}")
+    print(f"⏭️  Inchangés (cache/304):   {stats['skipped']}")
+    print(f"⚠️  Pas de données:          {stats['no_data']}")
+    print(f"⏱️  Timeouts:                {stats['timeout']}")
+    print(f"❌ Invalides/Erreurs:       {stats['invalid'] + stats['error']}")
+    print(f"🌐 Requêtes réseau:         {transfer['requests']}")
+    print(f"🔁 Tentatives répétées:     {transfer['retries']}")
+    print(f"📶 Données reçues:          {transfer['bytes'] / 1e6:.1f} MB")
+    print(f"{'='*70}")
+    print(f"📂 Fichiers sauvegardés: {Path(archive.path if archive else folder).absolute()}")
+    print(f"📈 Total fichiers utilisables: {stats['success'] + stats['skipped']}")
+    if own_report:
+        print(f"📝 Run report: {report.write()}")
+    print(f"\n💡 Prochaine étape: python build_players_game_by_game.py")
+
+    return {**stats, **transfer}
@@ -0,0 +1,88 @@
+# moneypuck_loader.py - Column-pruned, dtype-pinned readers for MoneyPuck CSVs
+#
+# MoneyPuck files carry ~150 columns but the pipeline only uses a handful.
+# Declaring them here once lets every script parse just those columns with
+# compact dtypes instead of float64/object for everything.
+from cli import lazy_import
+
+pd = lazy_import("pandas")
+
+# Stats summed / accumulated by the pipeline
+STAT_COLUMNS = ["I_F_points", "I_F_goals", "OnIce_F_goals", "OnIce_A_goals"]
+
+# data_gbg/{playerId}.csv - one row per game and situation
+GAME_BY_GAME_SCHEMA = {
+    "playerId": "int32",
+    "name": "category",
+    "season": "int16",
+    "gameId": "int32",
+    "gameDate": "int32",  # YYYYMMDD, converted by parse_game_date()
+    "situation": "category",
+    **{col: "float32" for col in STAT_COLUMNS},
+}
+
+# data/skaters_*.csv - one row per player, season and situation
+SEASON_SUMMARY_SCHEMA = {
+    "playerId": "int32",
+    "season": "int16",
+    "name": "category",
+    "team": "category",
+    "situation": "category",
+    **{col: "float32" for col in STAT_COLUMNS},
+}
+
+
+def _read(path, schema):
+    # A callable usecols tolerates files that lack some of the columns, so the
+    # callers can still report "missing columns" instead of crashing here
+    return pd.read_csv(
+        path,
+        usecols=lambda col: col in schema,
+        dtype=schema,
+        engine="c",
+    )
+
+
+def parse_game_date(values):
+    """Convert YYYYMMDD integers to datetime64 without going through strings."""
+    values = pd.Series(values, copy=False).astype("int64")
+    return pd.to_datetime(
+        pd.DataFrame({
+            "year": values // 10000,
+            "month": values // 100 % 100,
+            "day": values % 100,
+        }),
+        errors="coerce",
+    )
+
+
+def read_game_by_game(path, extra_columns=()):
+    """
+    Read one career game-by-game file with only the columns the build uses,
+    plus `extra_columns` (other stats, read as float32).
+    """
+    schema = {**GAME_BY_GAME_SCHEMA, **{col: "float32" for col in extra_columns}}
+    df = _read(path, schema)
+    if "gameDate" in df.columns:
+        df["gameDate"] = parse_game_date(df["gameDate"])
+    return df
+
+
+def read_archive_games(archive, players=None, extra_columns=()):
+    """
+    read_game_by_game() for many careers of a career_archive.CareerArchive at
+    once: the rows of `players` (default: all), player after player, with
+    the same columns and dtypes.
+    """
+    schema = {**GAME_BY_GAME_SCHEMA, **{col: "float32" for col in extra_columns}}
+    table = archive.read(players, columns=list(schema))
+    df = table.to_pandas()
+    df = df.astype({col: dtype for col, dtype in schema.items() if col in df.columns})
+    if "gameDate" in df.columns:
+        df["gameDate"] = parse_game_date(df["gameDate"])
+    return df
+
+
+def read_season_summary(path):
+    """Read one season summary file (data/skaters_*.csv)."""
+    return _read(path, SEASON_SUMMARY_SCHEMA)
@@ -0,0 +1,177 @@
+# pace_matrix.py - Player-season x gameNumber matrices of the cumulative stats
+#
+# One dense float32 matrix per cumulative stat: a row per (playerId, season),
+# a column per game number (1..longest season), NaN after the player's last
+# game. Built from the array store once per rebuild and stored column-major,
+# so "everyone after game N" is one contiguous memory-mapped column: game-N
+# leaderboards, ranks and percentiles are single vectorized operations.
+#
+#     matrix = PaceMatrix()
+#     matrix.leaderboard("cum_points", game_number=30, season=2024)
+#     matrix.rank("cum_points", 30, player_id=8480018, season=2024)
+import json
+import os
+import shutil
+import warnings
+
+from cli import lazy_import
+from cumulative import METRICS
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+MATRIX_DIR = "players_game_by_game.matrix"
+STATS = [target for _, target in METRICS]
+
+
+def write_matrix(store, path=MATRIX_DIR, stats=STATS):
+    """Build the matrices of `stats` from an ArrayStore and save them (.npy) in `path`."""
+    segment_start = store.offsets["segment_start"]
+    segment_rows = np.diff(segment_start)
+    # int32 positions: half the memory of the default int64 for the league's rows
+    row_of_game = np.repeat(np.arange(len(segment_rows), dtype="int32"), segment_rows)
+    column_of_game = store.columns["gameNumber"].astype("int32") - 1
+    n_games = int(column_of_game.max()) + 1 if len(column_of_game) else 0
+
+    players_per_segment = np.diff(store.offsets["player_segment"])
+    arrays = {
+        "player_id": np.repeat(store.offsets["player_id"], players_per_segment),
+        "season": np.asarray(store.offsets["segment_season"]),
+        "name": np.repeat(store.offsets["player_name"], players_per_segment),
+    }
+
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for key, values in arrays.items():
+        np.save(os.path.join(tmp, f"{key}.npy"), values)
+    for stat in stats:
+        # Column-major: each game number is a contiguous column. A player
+        # listed twice for a game (duplicate source files) writes the same cell.
+        # Saved as soon as built, so only one matrix is in memory at a time.
+        matrix = np.full((len(segment_rows), n_games), np.nan, dtype="float32", order="F")
+        matrix[row_of_game, column_of_game] = store.columns[stat]
+        np.save(os.path.join(tmp, f"{stat}.npy"), matrix)
+        del matrix
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump({"rows": len(segment_rows), "games": n_games, "stats": list(stats)}, f, indent=1)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+class PaceMatrix:
+    """Memory-mapped matrices written by write_matrix(), with leaderboards and ranks."""
+
+    def __init__(self, path=MATRIX_DIR):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.games = meta["games"]
+        self.stats = meta["stats"]
+
+        def load(key):
+            return np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r" if meta["rows"] else None)
+
+        self.player_id = load("player_id")
+        self.season = load("season")
+        self.name = load("name")
+        self.matrices = {stat: load(stat) for stat in self.stats}
+        # Rows are sorted by (playerId, season): one int64 key to search
+        self._keys = self.player_id.astype("int64") * 10_000 + self.season
+
+    # --- Rows ---
+
+    def seasons(self):
+        return sorted(int(s) for s in np.unique(self.season))
+
+    def row(self, player_id, season):
+        """Row of (player_id, season), or None."""
+        key = int(player_id) * 10_000 + int(season)
+        i = int(np.searchsorted(self._keys, key))
+        return i if i < len(self._keys) and self._keys[i] == key else None
+
+    def rows(self, season=None):
+        """Row indices of `season` (every row when None)."""
+        if season is None:
+            return np.arange(len(self.season))
+        return np.flatnonzero(self.season == int(season))
+
+    def last_game(self, season=None):
+        """Highest game number reached by anyone (in `season`, or at all)."""
+        rows = self.rows(season)
+        if len(rows) == 0:
+            return 0
+        played = ~np.isnan(self.matrices[self.stats[0]][rows])
+        return int(played.sum(axis=1).max())
+
+    def curve(self, stat, player_id, season):
+        """`stat` after each game of (player_id, season), without the NaN padding."""
+        i = self.row(player_id, season)
+        if i is None:
+            return np.empty(0, dtype="float32")
+        values = np.asarray(self.matrices[stat][i])
+        return values[:np.count_nonzero(~np.isnan(values))]
+
+    def _column(self, stat, game_number, season):
+        if not 1 <= game_number <= self.games:
+            raise ValueError(f"game_number must be between 1 and {self.games}")
+        column = self.matrices[stat][:, game_number - 1]
+        rows = self.rows(season) if season is not None else None
+        return column if rows is None else column[rows], rows
+
+    # --- League-wide, one column at a time ---
+
+    def leaderboard(self, stat, game_number, season=None, limit=10):
+        """
+        Top `limit` player-seasons by `stat` after `game_number` games (of
+        `season`, or of every season): name, playerId, season, <stat>, percentile.
+        """
+        values, rows = self._column(stat, game_number, season)
+        reached = np.flatnonzero(~np.isnan(values))
+        top = reached[np.argsort(-values[reached], kind="stable")[:limit]]
+        percentiles = self._percentiles(values[reached])
+        index = top if rows is None else rows[top]
+        return pd.DataFrame({
+            "name": self.name[index],
+            "playerId": self.player_id[index],
+            "season": self.season[index],
+            stat: values[top],
+            "percentile": percentiles[np.searchsorted(reached, top)],
+        })
+
+    @staticmethod
+    def _percentiles(values):
+        # Share of the other values strictly below, ties share the same percentile
+        if len(values) < 2:
+            return np.full(len(values), 100.0)
+        ordered = np.sort(values)
+        below = np.searchsorted(ordered, values, side="left")
+        return below / (len(values) - 1) * 100
+
+    def rank(self, stat, game_number, player_id, season, among_season=None):
+        """
+        Where (player_id, season) stands after `game_number` games among the
+        player-seasons that reached that game (of `among_season`, or of every
+        season): {"value", "rank" (1 = best), "of", "percentile"}, or None.
+        """
+        values, _ = self._column(stat, game_number, among_season)
+        i = self.row(player_id, season)
+        if i is None or np.isnan(self.matrices[stat][i, game_number - 1]):
+            return None
+        value = self.matrices[stat][i, game_number - 1]
+        values = values[~np.isnan(values)]
+        below = int(np.count_nonzero(values < value))
+        return {
+            "value": float(value),
+            "rank": int(np.count_nonzero(values > value)) + 1,
+            "of": len(values),
+            "percentile": below / max(len(values) - 1, 1) * 100,
+        }
+
+    def quantiles(self, stat, q=(0.5,), season=None):
+        """League quantiles of `stat` at every game number (players who reached it)."""
+        matrix = self.matrices[stat]
+        if season is not None:
+            matrix = matrix[self.rows(season)]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # games nobody reached
+            return np.nanquantile(matrix, q, axis=0)
@@ -0,0 +1,79 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+import pace_matrix
+from charts import pace_figure
+
+
+@st.cache_resource
+def load_matrix(version):
+    # Mappé une fois par processus; `version` (le mtime) suit les rebuilds
+    return pace_matrix.PaceMatrix()
+
+
+@st.cache_resource(max_entries=256)
+def comparison_figure(version, _matrix, stat, rows, game_number, season):
+    # `_matrix` (non haché) est celle de `version`, qui fait partie de la clé
+    return pace_figure(_matrix, stat, list(rows), game_number, season)
+
+
+version = os.path.getmtime(pace_matrix.MATRIX_DIR)
+matrix = load_matrix(version)
+
+st.title("NHL – Comparaison du rythme entre joueurs")
+
+stat = st.selectbox("Statistique cumulative", matrix.stats)
+
+seasons = matrix.seasons()
+if not seasons:
+    st.info("Aucune saison dans la matrice: lancez python build_players_game_by_game.py")
+    st.stop()
+season = st.selectbox("Saison", seasons, index=len(seasons) - 1)
+
+# Jusqu'au dernier match joué cette saison (saison en cours incluse); pas de
+# curseur tant qu'un seul match a été joué (min == max)
+last_game = max(matrix.last_game(season), 1)
+if last_game < 2:
+    game_number = 1
+else:
+    game_number = st.slider("Après N matchs", 1, last_game, min(41, last_game))
+
+# Classement à ce match: une seule colonne de la matrice
+leaders = matrix.leaderboard(stat, game_number, season)
+st.subheader(f"Top 10 après {game_number} matchs ({season})")
+st.dataframe(leaders, hide_index=True)
+
+# Joueurs de la saison (playerId ajouté quand deux joueurs ont le même nom)
+rows = matrix.rows(season)
+names = pd.Series(matrix.name[rows])
+labels = names.where(~names.duplicated(keep=False), names + " (" + pd.Series(matrix.player_id[rows]).astype(str) + ")")
+options = dict(zip(labels, rows))
+players = st.multiselect(
+    "Joueurs à comparer",
+    sorted(options),
+    default=[label for label in labels if label in set(leaders["name"][:5])]
+)
+selected = [options[p] for p in players]
+
+fig = comparison_figure(version, matrix, stat, tuple(int(r) for r in selected), game_number, season)
+st.plotly_chart(fig, width="stretch")
+
+# Rang de chaque joueur à ce match, dans la saison et parmi toutes les saisons
+ranks = []
+for label, row in zip(players, selected):
+    player_id, player_season = matrix.player_id[row], matrix.season[row]
+    in_season = matrix.rank(stat, game_number, player_id, player_season, among_season=season)
+    overall = matrix.rank(stat, game_number, player_id, player_season)
+    if in_season is None:
+        continue
+    ranks.append({
+        "joueur": label,
+        stat: in_season["value"],
+        f"rang {season}": f"{in_season['rank']} / {in_season['of']}",
+        "rang toutes saisons": f"{overall['rank']} / {overall['of']}",
+        "percentile": round(overall["percentile"], 1),
+    })
+if ranks:
+    st.dataframe(pd.DataFrame(ranks), hide_index=True)
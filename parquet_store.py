@@ -0,0 +1,197 @@
+# parquet_store.py - Partitioned Parquet copy of players_game_by_game.csv
+#
+# The build writes the combined game-by-game table as a Parquet dataset
+# partitioned by season (optionally also by playerId). Rows are sorted by name
+# inside each partition and written in small row groups, so a filter on one
+# player only reads the row groups whose min/max name statistics match.
+import os
+import shutil
+from collections import Counter
+
+from cli import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+ds = lazy_import("pyarrow.dataset")
+pq = lazy_import("pyarrow.parquet")
+
+PARQUET_DIR = "players_game_by_game.parquet"
+
+# Small enough that one player's season usually spans one or two row groups
+ROW_GROUP_SIZE = 4096
+
+# Compact dtypes for the stored columns (name is dictionary-encoded)
+PARQUET_DTYPES = {
+    "playerId": "int32",
+    "name": "category",
+    "season": "int16",
+    "gameId": "int32",
+    "I_F_points": "float32",
+    "I_F_goals": "float32",
+    "plusMinus": "float32",
+    "gameNumber": "int16",
+    "cum_points": "float32",
+    "cum_goals": "float32",
+    "cum_plusMinus": "float32",
+}
+
+
+def _to_table(df, schema=None, names=None):
+    dtypes = dict(PARQUET_DTYPES)
+    if names is not None:
+        dtypes["name"] = pd.CategoricalDtype(names)
+    df = df.astype({c: t for c, t in dtypes.items() if c in df.columns})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is None:
+        # Fixed dictionary index type, whatever the number of names in this frame
+        i = table.schema.get_field_index("name")
+        if i >= 0:
+            table = table.cast(table.schema.set(i, pa.field("name", pa.dictionary(pa.int32(), pa.string()))))
+        return table
+    return table.cast(schema)
+
+
+def write_parquet(all_games, path=PARQUET_DIR, by_player=False):
+    """Write `all_games` as a season (and optionally playerId) partitioned dataset."""
+    write_parquet_chunks([all_games.sort_values(["season", "name", "gameDate"], kind="stable")],
+                         path, by_player)
+
+
+def write_parquet_chunks(chunks, path=PARQUET_DIR, by_player=False, names=None):
+    """
+    write_parquet() for a table given as consecutive frames in (season, name,
+    gameDate) order, without ever holding all of it: a partition's file is
+    closed as soon as the rows move past it. `names` (every name of the
+    table, sorted) is the dictionary of every chunk, as when the whole table
+    is written at once.
+    """
+    partitioning = ["season", "playerId"] if by_player else ["season"]
+    # Rows of one partition come in one block: its season or, by player, its
+    # season and name (a player seen under two names gets a second file)
+    block_columns = ["season", "name"] if by_player else ["season"]
+
+    # Write next to the target and swap, so readers never see a half-written dataset
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    schema = None
+    block, files, parts = None, {}, Counter()
+    for chunk in chunks:
+        table = _to_table(chunk, schema, names)
+        schema = schema or table.schema
+        starts = np.zeros(len(chunk), dtype=bool)
+        for column in block_columns:
+            values, previous = chunk[column], chunk[column].shift()
+            starts |= ~((values == previous) | (values.isna() & previous.isna())).to_numpy()
+        bounds = np.append(np.flatnonzero(starts), len(chunk))
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            key = tuple(chunk[column].iloc[a] for column in block_columns)
+            if a > 0 or not _same(key, block):
+                for file in files.values():
+                    file.close()
+                block, files = key, {}
+            rows = table.slice(a, b - a)
+            if not by_player:
+                groups = {(key[0],): rows}
+            else:
+                # Nearly always one player; several only when two share a name
+                player_ids = chunk["playerId"].to_numpy()[a:b]
+                groups = {(key[0], player_id): rows.take(np.flatnonzero(player_ids == player_id))
+                          for player_id in pd.unique(player_ids)}
+            for partition, rows in groups.items():
+                if partition not in files:
+                    folder = os.path.join(tmp, *(f"{c}={v}" for c, v in zip(partitioning, partition)))
+                    os.makedirs(folder, exist_ok=True)
+                    files[partition] = _PartitionFile(
+                        os.path.join(folder, f"part-{parts[partition]}.parquet"), partitioning, schema)
+                    parts[partition] += 1
+                files[partition].write(rows)
+    for file in files.values():
+        file.close()
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+
+def update_seasons(all_games, seasons, path=PARQUET_DIR, by_player=False):
+    """
+    Rewrite only the partitions of `seasons` from `all_games` (the whole
+    table), the others are left as they are. A season without rows anymore
+    loses its partition.
+    """
+    rows = all_games[all_games["season"].isin(list(seasons))]
+    # Same name dictionary as when the whole table is written
+    names = sorted(all_games["name"].dropna().unique())
+    staging = path + ".update"
+    write_parquet_chunks([rows.sort_values(["season", "name", "gameDate"], kind="stable")],
+                         staging, by_player, names=names)
+    for season in seasons:
+        folder = f"season={season}"
+        shutil.rmtree(os.path.join(path, folder), ignore_errors=True)
+        if os.path.exists(os.path.join(staging, folder)):
+            os.replace(os.path.join(staging, folder), os.path.join(path, folder))
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+def _same(a, b):
+    """Tuple equality where missing values (a missing name) are equal."""
+    return b is not None and all(x == y or pd.isna(x) and pd.isna(y) for x, y in zip(a, b))
+
+
+class _PartitionFile:
+    """One file of a partition, written in row groups of exactly ROW_GROUP_SIZE rows (but the last)."""
+
+    def __init__(self, path, partitioning, schema):
+        self.partitioning = partitioning
+        for column in partitioning:
+            schema = schema.remove(schema.get_field_index(column))
+        self.writer = pq.ParquetWriter(path, schema)
+        self.pending, self.rows = [], 0
+
+    def write(self, table):
+        self.pending.append(table.drop_columns(self.partitioning))
+        self.rows += len(table)
+        if self.rows >= ROW_GROUP_SIZE:
+            table = pa.concat_tables(self.pending)
+            full = self.rows - self.rows % ROW_GROUP_SIZE
+            self.writer.write_table(table.slice(0, full), row_group_size=ROW_GROUP_SIZE)
+            self.pending, self.rows = [table.slice(full)], self.rows - full
+
+    def close(self):
+        if self.rows:
+            self.writer.write_table(pa.concat_tables(self.pending), row_group_size=ROW_GROUP_SIZE)
+        self.writer.close()
+
+
+def _dataset(path):
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def read_games(path=PARQUET_DIR, columns=None, name=None, seasons=None, player_id=None):
+    """
+    Read the game-by-game table, keeping only `columns`, and only the rows of
+    player `name` / `player_id` and/or `seasons` when given. Season (and, with
+    by_player, playerId) filters prune partitions, name filters prune row groups.
+    """
+    dataset = _dataset(path)
+    filters = []
+    if name is not None:
+        filters.append(ds.field("name") == name)
+    if player_id is not None:
+        filters.append(ds.field("playerId") == int(player_id))
+    if seasons is not None:
+        filters.append(ds.field("season").isin([int(s) for s in seasons]))
+
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas()
+    sort = [c for c in ["name", "season", "gameNumber"] if c in df.columns]
+    return df.sort_values(sort, kind="stable", ignore_index=True) if sort else df
+
+
+def player_names(path=PARQUET_DIR):
+    """Sorted list of every player name, reading only the name column."""
+    names = _dataset(path).to_table(columns=["name"]).column("name").unique()
+    return sorted(pd.Series(names.to_pylist()).dropna().astype(str).unique())
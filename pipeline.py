@@ -0,0 +1,214 @@
+# pipeline.py - In-process dependency graph runner for the update pipeline
+#
+# Stages are Python callables run in one process: a stage receives the
+# values returned by the stages it depends on (DataFrames, stats...) instead
+# of re-reading their CSV output, and stages whose dependencies are done run
+# concurrently on a thread pool (e.g. the season file from data/ while the
+# game-by-game build reads data_gbg/).
+#
+# A stage with `inputs` is skipped when the fingerprint of those files (path,
+# size, mtime) and of its upstream stages is the one recorded after its last
+# successful run, and its `outputs` still exist. A skipped stage's value is
+# only loaded (`load`) if a stage that does run needs it.
+#
+#     stages = [Stage("build", build, inputs=lambda: glob.glob("data_gbg/*.csv")),
+#               Stage("export", lambda r: export(r["build"]), after=["build"])]
+#     Pipeline(stages).run()
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+STATE_FILE = os.path.join(".build_cache", "pipeline.json")
+
+
+class Stage:
+    """
+    One node of the graph. run(results) gets {stage name: value} of the
+    stages listed in `after` and returns this stage's value.
+    inputs: callable returning the files the stage reads (None: always runs)
+    outputs: paths that must exist for the stage to be skipped
+    load: callable returning the value of a skipped stage from its outputs
+    """
+
+    def __init__(self, name, run, after=(), inputs=None, outputs=(), load=None, signature=""):
+        self.name = name
+        self.run = run
+        self.after = list(after)
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.load = load
+        self.signature = signature
+
+
+def fingerprint(paths, extra=()):
+    """sha1 of (path, size, mtime) for every path that exists, plus `extra` strings."""
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    for value in extra:
+        digest.update(f"{value}\n".encode())
+    return digest.hexdigest()
+
+
+class Results(dict):
+    """Stage values; a skipped stage's value is loaded on first access."""
+
+    def __init__(self, stages):
+        super().__init__()
+        self._stages = stages
+        self._lock = threading.Lock()
+
+    def __missing__(self, name):
+        with self._lock:
+            if name not in self:
+                stage = self._stages[name]
+                self[name] = stage.load() if stage.load else None
+            return dict.__getitem__(self, name)
+
+
+class Pipeline:
+    def __init__(self, stages, state_file=STATE_FILE, report=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.report = report
+        for stage in stages:
+            unknown = [name for name in stage.after if name not in self.stages]
+            if unknown:
+                raise ValueError(f"{stage.name}: unknown dependencies {unknown}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        done, visiting = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for upstream in self.stages[name].after:
+                visit(upstream)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    # --- State ---
+
+    def _load_state(self):
+        try:
+            with open(self.state_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_file)
+
+    def _fingerprint(self, stage, fingerprints):
+        """The stage's fingerprint, or None if it always runs."""
+        if stage.inputs is None:
+            return None
+        upstream = [f"{name}={fingerprints.get(name)}" for name in stage.after]
+        return fingerprint(stage.inputs(), [stage.signature] + upstream)
+
+    # --- Run ---
+
+    def run(self, jobs=2, force=(), only=None):
+        """
+        Run every stage (or `only` these names and what they need), at most
+        `jobs` at a time. Stages in `force` (or all with force=True) run even
+        if unchanged. Returns {stage name: "ran" | "skipped" | "failed" |
+        "cancelled"}; the first failure is re-raised once running stages end.
+        """
+        wanted = self._needed(only) if only else set(self.stages)
+        force = set(self.stages) if force is True else set(force or ())
+        state = self._load_state()
+        fingerprints = {}
+        status = {}
+        results = Results(self.stages)
+        error = None
+
+        def execute(stage):
+            print(f"\n▶️  {stage.name}")
+            start = time.perf_counter()
+            value = stage.run(results)
+            return value, time.perf_counter() - start
+
+        pending = {name for name in self.stages if name in wanted}
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            while pending or running:
+                ready = [name for name in sorted(pending)
+                         if all(status.get(u) in ("ran", "skipped") or u not in wanted
+                                for u in self.stages[name].after)]
+                for name in ready if error is None else []:
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    fingerprints[name] = self._fingerprint(stage, fingerprints)
+                    if (name not in force and fingerprints[name] is not None
+                            and state.get(name) == fingerprints[name]
+                            and all(os.path.exists(p) for p in stage.outputs)):
+                        status[name] = "skipped"
+                        print(f"\n⏭️  {name}: unchanged, skipped")
+                        self._record(name, "skipped", 0.0, fingerprints[name])
+                        continue
+                    running[pool.submit(execute, stage)] = name
+                if not running:
+                    if ready and error is None:
+                        continue  # skipped stages may have unblocked others
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        value, seconds = future.result()
+                    except BaseException as e:  # SystemExit from a script's exit(1) too
+                        status[name] = "failed"
+                        self._record(name, "failed", None, fingerprints[name], error=repr(e))
+                        print(f"\n❌ {name} failed: {e!r}")
+                        error = error or e
+                        continue
+                    results[name] = value
+                    status[name] = "ran"
+                    self._record(name, "ran", seconds, fingerprints[name])
+                    print(f"\n✅ {name} done in {seconds:.1f}s")
+                    if fingerprints[name] is not None:
+                        state[name] = fingerprints[name]
+                        self._save_state(state)
+
+        for name in sorted(pending):
+            status[name] = "cancelled"
+            self._record(name, "cancelled", None, None)
+        if error is not None:
+            raise error
+        return status
+
+    def _needed(self, names):
+        needed = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].after)
+        return needed
+
+    def _record(self, name, status, seconds, fingerprint, **extra):
+        if self.report is not None:
+            self.report.add("pipeline", stage=name, status=status,
+                            wall_s=None if seconds is None else round(seconds, 4),
+                            fingerprint=fingerprint, **extra)
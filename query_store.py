@@ -0,0 +1,155 @@
+# query_store.py - Indexed SQLite copy of the game-by-game table and its query API
+#
+# The build loads players_game_by_game into a local SQLite file with indexes
+# on (name), (playerId, season) and (season, gameNumber). The functions below
+# answer "this player, these seasons, this stat" style questions by reading
+# only the matching rows instead of loading the whole league.
+import os
+import sqlite3
+
+from cli import lazy_import
+
+pd = lazy_import("pandas")
+
+DB_FILE = "players_game_by_game.sqlite"
+TABLE = "games"
+
+INDEXES = {
+    "idx_games_name": ["name"],
+    "idx_games_player_season": ["playerId", "season"],
+    "idx_games_season_game": ["season", "gameNumber"],
+}
+
+# Per-game and cumulative stats that can be queried (also guards the SQL)
+GAME_STATS = ["I_F_points", "I_F_goals", "plusMinus"]
+CUMULATIVE_STATS = ["cum_points", "cum_goals", "cum_plusMinus"]
+
+SERIES_DTYPES = {"season": "int16", "gameNumber": "int16"}
+
+
+def write_sqlite(all_games, path=DB_FILE):
+    """(Re)create the database from the combined game-by-game frame."""
+    writer = SqliteWriter(path)
+    writer.append(all_games)
+    writer.close()
+
+
+def update_players(all_games, player_ids, path=DB_FILE):
+    """
+    Replace the rows of `player_ids` with theirs in `all_games` (the whole
+    table), in one transaction: the other players' rows are not rewritten.
+    """
+    player_ids = [int(p) for p in player_ids]
+    con = sqlite3.connect(path)
+    try:
+        con.execute(f"DELETE FROM {TABLE} WHERE playerId IN ({_placeholders(player_ids)})", player_ids)
+        # to_sql() commits the deletion along with the new rows
+        _append(con, all_games[all_games["playerId"].isin(player_ids)])
+        con.commit()
+    finally:
+        con.close()
+
+
+def _append(con, df):
+    df = df.astype({"name": str}).copy()
+    df["gameDate"] = df["gameDate"].dt.strftime("%Y-%m-%d")
+    df.to_sql(TABLE, con, index=False, chunksize=50_000, if_exists="append")
+
+
+class SqliteWriter:
+    """write_sqlite() one chunk at a time: append() consecutive frames of the table, then close()."""
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.tmp = path + ".tmp"
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+        self.con = sqlite3.connect(self.tmp)
+
+    def append(self, df):
+        _append(self.con, df)
+
+    def close(self):
+        """Index the table and move the database into place."""
+        with self.con:
+            for name, columns in INDEXES.items():
+                self.con.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(columns)})")
+            self.con.execute("ANALYZE")
+        self.con.close()
+        os.replace(self.tmp, self.path)
+
+
+def connect(path=DB_FILE):
+    """Read-only connection to the database."""
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True,
+                           check_same_thread=False)
+
+
+def _check_stat(stat, allowed):
+    if stat not in allowed:
+        raise ValueError(f"Unknown stat {stat!r}, expected one of {allowed}")
+
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+
+def player_names(con):
+    """Sorted list of every player name."""
+    return [row[0] for row in con.execute(f"SELECT DISTINCT name FROM {TABLE} ORDER BY name")]
+
+
+def player_seasons(con, name):
+    """Seasons played by `name`, in order."""
+    rows = con.execute(f"SELECT DISTINCT season FROM {TABLE} WHERE name = ? ORDER BY season", (name,))
+    return [row[0] for row in rows]
+
+
+def player_series(con, name, stat="cum_points", seasons=None):
+    """
+    Game-by-game series of `stat` for player `name`: columns season,
+    gameNumber, <stat>, ordered by season then game. All seasons when
+    `seasons` is None.
+    """
+    _check_stat(stat, GAME_STATS + CUMULATIVE_STATS)
+    sql = f"SELECT season, gameNumber, {stat} FROM {TABLE} WHERE name = ?"
+    params = [name]
+    if seasons is not None:
+        seasons = [int(s) for s in seasons]
+        sql += f" AND season IN ({_placeholders(seasons)})"
+        params += seasons
+    sql += " ORDER BY season, gameNumber"
+    df = pd.read_sql_query(sql, con, params=params)
+    return df.astype({**SERIES_DTYPES, stat: "float32"})
+
+
+def season_totals(con, name=None, player_id=None):
+    """
+    One row per season of a player (by `name` or `player_id`): games played
+    and the season total of every per-game stat.
+    """
+    if (name is None) == (player_id is None):
+        raise ValueError("Give exactly one of name or player_id")
+    column, value = ("name", name) if name is not None else ("playerId", int(player_id))
+    sums = ", ".join(f"SUM({stat}) AS {stat}" for stat in GAME_STATS)
+    df = pd.read_sql_query(
+        f"SELECT playerId, name, season, COUNT(*) AS games, {sums} FROM {TABLE} "
+        f"WHERE {column} = ? GROUP BY playerId, name, season ORDER BY season",
+        con, params=[value],
+    )
+    return df.astype({"playerId": "int32", "season": "int16", "games": "int16",
+                      **{stat: "float32" for stat in GAME_STATS}})
+
+
+def leaderboard(con, season, game_number, stat="cum_points", limit=10):
+    """
+    Top `limit` players by cumulative `stat` after `game_number` games of
+    `season` (players who reached that game): columns name, playerId, <stat>.
+    """
+    _check_stat(stat, CUMULATIVE_STATS)
+    df = pd.read_sql_query(
+        f"SELECT name, playerId, {stat} FROM {TABLE} "
+        f"WHERE season = ? AND gameNumber = ? ORDER BY {stat} DESC, name LIMIT ?",
+        con, params=[int(season), int(game_number), int(limit)],
+    )
+    return df.astype({"playerId": "int32", stat: "float32"})
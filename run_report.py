@@ -0,0 +1,326 @@
+# run_report.py - Per-stage metrics and run reports for the update pipeline
+#
+# A RunReport records, for every stage of a run (and every file when asked):
+# wall time, CPU time (this process plus its finished children, e.g. a
+# worker pool), rows / bytes processed and peak RSS, plus counters such as
+# download outcomes and retries. write() saves it as JSON lines in
+# .run_reports/: one line per stage and per file, then a "run" summary.
+#
+#     report = RunReport("build")
+#     with report.stage("transform") as stage:
+#         ...
+#         stage.add(rows=len(df), bytes=size)
+#     report.count("download.success")
+#     report.write()
+#
+# Per-stage peak RSS resets the process high-water mark at each stage, so it
+# only means something when stages run one at a time: with stage_peaks=False
+# (stages on several threads) only the run's peak is reported.
+# With a profile_dir each stage also runs under cProfile (<run>-<stage>.prof,
+# open with snakeviz or pstats) or pyinstrument (<run>-<stage>.html).
+# Progress is the console side: one self-overwriting line instead of a line
+# per file.
+import cProfile
+import ctypes
+import gc
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_DIR = ".run_reports"
+PROFILERS = ["cprofile", "pyinstrument"]
+
+
+def _cpu_seconds():
+    # Children only count once they have been waited for (pool shut down)
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _reset_peak_rss():
+    # Linux: writing 5 to clear_refs resets the high-water mark (VmHWM) to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    """Peak RSS of this process, since the last reset when the OS allows one."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    return _maxrss_mb(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def rss_mb():
+    """Current RSS of this process (Linux only, None elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def release_memory():
+    """
+    Hand memory freed since (pandas / numpy through glibc malloc, pyarrow's
+    pool) back to the OS, so the RSS follows what is actually in use.
+    """
+    gc.collect()
+    if "pyarrow" in sys.modules:
+        sys.modules["pyarrow"].default_memory_pool().release_unused()
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (OSError, AttributeError):  # not glibc
+        pass
+
+
+def children_peak_rss_mb():
+    """Largest peak RSS among the finished child processes (a worker pool...)."""
+    if resource is None:
+        return None
+    return _maxrss_mb(resource.getrusage(resource.RUSAGE_CHILDREN))
+
+
+def _maxrss_mb(usage):
+    # KB on Linux, bytes on macOS
+    return usage.ru_maxrss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def path_size(path):
+    """Size in bytes of a file, or of every file under a folder (0 when missing)."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+class Stage:
+    """What a stage processed, filled in by the code inside `with report.stage(...)`."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.bytes = 0
+        self.extra = {}
+
+    def add(self, rows=0, bytes=0, **extra):
+        self.rows += rows
+        self.bytes += bytes
+        self.extra.update(extra)
+
+
+def _stamp():
+    """Date and time to the microsecond, and the PID: one report file per run, even within a second."""
+    now = time.time()
+    micro = int(now % 1 * 1e6)
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{micro:06d}-{os.getpid()}"
+
+
+class RunReport:
+    """Stage, file and counter records of one run, written as JSON lines."""
+
+    def __init__(self, name, path=None, profile_dir=None, profiler="cprofile", stage_peaks=True):
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}")
+        if profile_dir and profiler == "pyinstrument" and importlib.util.find_spec("pyinstrument") is None:
+            raise ImportError("pyinstrument is not installed (pip install pyinstrument)")
+        self.name = name
+        self.started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.path = path or os.path.join(REPORT_DIR, f"{name}-{_stamp()}.jsonl")
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+        self.stage_peaks = stage_peaks
+        self.records = []
+        self.counters = {}
+        self._wall = time.perf_counter()
+        self._cpu = _cpu_seconds()
+
+    # --- Recording ---
+
+    @contextmanager
+    def stage(self, name):
+        """Time the block as stage `name`; yields a Stage to add rows / bytes to."""
+        stage = Stage(name)
+        if self.stage_peaks:
+            _reset_peak_rss()
+        profiler = self._start_profiler()
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        status = "ok"
+        try:
+            yield stage
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            record = {
+                "type": "stage",
+                "run": self.name,
+                "stage": name,
+                "status": status,
+                "wall_s": round(time.perf_counter() - wall, 4),
+                "cpu_s": round(_cpu_seconds() - cpu, 4),
+                "rows": stage.rows,
+                "bytes": stage.bytes,
+                "peak_rss_mb": _round(peak_rss_mb()) if self.stage_peaks else None,
+                **stage.extra,
+            }
+            self._stop_profiler(profiler, name)
+            self.records.append(record)
+
+    def file(self, stage, path, wall_s, cpu_s=None, rows=None, bytes=None, status="ok", **extra):
+        """Record one file (or player) handled by `stage`."""
+        record = {"type": "file", "run": self.name, "stage": stage, "file": str(path),
+                  "status": status, "wall_s": round(wall_s, 4)}
+        if cpu_s is not None:
+            record["cpu_s"] = round(cpu_s, 4)
+        if rows is not None:
+            record["rows"] = rows
+        if bytes is not None:
+            record["bytes"] = bytes
+        record.update(extra)
+        self.records.append(record)
+
+    def add(self, record_type, **fields):
+        """Record anything else, e.g. the outcome of each pipeline stage."""
+        self.records.append({"type": record_type, "run": self.name, **fields})
+
+    def count(self, key, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    # --- Output ---
+
+    def summary(self):
+        """The "run" record: totals, counters and the wall time of every stage."""
+        stages = [r for r in self.records if r["type"] == "stage"]
+        # Without resets, the high-water mark is the run's own peak
+        peaks = [r["peak_rss_mb"] for r in stages] if self.stage_peaks else [peak_rss_mb()]
+        return {
+            "type": "run",
+            "run": self.name,
+            "started": self.started,
+            "wall_s": round(time.perf_counter() - self._wall, 4),
+            "cpu_s": round(_cpu_seconds() - self._cpu, 4),
+            "peak_rss_mb": _round(max((peak or 0 for peak in peaks), default=None)),
+            "stages": {r["stage"]: r["wall_s"] for r in stages},
+            "files": sum(r["type"] == "file" for r in self.records),
+            "counters": self.counters,
+        }
+
+    def write(self):
+        """Write the records and the summary to self.path. Returns the path."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as f:
+            for record in self.records + [self.summary()]:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return self.path
+
+    # --- Profiling ---
+
+    def _start_profiler(self):
+        if not self.profile_dir:
+            return None
+        if self.profiler == "pyinstrument":
+            from pyinstrument import Profiler  # optional dependency
+            profiler = Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler, stage):
+        if profiler is None:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, f"{self.name}-{stage}")
+        if self.profiler == "pyinstrument":
+            profiler.stop()
+            with open(base + ".html", "w") as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            profiler.dump_stats(base + ".prof")
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def add_arguments(parser):
+    """The --report / --profile / --profiler / --verbose options shared by the pipeline scripts."""
+    parser.add_argument("--report", default=None,
+                        help=f"Run report file (JSON lines, default: {REPORT_DIR}/<script>-<date>.jsonl)")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="Profile every stage into DIR (one file per stage)")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile",
+                        help="Profiler used with --profile (default: cprofile)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="One line per file instead of a progress bar")
+
+
+def from_args(name, args, stage_peaks=True):
+    """A RunReport configured by the options of add_arguments()."""
+    return RunReport(name, path=args.report, profile_dir=args.profile, profiler=args.profiler,
+                     stage_peaks=stage_peaks)
+
+
+class Progress:
+    """
+    One self-overwriting console line: "label [#####     ] 120/1500 8%".
+    Drawn at most 10 times a second, only on a terminal unless `enabled`.
+    """
+
+    def __init__(self, total, label="", enabled=None, stream=None):
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty() if enabled is None else enabled
+        self.total = total
+        self.label = label
+        self.done = 0
+        self._start = time.perf_counter()
+        self._drawn = 0.0
+
+    def update(self, n=1, note=""):
+        self.done += n
+        now = time.perf_counter()
+        if self.enabled and (now - self._drawn >= 0.1 or self.done >= self.total):
+            self._drawn = now
+            self._draw(note)
+
+    def _draw(self, note):
+        share = self.done / self.total if self.total else 1.0
+        bar = "#" * int(share * 30)
+        rate = self.done / max(time.perf_counter() - self._start, 1e-9)
+        self.stream.write(f"\r{self.label} [{bar:<30}] {self.done}/{self.total} "
+                          f"{share:4.0%} {rate:6.1f}/s {note[:30]:<30}")
+        self.stream.flush()
+
+    def close(self):
+        if self.enabled and self.done:
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
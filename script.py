@@ -1,40 +1,73 @@
+import os
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-df = pd.read_csv("players_game_by_game.csv")
+import array_store
+from analytics import analytics_columns
+from cumulative import METRICS, SITUATIONS
+from charts import cumulative_figure
+
+
+@st.cache_resource
+def load_snapshot(version):
+    # Joueurs, saisons et colonnes (un petit JSON écrit avec le store): les
+    # sélecteurs s'affichent avant que numpy, le store ou plotly ne soient chargés
+    return array_store.load_snapshot()
+
+
+@st.cache_resource
+def load_index(version):
+    # Opened once per server process (memory-mapped: nothing is read up front,
+    # and every Streamlit process shares the same pages); `version` (the
+    # store's mtime) makes a rebuild invalidate it
+    return array_store.ArrayStore()
+
+
+@st.cache_resource(max_entries=256)
+def player_figure(version, _index, player, stat, seasons):
+    # Une figure par (version du store, joueur, stat, saisons): un rerun avec
+    # la même sélection ne reconstruit ni ne sous-échantillonne rien. Le store
+    # (_index, non haché) est celui de `version`: un rebuild change la clé
+    return cumulative_figure(_index, player, stat, seasons)
+
+
+version = os.path.getmtime(array_store.ARRAY_DIR)
+snapshot = load_snapshot(version)
+columns = set(snapshot["columns"])
 
 st.title("NHL – Cumulative Game-by-Game Comparison")
 
 player = st.selectbox(
     "Choisir un joueur",
-    sorted(df["name"].unique())
+    snapshot["players"]
 )
 
-stat = st.selectbox(
-    "Statistique cumulative",
-    ["cum_points", "cum_goals", "cum_plusMinus"]
+# "all" = les colonnes principales; les autres situations n'ont que les totaux cumulatifs
+situation = st.selectbox(
+    "Situation",
+    ["all"] + [s for s in SITUATIONS if f"cum_points_{s}" in columns]
 )
 
-# Filtrer pour un seul joueur
-player_df = df[df["name"] == player]
+# Totaux cumulatifs, puis rythme sur N matchs, projections sur 82 matchs et séquences
+cumulative_stats = [target for _, target in METRICS]
+if situation == "all":
+    stat = st.selectbox(
+        "Statistique",
+        cumulative_stats + [c for c in analytics_columns() if c in columns]
+    )
+else:
+    stat = st.selectbox("Statistique", [f"{c}_{situation}" for c in cumulative_stats])
 
 # Choisir les saisons à superposer
+player_seasons = snapshot["seasons"][player]
 seasons = st.multiselect(
     "Choisir les saisons à comparer",
-    sorted(player_df["season"].unique()),
-    default=sorted(player_df["season"].unique())
+    player_seasons,
+    default=player_seasons
 )
 
-filtered = player_df[player_df["season"].isin(seasons)]
-
-fig = px.line(
-    filtered,
-    x="gameNumber",
-    y=stat,
-    color="season",
-    markers=True,
-    title=f"{player} – {stat} (comparaison par saison)"
-)
+# Vues sur les fichiers mappés, pas de scan de toute la ligue
+index = load_index(version)
+fig = player_figure(version, index, player, stat, tuple(sorted(seasons)))
 
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+st.plotly_chart(fig, width="stretch")
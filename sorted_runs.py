@@ -0,0 +1,111 @@
+# sorted_runs.py - Sorted runs on disk and their k-way merge, for builds larger than memory
+#
+# A run is a DataFrame already sorted on some key, saved as an Arrow IPC file
+# in record batches of at most BATCH_ROWS rows. merge() reads the runs a few
+# batches at a time and yields all their rows in key order, chunk by chunk, so
+# memory holds about `buffer_rows` rows whatever the total size. Keys are int64
+# arrays computed by the caller (see build_players_game_by_game.py); ties
+# keep the order of the runs, then of the rows within a run, so merging the
+# runs cut from a frame in order gives exactly that frame's stable sort.
+#
+#     write_run(batch.sort_values(["name", "season"], kind="stable"), "runs/0.arrow")
+#     for chunk in merge(["runs/0.arrow", "runs/1.arrow"], key=my_key):
+#         chunk.to_csv(f, header=False)
+from cli import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+# Rows per record batch: the unit merge() reads runs in
+BATCH_ROWS = 8192
+
+
+def write_run(df, path, batch_rows=BATCH_ROWS):
+    """Save a sorted frame as a run (Arrow IPC file, `batch_rows` rows per batch)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=batch_rows)
+    return len(df)
+
+
+class _Run:
+    """One run being merged: its reader, the rows loaded and not emitted yet, and their keys."""
+
+    def __init__(self, path, key):
+        self.file = pa.OSFile(path, "rb")
+        self.reader = pa.ipc.open_file(self.file)
+        self.key = key
+        self.next_batch = 0
+        self.rows = None
+        self.keys = np.empty(0, dtype="int64")
+
+    @property
+    def exhausted(self):
+        return self.next_batch >= self.reader.num_record_batches
+
+    def load(self, rows):
+        """
+        Append record batches to the loaded rows, about `rows` more: at least
+        one row unless the run is exhausted (empty batches are skipped over).
+        """
+        batches, loaded = [], 0
+        while not self.exhausted and (not loaded or loaded < rows):
+            batches.append(self.reader.get_batch(self.next_batch))
+            loaded += batches[-1].num_rows
+            self.next_batch += 1
+        if not batches:
+            return
+        df = pa.Table.from_batches(batches).to_pandas()
+        keys = np.asarray(self.key(df), dtype="int64")
+        self.rows = df if self.rows is None or not len(self.rows) else pd.concat([self.rows, df], ignore_index=True)
+        self.keys = np.concatenate([self.keys, keys])
+
+    def take(self, n):
+        """Remove and return the first `n` loaded rows and their keys."""
+        rows, keys = self.rows.iloc[:n], self.keys[:n]
+        self.rows, self.keys = self.rows.iloc[n:].reset_index(drop=True), self.keys[n:]
+        return rows, keys
+
+    def close(self):
+        self.file.close()
+
+
+def merge(paths, key, buffer_rows=1_000_000):
+    """
+    Yield the rows of the runs at `paths` as DataFrames in key(df) order.
+    About `buffer_rows` rows are loaded at a time, split between the runs.
+    """
+    runs = [_Run(path, key) for path in paths]
+    rows = max(1, buffer_rows // max(1, len(runs)))
+    try:
+        for run in runs:
+            run.load(rows)
+
+        while any(len(run.keys) for run in runs) or not all(run.exhausted for run in runs):
+            # Every row below the smallest last-loaded key of the runs that have
+            # more to read is final: nothing still on disk can come before it.
+            # (load() leaves rows loaded in every run that has more to read, so
+            # each has a last key, even after empty batches or zero-row runs)
+            pending = [run for run in runs if not run.exhausted]
+            bound = min(run.keys[-1] for run in pending) if pending else None
+            counts = [len(run.keys) if bound is None else int(np.searchsorted(run.keys, bound))
+                      for run in runs]
+            if not sum(counts):
+                # The loaded rows all share the bound: read further in the runs that stop there
+                for run in pending:
+                    if run.keys[-1] == bound:
+                        run.load(rows)
+                continue
+
+            parts = [run.take(n) for run, n in zip(runs, counts) if n]
+            keys = np.concatenate([k for _, k in parts])
+            chunk = pd.concat([rows for rows, _ in parts], ignore_index=True)
+            yield chunk.take(np.argsort(keys, kind="stable")).reset_index(drop=True)
+
+            for run in runs:
+                if not len(run.keys) and not run.exhausted:
+                    run.load(rows)
+    finally:
+        for run in runs:
+            run.close()
@@ -0,0 +1,96 @@
+# test_build.py - Builds that must give the same output as a serial, full one
+# Usage (from the project root): python -m pytest tests
+#
+# A small synthetic league (benchmarks/generate_moneypuck.py) is built in a
+# temporary folder: with a worker pool, or incrementally after a career
+# changed, the CSV and the array store must be byte-identical to the ones of
+# a single process building everything. A build with nothing to do must not
+# rewrite anything.
+import filecmp
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import array_store
+import build_players_game_by_game as gbg
+import generate_moneypuck
+import run_report
+
+PLAYERS = 40
+SEASONS = 3
+
+
+def _same_folders(a, b):
+    names = sorted(os.listdir(a))
+    return names == sorted(os.listdir(b)) and not filecmp.cmpfiles(a, b, names, shallow=False)[1]
+
+
+def _keep(suffix):
+    """Move the outputs of the last build aside, as <output>.<suffix>."""
+    shutil.move(gbg.OUTPUT_FILE, f"{gbg.OUTPUT_FILE}.{suffix}")
+    shutil.move(array_store.ARRAY_DIR, f"{array_store.ARRAY_DIR}.{suffix}")
+
+
+def _same_as(suffix):
+    return (filecmp.cmp(gbg.OUTPUT_FILE, f"{gbg.OUTPUT_FILE}.{suffix}", shallow=False)
+            and _same_folders(array_store.ARRAY_DIR, f"{array_store.ARRAY_DIR}.{suffix}"))
+
+
+def _edit_career(path):
+    """One more goal (and point) in the last game of the career at `path`."""
+    career = pd.read_csv(path)
+    last = career.index[(career["situation"] == "all") & (career["gameId"] == career["gameId"].max())]
+    career.loc[last, ["I_F_goals", "I_F_points"]] += 1
+    career.to_csv(path, index=False)
+
+
+def _mtimes(folder="."):
+    return {os.path.join(root, name): os.stat(os.path.join(root, name)).st_mtime_ns
+            for root, _, names in os.walk(folder) for name in names}
+
+
+def test_workers_build_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_moneypuck.generate("data_gbg", PLAYERS, SEASONS, seed=1)
+
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    _keep("serial")
+    gbg.run(workers=2, full=True, report=run_report.RunReport("test"))
+
+    assert _same_as("serial")
+
+
+def test_incremental_build_matches_full(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_moneypuck.generate("data_gbg", PLAYERS, SEASONS, seed=1)
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    shutil.copy(gbg.OUTPUT_FILE, f"{gbg.OUTPUT_FILE}.before")
+
+    files, _, _ = gbg.careers()
+    _edit_career(files[0])
+    report = run_report.RunReport("test")
+    gbg.run(report=report)
+    assert report.counters["build.cached"] == PLAYERS - 1
+    assert not filecmp.cmp(gbg.OUTPUT_FILE, f"{gbg.OUTPUT_FILE}.before", shallow=False)
+    _keep("incremental")
+
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    assert _same_as("incremental")
+
+
+def test_build_with_nothing_to_do_rewrites_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_moneypuck.generate("data_gbg", PLAYERS, SEASONS, seed=1)
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    before = _mtimes()
+
+    report = run_report.RunReport("test")
+    assert gbg.run(report=report) is None
+    assert report.counters == {"build.up_to_date": 1}
+    assert _mtimes() == before
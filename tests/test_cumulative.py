@@ -0,0 +1,47 @@
+# test_cumulative.py - The single-pass running totals against a per-player groupby
+# Usage (from the project root): python -m pytest tests
+#
+# Fractional stats (expected goals, time on ice...) must get the same running
+# totals as a groupby cumsum restarted at each (playerId, season), including
+# late in a long frame where a whole-frame total would have drifted.
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cumulative
+
+METRICS = [("xGoals", "cum_xGoals"), ("I_F_goals", "cum_goals")]
+
+
+def _games(players=200, seasons=5, games=82, seed=1):
+    rng = np.random.default_rng(seed)
+    keys = pd.MultiIndex.from_product(
+        [range(players), range(2010, 2010 + seasons), range(games)], names=["playerId", "season", "game"]
+    ).to_frame(index=False)
+    keys["xGoals"] = rng.exponential(0.3, len(keys)) * 1e3 ** rng.integers(0, 2, len(keys))
+    keys["I_F_goals"] = rng.integers(0, 3, len(keys)).astype("float64")
+    return keys.drop(columns="game")
+
+
+def test_running_totals_match_a_groupby_cumsum():
+    df = _games()
+    result = cumulative.add_cumulative(df, METRICS)
+
+    grouped = df.groupby(cumulative.SEGMENT_KEYS, sort=False)
+    assert (result["gameNumber"] == grouped.cumcount() + 1).all()
+    for source, target in METRICS:
+        expected = grouped[source].cumsum()
+        assert np.allclose(result[target], expected, rtol=1e-12, atol=1e-9)
+    # Integer-valued stats stay exact
+    assert result["cum_goals"].equals(grouped["I_F_goals"].cumsum().rename("cum_goals"))
+
+
+def test_empty_frame():
+    df = _games().iloc[:0]
+    result = cumulative.add_cumulative(df, METRICS)
+    assert len(result) == 0 and "cum_xGoals" in result
@@ -0,0 +1,149 @@
+# test_fetch.py - Downloads through moneypuck_fetch.py against a stubbed session
+# Usage (from the project root): python -m pytest tests
+#
+# No network: the Downloader's requests.Session is replaced by a stub that
+# answers from a table and records the requests it got, and stream_to_file()
+# is fed stub responses whose bodies are cut short, not CSV, or dropped.
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import moneypuck_fetch
+
+URL = "https://moneypuck.test/careers/8478402.csv"
+ETAG = '"v1"'
+CAREER = (",".join(moneypuck_fetch.CAREER_COLUMNS) + "\n"
+          + "\n".join(",".join(["1"] * len(moneypuck_fetch.CAREER_COLUMNS)) for _ in range(3))
+          + "\n").encode()
+
+
+class StubResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+        self.read = False
+
+    def iter_content(self, chunk_size=1):
+        self.read = True
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    @property
+    def content(self):
+        self.read = True
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise moneypuck_fetch.requests.exceptions.HTTPError(self.status_code)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StubSession:
+    """200 with the body and its ETag, or 304 when the request has that ETag."""
+
+    def __init__(self, body, etag=ETAG):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+        self.responses = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response = StubResponse(304)
+        else:
+            response = StubResponse(200, self.body, {"ETag": self.etag})
+        self.responses.append(response)
+        return response
+
+    def close(self):
+        pass
+
+
+def _downloader(session):
+    downloader = moneypuck_fetch.Downloader(concurrency=1, rate=0, retries=0)
+    downloader.session = session
+    return downloader
+
+
+def test_not_modified_serves_the_cached_body(tmp_path):
+    path = tmp_path / "8478402.csv"
+    session = StubSession(CAREER)
+    downloader = _downloader(session)
+    cache = moneypuck_fetch.ResponseCache(tmp_path / "cache")
+
+    assert moneypuck_fetch.fetch_to_file(URL, path, downloader, cache, moneypuck_fetch.CAREER_COLUMNS) == "success"
+    assert path.read_bytes() == CAREER
+    received = downloader.bytes_received
+    mtime = os.stat(path).st_mtime_ns
+
+    # Expired: revalidated with the ETag, the server answers 304
+    assert moneypuck_fetch.fetch_to_file(URL, path, downloader, cache, max_age=0) == "skipped"
+    assert session.requests[-1]["If-None-Match"] == ETAG
+    assert session.responses[-1].status_code == 304 and not session.responses[-1].read
+    assert downloader.bytes_received == received
+    assert path.read_bytes() == CAREER and os.stat(path).st_mtime_ns == mtime
+
+    # Just revalidated: served without any request
+    assert moneypuck_fetch.fetch_to_file(URL, path, downloader, cache) == "skipped"
+    assert len(session.requests) == 2
+
+
+class BrokenResponse(StubResponse):
+    """The connection drops after the first chunk."""
+
+    def iter_content(self, chunk_size=1):
+        yield self.body[:chunk_size]
+        raise moneypuck_fetch.requests.exceptions.ChunkedEncodingError("connection reset")
+
+
+@pytest.mark.parametrize("body, status", [
+    (CAREER.split(b"\n", 1)[0] + b"\n", "no_data"),  # header, no rows
+    (CAREER[:50], "no_data"),  # cut short
+    (b"<html><body>" + b"Service temporarily unavailable " * 5 + b"</body></html>\n", "invalid"),
+])
+def test_bad_body_keeps_the_previous_file(tmp_path, body, status):
+    path = tmp_path / "8478402.csv"
+    path.write_bytes(b"previous")
+
+    result, _ = moneypuck_fetch.stream_to_file(StubResponse(200, body), path, moneypuck_fetch.CAREER_COLUMNS,
+                                               chunk_size=64)
+    assert result == status
+    assert path.read_bytes() == b"previous"
+    assert os.listdir(tmp_path) == [path.name]
+
+
+def test_dropped_connection_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "8478402.csv"
+    path.write_bytes(b"previous")
+
+    with pytest.raises(moneypuck_fetch.requests.exceptions.ChunkedEncodingError):
+        moneypuck_fetch.stream_to_file(BrokenResponse(200, CAREER), path, moneypuck_fetch.CAREER_COLUMNS,
+                                       chunk_size=64)
+    assert path.read_bytes() == b"previous"
+    assert os.listdir(tmp_path) == [path.name]
+
+
+def test_valid_body_replaces_the_file(tmp_path):
+    path = tmp_path / "8478402.csv"
+    path.write_bytes(b"previous")
+
+    result, size = moneypuck_fetch.stream_to_file(StubResponse(200, CAREER), path, moneypuck_fetch.CAREER_COLUMNS,
+                                                  chunk_size=64)
+    assert (result, size) == ("success", len(CAREER))
+    assert path.read_bytes() == CAREER
+    assert os.listdir(tmp_path) == [path.name]
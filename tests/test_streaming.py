@@ -0,0 +1,92 @@
+# test_streaming.py - The streaming build (sorted runs + k-way merge) against the in-memory one
+# Usage (from the project root): python -m pytest tests
+#
+# A small synthetic league (benchmarks/generate_moneypuck.py) is built in a
+# temporary folder, once in memory and once with --streaming under a budget
+# small enough to cut it into several runs: the CSV and the array store must
+# be byte-identical.
+import filecmp
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import array_store
+import build_players_game_by_game as gbg
+import career_archive
+import generate_moneypuck
+import run_report
+import sorted_runs
+
+PLAYERS = 40
+SEASONS = 3
+# Bytes of data per batch: a few players per run, a few hundred rows per merged chunk
+BUDGET = 2e6
+
+
+def _same_folders(a, b):
+    names = sorted(os.listdir(a))
+    return names == sorted(os.listdir(b)) and not filecmp.cmpfiles(a, b, names, shallow=False)[1]
+
+
+@pytest.mark.parametrize("source", ["csv", "archive"])
+def test_streaming_build_matches_in_memory(source, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_moneypuck.generate("data_gbg", PLAYERS, SEASONS, seed=1)
+    if source == "archive":
+        with career_archive.CareerArchive(gbg.ARCHIVE_DIR) as archive:
+            career_archive.import_folder("data_gbg", archive, verbose=False)
+
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    shutil.move(gbg.OUTPUT_FILE, "memory.csv")
+    shutil.move(array_store.ARRAY_DIR, "memory.arrays")
+
+    runs = []
+    write_runs = gbg.write_runs
+
+    def counted_write_runs(*args, **kwargs):
+        result = write_runs(*args, **kwargs)
+        runs.append(result[0])
+        return result
+
+    monkeypatch.setattr(gbg, "memory_budget", lambda max_memory, archive=None: BUDGET)
+    monkeypatch.setattr(gbg, "write_runs", counted_write_runs)
+    gbg.run(full=True, report=run_report.RunReport("test"), streaming=True)
+
+    assert runs and runs[0] > 1
+    assert filecmp.cmp(gbg.OUTPUT_FILE, "memory.csv", shallow=False)
+    assert _same_folders(array_store.ARRAY_DIR, "memory.arrays")
+
+
+def test_merge_is_a_stable_sort(tmp_path):
+    df = pd.DataFrame({"k": [5, 1, 3, 3, 9, 1, 7, 3, 2, 8], "i": range(10)})
+    paths = []
+    for n, part in enumerate([df[:4], df[4:7], df[7:]]):
+        paths.append(str(tmp_path / f"{n}.arrow"))
+        sorted_runs.write_run(part.sort_values("k", kind="stable"), paths[-1], batch_rows=2)
+
+    merged = pd.concat(sorted_runs.merge(paths, key=lambda d: d["k"], buffer_rows=3), ignore_index=True)
+    assert merged.equals(df.sort_values("k", kind="stable").reset_index(drop=True))
+
+
+def test_merge_skips_empty_runs_and_batches(tmp_path):
+    empty = str(tmp_path / "empty.arrow")
+    sorted_runs.write_run(pd.DataFrame({"k": pd.Series([], dtype="int64")}), empty)
+    # A run whose record batches include empty ones
+    gaps = str(tmp_path / "gaps.arrow")
+    table = pa.table({"k": [2, 4, 6]})
+    with pa.OSFile(gaps, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        for batch in [table.slice(0, 1), table.slice(0, 0), table.slice(1, 1), table.slice(0, 0), table.slice(2, 1)]:
+            writer.write_table(batch)
+    full = str(tmp_path / "full.arrow")
+    sorted_runs.write_run(pd.DataFrame({"k": [1, 3, 5, 7]}), full, batch_rows=1)
+
+    merged = pd.concat(sorted_runs.merge([empty, gaps, full], key=lambda d: d["k"], buffer_rows=3))
+    assert merged["k"].tolist() == [1, 2, 3, 4, 5, 6, 7]
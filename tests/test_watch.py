@@ -0,0 +1,81 @@
+# test_watch.py - The watcher's incremental update against a full build
+# Usage (from the project root): python -m pytest tests
+#
+# A small synthetic league (benchmarks/generate_moneypuck.py) is loaded by a
+# WarmBuild, one career is edited and update([path]) brings the outputs up to
+# date: every copy must hold what a fresh full build writes (the CSV, array
+# store and matrices byte for byte, the Parquet and SQLite rows, the shards).
+import filecmp
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import array_store
+import build_players_game_by_game as gbg
+import dashboard_export
+import generate_moneypuck
+import pace_matrix
+import parquet_store
+import query_store
+import run_report
+import watch_updates
+
+PLAYERS = 40
+SEASONS = 3
+ORDER = ["playerId", "season", "gameNumber"]
+
+
+def _same_folders(a, b):
+    names = sorted(os.listdir(a))
+    return names == sorted(os.listdir(b)) and not filecmp.cmpfiles(a, b, names, shallow=False)[1]
+
+
+def _parquet_rows(path):
+    return parquet_store.read_games(path).sort_values(ORDER, ignore_index=True)
+
+
+def _sqlite_rows(path):
+    con = query_store.connect(path)
+    try:
+        return pd.read_sql(f"SELECT * FROM {query_store.TABLE} ORDER BY playerId, season, gameNumber", con)
+    finally:
+        con.close()
+
+
+def test_update_of_one_career_matches_full_build(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_moneypuck.generate("data_gbg", PLAYERS, SEASONS, seed=1)
+    build = watch_updates.WarmBuild()
+    assert build.update() == PLAYERS
+    shutil.copy(gbg.OUTPUT_FILE, gbg.OUTPUT_FILE + ".before")
+
+    # One more goal (and point) in the last game of the first career
+    path = os.path.relpath(gbg.careers()[0][0])
+    career = pd.read_csv(path)
+    last = career.index[(career["situation"] == "all") & (career["gameId"] == career["gameId"].max())]
+    career.loc[last, ["I_F_goals", "I_F_points"]] += 1
+    career.to_csv(path, index=False)
+    assert build.update({path}) == 1
+    assert not filecmp.cmp(gbg.OUTPUT_FILE, gbg.OUTPUT_FILE + ".before", shallow=False)
+
+    outputs = [gbg.OUTPUT_FILE, array_store.ARRAY_DIR, pace_matrix.MATRIX_DIR, parquet_store.PARQUET_DIR,
+               query_store.DB_FILE, dashboard_export.OUTPUT_DIR]
+    for output in outputs:
+        shutil.move(output, output + ".watch")
+    gbg.run(full=True, report=run_report.RunReport("test"))
+    dashboard_export.export(dashboard_export.load_games())
+
+    assert filecmp.cmp(gbg.OUTPUT_FILE, gbg.OUTPUT_FILE + ".watch", shallow=False)
+    assert _same_folders(array_store.ARRAY_DIR, array_store.ARRAY_DIR + ".watch")
+    assert _same_folders(pace_matrix.MATRIX_DIR, pace_matrix.MATRIX_DIR + ".watch")
+    pd.testing.assert_frame_equal(_parquet_rows(parquet_store.PARQUET_DIR),
+                                  _parquet_rows(parquet_store.PARQUET_DIR + ".watch"))
+    pd.testing.assert_frame_equal(_sqlite_rows(query_store.DB_FILE), _sqlite_rows(query_store.DB_FILE + ".watch"))
+    shards = os.path.join(dashboard_export.OUTPUT_DIR, dashboard_export.SHARD_DIR)
+    assert _same_folders(shards, shards.replace(dashboard_export.OUTPUT_DIR, dashboard_export.OUTPUT_DIR + ".watch"))
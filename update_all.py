@@ -1,45 +1,143 @@
 # update_all.py - Complete automated update pipeline
+#
+# Runs in one process as a dependency graph (pipeline.py):
+#
+#     download ──> build ──> dashboard
+#                        └─> animint   (Rscript build_live_dashboard.R, when R is installed)
+#     seasons                          (--seasons)
+#
+# build hands its DataFrame straight to the dashboard export, and seasons
+# (data/ → all_seasons_clean.csv) runs alongside download and build. Stages
+# whose input files did not change since their last run are skipped.
+# seasons is opt-in: the committed all_seasons_clean.csv has seasons that
+# are no longer in data/.
+# One run report (.run_reports/update_all-<date>.jsonl) covers every stage.
+import argparse
+import glob
+import os
+import shutil
 import subprocess
 import sys
 
-def run_command(command, description):
-    """Run a command and handle errors"""
-    print(f"\n{'='*60}")
-    print(f"🔄 {description}")
-    print(f"{'='*60}\n")
-    
-    try:
-        result = subprocess.run(command, shell=True, check=True, 
-                              capture_output=False, text=True)
-        print(f"✅ {description} - Complete!\n")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} - Failed!")
-        print(f"Error: {e}\n")
-        return False
+# Before pyarrow loads, as in build_players_game_by_game.py
+os.environ.setdefault("ARROW_DEFAULT_MEMORY_POOL", "system")
+
+import array_store
+import build_dataset
+import build_players_game_by_game as gbg
+import dashboard_export
+import pace_matrix
+import parquet_store
+import query_store
+import run_report
+from download_all_moneypuck_players import download_all
+from pipeline import Pipeline, Stage
+
+ANIMINT_SCRIPT = "build_live_dashboard.R"
+ANIMINT_OUTPUT = os.path.join("animint_output", "index.html")
+
+def make_stages(args, report):
+    """The update pipeline's stages for the command line `args`."""
+
+    def download(results):
+        return download_all(report=report, verbose=args.verbose)
+
+    def seasons(results):
+        all_seasons = build_dataset.build_seasons()
+        all_seasons.to_csv(build_dataset.OUTPUT_FILE, index=False)
+        print(f"✅ Fichier créé : {build_dataset.OUTPUT_FILE}")
+        return all_seasons
+
+    def build(results):
+        all_games = gbg.run(args.workers, args.full, report=report, verbose=args.verbose,
+                            streaming=args.streaming, max_memory=args.max_memory)
+        # Up to date for the build cache, or streamed: the dashboard reads the array store instead
+        return dashboard_export.load_games() if all_games is None else all_games
+
+    def dashboard(results):
+        games = dashboard_export.games_from_frame(results["build"])
+        stats = dashboard_export.export(games)
+        print(f"✅ {stats['players']} player shards ({stats['written']} updated, "
+              f"{stats['removed']} removed), index.html {stats['html_bytes'] / 1024:.0f} KB")
+        return stats
+
+    def animint(results):
+        # The animint2 page linked from the README, read from players_game_by_game.csv
+        subprocess.run(["Rscript", ANIMINT_SCRIPT], check=True)
+        print(f"✅ {ANIMINT_OUTPUT} rebuilt")
+
+    stages = [
+        Stage("build", build, after=[] if args.skip_download else ["download"],
+              inputs=gbg.input_files,
+              outputs=[gbg.OUTPUT_FILE, parquet_store.PARQUET_DIR, query_store.DB_FILE,
+                       array_store.ARRAY_DIR, pace_matrix.MATRIX_DIR],
+              load=dashboard_export.load_games,
+              signature=gbg.SIGNATURE),
+        Stage("dashboard", dashboard, after=["build"],
+              inputs=lambda: [],
+              outputs=[os.path.join(dashboard_export.OUTPUT_DIR, "index.html")]),
+    ]
+    if shutil.which("Rscript"):
+        stages.append(Stage("animint", animint, after=["build"],
+                            inputs=lambda: [gbg.OUTPUT_FILE, ANIMINT_SCRIPT],
+                            outputs=[ANIMINT_OUTPUT]))
+    else:
+        print(f"⚠️  Rscript not found: {ANIMINT_OUTPUT} is not rebuilt")
+    if args.seasons:
+        stages.append(Stage("seasons", seasons,
+                            inputs=lambda: glob.glob(build_dataset.DATA_FOLDER),
+                            outputs=[build_dataset.OUTPUT_FILE]))
+    if not args.skip_download:
+        # No input files: the server decides what changed, so it always runs
+        stages.insert(0, Stage("download", download))
+    return stages
 
 def main():
+    parser = argparse.ArgumentParser(description="Download, build and export everything")
+    parser.add_argument("--skip-download", action="store_true",
+                        help="Only rebuild from the careers already downloaded")
+    parser.add_argument("--seasons", action="store_true",
+                        help=f"Also rebuild {build_dataset.OUTPUT_FILE} from data/ (alongside the build)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the per-file transform of the build (default: 1)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Build in bounded memory (sorted runs on disk, then a k-way merge)")
+    parser.add_argument("--max-memory", type=int, default=gbg.MAX_MEMORY_MB, metavar="MB",
+                        help=f"Peak RSS cap of --streaming, in MB (default: {gbg.MAX_MEMORY_MB})")
+    parser.add_argument("--jobs", type=int, default=2,
+                        help="Stages run at the same time (default: 2)")
+    parser.add_argument("--full", action="store_true",
+                        help="Run every stage, and rebuild without the incremental cache")
+    parser.add_argument("--only", nargs="+", metavar="STAGE",
+                        help="Only these stages and the ones they depend on")
+    run_report.add_arguments(parser)
+    args = parser.parse_args()
+    if args.streaming:
+        gbg.check_max_memory(parser, args.max_memory)
+    # Profilers are per process: one stage at a time when profiling. Peak
+    # RSS per stage too, only when stages do not overlap
+    jobs = 1 if args.profile else args.jobs
+    report = run_report.from_args("update_all", args, stage_peaks=jobs == 1)
+
     print("🏒 NHL Stats Complete Update Pipeline")
     print("="*60)
-    
-    # Step 1: Download latest data from MoneyPuck
-    if not run_command("python download_all_moneypuck_players.py", 
-                      "Step 1: Downloading player data from MoneyPuck"):
-        sys.exit(1)
-    
-    # Step 2: Process and combine all player files
-    if not run_command("python build_players_game_by_game.py",
-                      "Step 2: Processing and combining player data"):
-        sys.exit(1)
-    
-    # Step 3: Rebuild R dashboard
-    if not run_command("Rscript build_live_dashboard.R",
-                      "Step 3: Rebuilding interactive dashboard"):
+
+    pipeline = Pipeline(make_stages(args, report), report=report)
+    try:
+        status = pipeline.run(jobs=jobs, force=args.full, only=args.only)
+    except BaseException as e:
+        print("="*60)
+        print(f"❌ Pipeline failed: {e!r}")
+        print(f"📝 Run report: {report.write()}")
         sys.exit(1)
-    
+
     print("="*60)
     print("🎉 ALL DONE!")
-    print("📂 Open: animint_output/index.html")
+    print("   " + ", ".join(f"{name}: {outcome}" for name, outcome in status.items()))
+    print(f"📝 Run report: {report.write()}")
+    print("📂 Serve: python -m http.server -d dashboard_output")
+    if status.get("animint") == "ran":
+        print(f"📂 Open: {ANIMINT_OUTPUT}")
     print("="*60)
 
 if __name__ == "__main__":
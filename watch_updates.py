@@ -0,0 +1,237 @@
+# watch_updates.py - Rebuild as soon as careers change (replaces auto_update.R's 30-minute loop)
+#
+# A long-lived process woken by file system events (inotify through
+# watchdog: no CPU while nothing happens) on data_gbg/, the career archive
+# and, with --seasons, data/. A burst of events (a download writing hundreds
+# of careers) is debounced into one update:
+#
+#   - only the careers whose content changed are re-transformed; the frames
+#     of the others stay in memory from one update to the next, nothing is
+#     re-parsed nor loaded back from .build_cache/;
+#   - from them, only what those careers touch is rewritten: the Parquet
+#     partitions of their seasons, their rows in SQLite and their dashboard
+#     shards. The CSV (sorted by name), the array store and the matrices
+#     (flat files of offsets) are rewritten in full;
+#   - a change in data/ only rebuilds all_seasons_clean.csv.
+#
+# With a career archive, CSVs dropped in data_gbg/ are imported into it first.
+#
+#     python watch_updates.py                 # update now, then on every change
+#     python watch_updates.py --seasons --debounce 5
+import argparse
+import os
+import queue
+import time
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+import build_cache
+import build_dataset
+import build_players_game_by_game as gbg
+import career_archive
+import dashboard_export
+import run_report
+
+CAREER_FOLDER = os.path.dirname(gbg.DATA_FOLDER)
+SEASON_FOLDER = os.path.dirname(build_dataset.DATA_FOLDER)
+
+# An update starts once no event came for DEBOUNCE seconds, or MAX_WAIT
+# seconds after the first one if events keep coming
+DEBOUNCE = 2.0
+MAX_WAIT = 30.0
+
+# Events of files being read (by the build itself, among others)
+IGNORED_EVENTS = ("opened", "closed_no_write")
+
+
+class ChangeHandler(FileSystemEventHandler):
+    """Puts the path (relative to the working directory) of every changed file on `changes`."""
+
+    def __init__(self, changes):
+        self.changes = changes
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in IGNORED_EVENTS:
+            return
+        for path in (event.src_path, event.dest_path):
+            if path:
+                self.changes.put(os.path.relpath(path))
+
+
+def wait_for_changes(changes, debounce=DEBOUNCE, max_wait=MAX_WAIT):
+    """Block until a burst of changes is over. Returns the set of changed paths."""
+    paths = {changes.get()}
+    first = time.monotonic()
+    while True:
+        timeout = min(debounce, first + max_wait - time.monotonic())
+        if timeout <= 0:
+            return paths
+        try:
+            paths.add(changes.get(timeout=timeout))
+        except queue.Empty:
+            return paths
+
+
+def _in_folder(path, folder):
+    return path.startswith(folder + os.sep)
+
+
+def _add_rows(changed, df):
+    """Add the playerIds and seasons of a career's frame (None if skipped) to `changed`."""
+    if df is not None:
+        changed[0].update(int(p) for p in df["playerId"].unique())
+        changed[1].update(int(s) for s in df["season"].unique())
+
+
+class WarmBuild:
+    """
+    The per-player frames of the build, kept in memory between updates:
+    update() re-transforms the careers that changed and brings the outputs
+    up to date from the frames it holds.
+    """
+
+    def __init__(self, workers=1, parquet_by_player=False, verbose=False):
+        self.workers = workers
+        self.parquet_by_player = parquet_by_player
+        self.verbose = verbose
+        self.manifest = build_cache.load_manifest(gbg.SIGNATURE)
+        self.frames = {}  # career (file or archive key) -> game-by-game frame, None if skipped
+        self.fingerprints = None
+
+    def _changed(self, files, fingerprints, paths):
+        """Careers to re-transform after changes to `paths`."""
+        if fingerprints is not None:
+            old = self.fingerprints or {}
+            return [f for f in files if f not in self.frames or fingerprints[f] != old.get(f)]
+        return [f for f in files if f not in self.frames or f in paths]
+
+    def update(self, paths=None):
+        """
+        Bring the outputs up to date after changes to `paths` (first call:
+        load every career, from the cache when unchanged). Returns the number
+        of careers re-transformed, None when nothing changed.
+        """
+        report = run_report.RunReport("watch")
+        if paths is not None and career_archive.exists(gbg.ARCHIVE_DIR):
+            csvs = sorted(p for p in paths if _in_folder(p, CAREER_FOLDER)
+                          and p.endswith(".csv") and os.path.exists(p))
+            if csvs:
+                added, _ = career_archive.import_folder(CAREER_FOLDER, paths=csvs, verbose=self.verbose)
+                print(f"📦 {added} careers imported into {gbg.ARCHIVE_DIR}/")
+
+        files, archive, fingerprints = gbg.careers()
+        first = paths is None
+        # playerIds and seasons of the rows that change, from the frames
+        # before and after (None: every output is rewritten in full)
+        changed = None
+        if first:
+            up_to_date = gbg.is_up_to_date(files, self.manifest, fingerprints)
+            todo, manifest = files, self.manifest
+        else:
+            todo, manifest = self._changed(files, fingerprints, paths), None
+            removed = set(self.frames) - set(files)
+            if not todo and not removed:
+                return None
+            changed = (set(), set())
+            for file in removed:
+                _add_rows(changed, self.frames.pop(file))
+            for file in todo:
+                _add_rows(changed, self.frames.get(file))
+            build_cache.forget_missing(files, self.manifest)
+
+        # Only `todo` is read: with no manifest every one of them is
+        # re-transformed, then cached here for the next command line build
+        for file, df, message, error in gbg.iter_results(todo, self.workers, manifest, report,
+                                                         self.verbose, archive):
+            self.frames[file] = df
+            if changed is not None:
+                _add_rows(changed, df)
+            if error:
+                print(f"⚠️  {file}: {error}")
+            if not first:
+                build_cache.store_result(file, (df, message, error), self.manifest,
+                                         fingerprints and fingerprints[file])
+        self.fingerprints = fingerprints
+
+        if first and up_to_date and os.path.exists(os.path.join(dashboard_export.OUTPUT_DIR, "index.html")):
+            return None
+        dfs = [self.frames[file] for file in files if self.frames[file] is not None]
+        if not dfs:
+            print("❌ No data to combine!")
+            return len(todo)
+        all_games = gbg.combine(dfs, report)
+        gbg.write_outputs(all_games, self.manifest, self.parquet_by_player, report, changed)
+        with report.stage("dashboard") as stage:
+            stats = dashboard_export.export(dashboard_export.games_from_frame(all_games))
+            stage.add(rows=len(all_games), files=stats["written"])
+        report.write()
+        print(f"✅ {len(todo)} careers {'loaded' if first else 're-transformed'}, {len(all_games)} games, "
+              f"{stats['written']} dashboard shards updated")
+        return len(todo)
+
+
+def update_seasons():
+    all_seasons = build_dataset.build_seasons()
+    all_seasons.to_csv(build_dataset.OUTPUT_FILE, index=False)
+    print(f"✅ Fichier créé : {build_dataset.OUTPUT_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the outputs whenever careers change")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help=f"Seconds without events before updating (default: {DEBOUNCE:g})")
+    parser.add_argument("--max-wait", type=float, default=MAX_WAIT,
+                        help=f"Longest delay after the first event of a burst (default: {MAX_WAIT:g})")
+    parser.add_argument("--seasons", action="store_true",
+                        help=f"Also watch data/ and rebuild {build_dataset.OUTPUT_FILE} from it")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the per-file transform of data_gbg/ CSVs (default: 1)")
+    parser.add_argument("--parquet-by-player", action="store_true",
+                        help="Partition the Parquet output by playerId as well as season")
+    parser.add_argument("--verbose", action="store_true",
+                        help="One line per file instead of a progress bar")
+    args = parser.parse_args()
+
+    folders = [CAREER_FOLDER, gbg.ARCHIVE_DIR] + ([SEASON_FOLDER] if args.seasons else [])
+    changes = queue.Queue()
+    observer = Observer()
+    for folder in folders:
+        if os.path.isdir(folder):
+            observer.schedule(ChangeHandler(changes), folder)
+    # Started first: what changes during the first update is picked up after it
+    observer.start()
+
+    build = WarmBuild(args.workers, args.parquet_by_player, args.verbose)
+    print("🏒 NHL Stats Watcher")
+    print("="*60)
+    try:
+        if build.update() is None:
+            print("✅ Nothing changed since the last build")
+        print(f"👀 Watching {', '.join(f + '/' for f in folders if os.path.isdir(f))} (Ctrl+C to stop)")
+        while True:
+            paths = wait_for_changes(changes, args.debounce, args.max_wait)
+            start = time.perf_counter()
+            updated = False
+            try:
+                if args.seasons and any(_in_folder(p, SEASON_FOLDER) for p in paths):
+                    update_seasons()
+                    updated = True
+                if any(_in_folder(p, CAREER_FOLDER) or _in_folder(p, gbg.ARCHIVE_DIR) for p in paths):
+                    # None: only our own writes to the archive, or identical files
+                    updated |= build.update(paths) is not None
+            except Exception as e:
+                # Often a file caught while being written: its next event retries
+                print(f"❌ Update failed: {e!r}")
+                continue
+            if updated:
+                print(f"⏱️  {time.strftime('%H:%M:%S')} updated in {time.perf_counter() - start:.1f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        observer.stop()
+        observer.join()
+
+
+if __name__ == "__main__":
+    main()